@@ -7,7 +7,7 @@ from alembic import context
 
 # Import the app's Base and models
 from app.db.session import Base
-from app.memory.models import Meeting, MemoryEntry, Commitment, Interaction
+from app.memory.models import Meeting, MemoryEntry, Commitment, Interaction, ActiveMeeting, LLMUsage
 from app.config import Config
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,87 @@
+"""add transcript_ref to meetings and offload inline transcripts
+
+Revision ID: a3c9e1f27b40
+Revises: f8614df3c2cd
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.memory.blobs import get_blob_store
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c9e1f27b40'
+down_revision = 'f8614df3c2cd'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 200
+
+meetings = sa.table(
+    "meetings",
+    sa.column("id", sa.Integer),
+    sa.column("transcript", sa.Text),
+    sa.column("transcript_ref", sa.String),
+)
+
+
+def upgrade():
+    op.add_column(
+        "meetings",
+        sa.Column("transcript_ref", sa.String(length=64), nullable=True),
+    )
+    op.create_index(
+        "ix_meetings_transcript_ref",
+        "meetings",
+        ["transcript_ref"],
+    )
+
+    # Move existing inline transcripts into the blob store in batches.
+    # Identical transcripts collapse to a single blob.
+    bind = op.get_bind()
+    store = get_blob_store()
+    last_id = 0
+
+    while True:
+        rows = bind.execute(
+            sa.select(meetings.c.id, meetings.c.transcript)
+            .where(meetings.c.id > last_id)
+            .where(meetings.c.transcript.isnot(None))
+            .order_by(meetings.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+
+        if not rows:
+            break
+
+        for meeting_id, transcript in rows:
+            bind.execute(
+                meetings.update()
+                .where(meetings.c.id == meeting_id)
+                .values(transcript_ref=store.put_text(transcript), transcript=None)
+            )
+
+        last_id = rows[-1][0]
+
+
+def downgrade():
+    # Inline transcripts again before dropping the reference column.
+    bind = op.get_bind()
+    store = get_blob_store()
+
+    rows = bind.execute(
+        sa.select(meetings.c.id, meetings.c.transcript_ref)
+        .where(meetings.c.transcript_ref.isnot(None))
+    ).fetchall()
+
+    for meeting_id, ref in rows:
+        bind.execute(
+            meetings.update()
+            .where(meetings.c.id == meeting_id)
+            .values(transcript=store.get_text(ref))
+        )
+
+    op.drop_index("ix_meetings_transcript_ref", table_name="meetings")
+    op.drop_column("meetings", "transcript_ref")
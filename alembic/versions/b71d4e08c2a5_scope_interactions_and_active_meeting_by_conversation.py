@@ -0,0 +1,61 @@
+"""scope interactions and active meeting by conversation
+
+Revision ID: b71d4e08c2a5
+Revises: a3c9e1f27b40
+Create Date: 2026-10-19 10:15:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b71d4e08c2a5'
+down_revision = 'a3c9e1f27b40'
+branch_labels = None
+depends_on = None
+
+DEFAULT_CONVERSATION_ID = "default"
+
+
+def upgrade():
+    op.add_column(
+        "interactions",
+        sa.Column("conversation_id", sa.String(), nullable=True),
+    )
+
+    # Existing history belongs to the shared default conversation
+    op.execute(
+        sa.text("UPDATE interactions SET conversation_id = :cid").bindparams(
+            cid=DEFAULT_CONVERSATION_ID
+        )
+    )
+
+    op.create_index(
+        "ix_interactions_conversation_created",
+        "interactions",
+        ["conversation_id", "created_at"],
+    )
+
+    op.create_table(
+        "active_meetings",
+        sa.Column("conversation_id", sa.String(), primary_key=True),
+        sa.Column("meeting_id", sa.Integer(), sa.ForeignKey("meetings.id"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+
+    # Carry over the globally active meeting (if any) as the default conversation's pointer
+    op.execute(
+        sa.text(
+            "INSERT INTO active_meetings (conversation_id, meeting_id, updated_at) "
+            "SELECT :cid, id, updated_at FROM meetings "
+            "WHERE is_active = :active "
+            "ORDER BY meeting_date DESC LIMIT 1"
+        ).bindparams(cid=DEFAULT_CONVERSATION_ID, active=True)
+    )
+
+
+def downgrade():
+    op.drop_table("active_meetings")
+    op.drop_index("ix_interactions_conversation_created", table_name="interactions")
+    op.drop_column("interactions", "conversation_id")
@@ -0,0 +1,132 @@
+"""index interactions.created_at and partition interactions monthly (Postgres)
+
+Revision ID: c4f2a9d61e83
+Revises: b71d4e08c2a5
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from datetime import date, datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4f2a9d61e83'
+down_revision = 'b71d4e08c2a5'
+branch_labels = None
+depends_on = None
+
+PARTITION_PREFIX = "interactions_p"
+MONTHS_AHEAD = 3
+
+
+def _add_months(d: date, months: int) -> date:
+    month_index = d.year * 12 + (d.month - 1) + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def _partition_postgres():
+    bind = op.get_bind()
+
+    oldest = bind.execute(sa.text("SELECT min(created_at) FROM interactions")).scalar()
+    today = datetime.utcnow().date()
+    first_month = date((oldest or today).year, (oldest or today).month, 1)
+    last_month = _add_months(date(today.year, today.month, 1), MONTHS_AHEAD)
+
+    # Keep the id sequence alive when the legacy table is dropped
+    op.execute("ALTER TABLE interactions RENAME TO interactions_legacy")
+    op.execute(
+        "ALTER TABLE interactions_legacy "
+        "RENAME CONSTRAINT interactions_pkey TO interactions_legacy_pkey"
+    )
+    op.execute("ALTER SEQUENCE interactions_id_seq OWNED BY NONE")
+    op.execute("UPDATE interactions_legacy SET created_at = now() WHERE created_at IS NULL")
+
+    op.execute(
+        """
+        CREATE TABLE interactions (
+            id INTEGER NOT NULL DEFAULT nextval('interactions_id_seq'),
+            conversation_id VARCHAR,
+            user_message TEXT,
+            intent VARCHAR,
+            workflow VARCHAR,
+            response TEXT,
+            metadata JSON,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+
+    month = first_month
+    while month <= last_month:
+        end = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE {PARTITION_PREFIX}{month.year:04d}{month.month:02d} "
+            f"PARTITION OF interactions "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        month = end
+
+    # Safety net for rows outside pre-created months
+    op.execute(f"CREATE TABLE {PARTITION_PREFIX}default PARTITION OF interactions DEFAULT")
+
+    op.execute(
+        "INSERT INTO interactions "
+        "(id, conversation_id, user_message, intent, workflow, response, metadata, created_at) "
+        "SELECT id, conversation_id, user_message, intent, workflow, response, metadata, created_at "
+        "FROM interactions_legacy"
+    )
+    op.execute("DROP TABLE interactions_legacy")
+    op.execute("ALTER SEQUENCE interactions_id_seq OWNED BY interactions.id")
+
+    op.create_index("ix_interactions_id", "interactions", ["id"])
+    op.create_index(
+        "ix_interactions_conversation_created",
+        "interactions",
+        ["conversation_id", "created_at"],
+    )
+    op.create_index("ix_interactions_created_at", "interactions", ["created_at"])
+
+
+def upgrade():
+    if op.get_bind().dialect.name == "postgresql":
+        _partition_postgres()
+    else:
+        op.create_index("ix_interactions_created_at", "interactions", ["created_at"])
+
+
+def downgrade():
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("ALTER TABLE interactions RENAME TO interactions_partitioned")
+        op.execute(
+            "ALTER TABLE interactions_partitioned "
+            "RENAME CONSTRAINT interactions_pkey TO interactions_partitioned_pkey"
+        )
+        op.execute("ALTER SEQUENCE interactions_id_seq OWNED BY NONE")
+        op.execute(
+            """
+            CREATE TABLE interactions (
+                id INTEGER NOT NULL DEFAULT nextval('interactions_id_seq') PRIMARY KEY,
+                conversation_id VARCHAR,
+                user_message TEXT,
+                intent VARCHAR,
+                workflow VARCHAR,
+                response TEXT,
+                metadata JSON,
+                created_at TIMESTAMP WITHOUT TIME ZONE
+            )
+            """
+        )
+        op.execute("INSERT INTO interactions SELECT * FROM interactions_partitioned")
+        op.execute("DROP TABLE interactions_partitioned CASCADE")
+        op.execute("ALTER SEQUENCE interactions_id_seq OWNED BY interactions.id")
+        op.create_index("ix_interactions_id", "interactions", ["id"])
+        op.create_index(
+            "ix_interactions_conversation_created",
+            "interactions",
+            ["conversation_id", "created_at"],
+        )
+    else:
+        op.drop_index("ix_interactions_created_at", table_name="interactions")
@@ -0,0 +1,48 @@
+"""add llm_usage ledger
+
+Revision ID: d5e1b7a93f40
+Revises: c4f2a9d61e83
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5e1b7a93f40'
+down_revision = 'c4f2a9d61e83'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "llm_usage",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("trace_id", sa.String(), nullable=True),
+        sa.Column("conversation_id", sa.String(), nullable=True),
+        sa.Column("workflow", sa.String(), nullable=True),
+        sa.Column("meeting_id", sa.Integer(), sa.ForeignKey("meetings.id"), nullable=True),
+        sa.Column("prompt_type", sa.String(), nullable=True),
+        sa.Column("model", sa.String(), nullable=True),
+        sa.Column("prompt_tokens", sa.Integer(), nullable=True),
+        sa.Column("completion_tokens", sa.Integer(), nullable=True),
+        sa.Column("latency_ms", sa.Integer(), nullable=True),
+        sa.Column("status", sa.String(), nullable=True),
+        sa.Column("degraded", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_llm_usage_id", "llm_usage", ["id"])
+    op.create_index("ix_llm_usage_trace_id", "llm_usage", ["trace_id"])
+    op.create_index("ix_llm_usage_workflow", "llm_usage", ["workflow"])
+    op.create_index("ix_llm_usage_created_at", "llm_usage", ["created_at"])
+
+
+def downgrade():
+    op.drop_index("ix_llm_usage_created_at", table_name="llm_usage")
+    op.drop_index("ix_llm_usage_workflow", table_name="llm_usage")
+    op.drop_index("ix_llm_usage_trace_id", table_name="llm_usage")
+    op.drop_index("ix_llm_usage_id", table_name="llm_usage")
+    op.drop_table("llm_usage")
@@ -0,0 +1,42 @@
+"""add precomputed_briefs
+
+Revision ID: e7a2c4f19b36
+Revises: d5e1b7a93f40
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7a2c4f19b36'
+down_revision = 'd5e1b7a93f40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "precomputed_briefs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("calendar_event_id", sa.String(), nullable=False),
+        sa.Column("client_name", sa.String(), nullable=True),
+        sa.Column("meeting_start", sa.DateTime(), nullable=True),
+        sa.Column("context_hash", sa.String(length=64), nullable=False),
+        sa.Column("brief", sa.Text(), nullable=True),
+        sa.Column("memory_used", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("calendar_event_id", "context_hash", name="uq_precomputed_briefs_event_hash"),
+    )
+    op.create_index("ix_precomputed_briefs_id", "precomputed_briefs", ["id"])
+    op.create_index("ix_precomputed_briefs_calendar_event_id", "precomputed_briefs", ["calendar_event_id"])
+    op.create_index("ix_precomputed_briefs_meeting_start", "precomputed_briefs", ["meeting_start"])
+
+
+def downgrade():
+    op.drop_index("ix_precomputed_briefs_meeting_start", table_name="precomputed_briefs")
+    op.drop_index("ix_precomputed_briefs_calendar_event_id", table_name="precomputed_briefs")
+    op.drop_index("ix_precomputed_briefs_id", table_name="precomputed_briefs")
+    op.drop_table("precomputed_briefs")
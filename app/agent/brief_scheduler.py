@@ -0,0 +1,217 @@
+"""Precomputed meeting briefs - generated before the user asks for them.
+
+A brief is usually requested minutes before the meeting, when waiting on the
+LLM hurts most. The scheduler scans calendar events starting within
+BRIEF_PRECOMPUTE_HOURS and generates each brief with the same inputs the
+meeting brief workflow uses (Orchestrator.precompute_meeting_brief), storing
+it in precomputed_briefs keyed by calendar event id and a hash of those
+inputs. The workflow serves a stored brief only when its hash matches, so an
+edited event or new memory for the client never returns a stale brief.
+
+Scans run every BRIEF_PRECOMPUTE_INTERVAL_SECONDS; memory committed for a
+client wakes the scheduler early so its briefs are regenerated right away.
+
+BRIEF_PRECOMPUTE=true serves stored briefs and runs the scheduler in a
+background thread started with the app. Every app process (uvicorn workers,
+dynos) starts the thread, but on Postgres only the one holding a session
+advisory lock scans; the others retry each interval and take over when the
+holder exits (memory committed by another process is picked up at the next
+interval rather than right away). SQLite has no cross-process lock, so run a
+single worker there. A pass can also be run from cron / Heroku scheduler; it
+does not take the lock, and when two processes store the same brief the
+second write is dropped:
+
+    python -m app.agent.brief_scheduler
+"""
+import argparse
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from app.agent.orchestrator import Orchestrator
+from app.config import Config
+from app.db.session import SessionLocal, engine
+from app.integrations.calendar import get_upcoming_meetings, match_known_client
+from app.memory.repo import MemoryRepo, add_memory_listener, remove_memory_listener
+from app.runtime.metrics import PRECOMPUTED_BRIEFS
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# pg_try_advisory_lock key held by the process that runs the scheduler
+_ADVISORY_LOCK_KEY = 0x6D627269  # "mbri"
+
+
+def run_once(session_factory: Callable = SessionLocal, hours_ahead: Optional[float] = None) -> Dict[str, int]:
+    """Generate missing or outdated briefs for upcoming events and prune past ones."""
+    hours_ahead = Config.BRIEF_PRECOMPUTE_HOURS if hours_ahead is None else hours_ahead
+    events = get_upcoming_meetings(hours_ahead)
+    stats = {"events": len(events), "generated": 0, "current": 0, "failed": 0}
+
+    db = session_factory()
+    try:
+        repo = MemoryRepo(db)
+        known_clients = repo.get_distinct_client_names()
+
+        for event in events:
+            if not event.get("id"):
+                continue
+            client_name = match_known_client(event, known_clients)
+            try:
+                # One orchestrator per event: request state is reset per call
+                generated = Orchestrator(repo).precompute_meeting_brief(event, client_name)
+                outcome = "generated" if generated else "current"
+            except Exception as e:
+                logger.warning(f"Brief precompute failed for event {event.get('id')}: {e}")
+                outcome = "failed"
+            stats[outcome] += 1
+            PRECOMPUTED_BRIEFS.labels(outcome=outcome).inc()
+
+        repo.delete_precomputed_briefs_before(datetime.utcnow())
+    finally:
+        db.close()
+
+    return stats
+
+
+class BriefScheduler:
+    """Background thread running run_once on an interval, woken early by new memory."""
+
+    def __init__(
+        self,
+        interval_seconds: Optional[float] = None,
+        session_factory: Callable = SessionLocal,
+        lock_engine: Engine = engine,
+    ):
+        self.interval_seconds = (
+            Config.BRIEF_PRECOMPUTE_INTERVAL_SECONDS if interval_seconds is None else interval_seconds
+        )
+        self._session_factory = session_factory
+        self._lock_engine = lock_engine
+        self._lock_conn: Optional[Connection] = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        add_memory_listener(self.notify)
+        self._thread = threading.Thread(target=self._run, name="brief-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        remove_memory_listener(self.notify)
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def notify(self, client_name: Optional[str] = None) -> None:
+        """New memory committed: rescan now instead of at the next interval."""
+        self._wake.set()
+
+    def _is_runner(self) -> bool:
+        """
+        Whether this process runs the scans. On Postgres that is the process
+        holding the advisory lock on a dedicated connection; the lock goes
+        with the connection, so a crashed runner frees it.
+        """
+        if self._lock_engine.dialect.name != "postgresql":
+            return True
+
+        if self._lock_conn is not None:
+            try:
+                self._lock_conn.execute(text("SELECT 1"))
+                return True
+            except Exception as e:
+                logger.warning(f"Brief scheduler lost its lock connection: {e}")
+                self._release_lock()
+
+        conn = self._lock_engine.connect()
+        try:
+            acquired = conn.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": _ADVISORY_LOCK_KEY}
+            ).scalar()
+            conn.commit()  # Session-level lock: outlives the transaction
+        except Exception:
+            conn.close()
+            raise
+        if not acquired:
+            conn.close()
+            return False
+        logger.info("Brief scheduler: this process runs the precompute scans")
+        self._lock_conn = conn
+        return True
+
+    def _release_lock(self) -> None:
+        conn, self._lock_conn = self._lock_conn, None
+        if conn is None:
+            return
+        try:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+            conn.commit()
+        except Exception:
+            pass  # Closing the connection releases it anyway
+        finally:
+            conn.close()
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.is_set():
+                self._wake.clear()
+                try:
+                    if self._is_runner():
+                        stats = run_once(self._session_factory)
+                        logger.info(f"Brief precompute: {stats}")
+                except Exception as e:
+                    logger.warning(f"Brief precompute scan failed: {e}")
+                self._wake.wait(self.interval_seconds)
+        finally:
+            self._release_lock()
+
+
+_scheduler: Optional[BriefScheduler] = None
+
+
+def start_scheduler() -> Optional[BriefScheduler]:
+    """Start the per-process scheduler when BRIEF_PRECOMPUTE is enabled."""
+    global _scheduler
+    if not Config.BRIEF_PRECOMPUTE or _scheduler is not None:
+        return _scheduler
+    _scheduler = BriefScheduler()
+    _scheduler.start()
+    return _scheduler
+
+
+def stop_scheduler() -> None:
+    global _scheduler
+    if _scheduler is not None:
+        _scheduler.stop()
+        _scheduler = None
+
+
+def main(argv: Optional[Any] = None) -> None:
+    parser = argparse.ArgumentParser(description="Precompute meeting briefs for upcoming calendar events.")
+    parser.add_argument(
+        "--hours",
+        type=float,
+        default=Config.BRIEF_PRECOMPUTE_HOURS,
+        help="How far ahead to scan the calendar (default: BRIEF_PRECOMPUTE_HOURS)",
+    )
+    args = parser.parse_args(argv)
+
+    stats = run_once(hours_ahead=args.hours)
+    print(
+        f"🗓️ {stats['events']} upcoming events: {stats['generated']} briefs generated, "
+        f"{stats['current']} already current, {stats['failed']} failed"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,8 @@ from typing import Optional, List, Any, Dict
 import json
 import logging
 
-from app.llm.client import chat as gemini_chat
+from app.llm.context import ContextBuilder
+from app.llm.parsing import CLIENT_RESOLUTION_SCHEMA, chat_json
 from app.runtime.mode import is_demo_mode
 
 logger = logging.getLogger(__name__)
@@ -135,24 +136,34 @@ def _llm_resolve_client(
         "Return JSON only."
     )
 
+    output_schema = {
+        "client": "string or null",
+        "confidence": "number between 0 and 1",
+        "reasoning": "string",
+    }
+
+    # Fit the prompt budget: the candidate list matters more than a long attendee list
+    packed = (
+        ContextBuilder("client_resolution", reserve=[system_prompt, summary or "", json.dumps(output_schema)])
+        .add_items("known_clients", known_clients, priority=0)
+        .add_items("attendees", [a if isinstance(a, str) else json.dumps(a) for a in attendees], priority=1)
+        .build()
+    )
+
     payload = {
         "calendar_summary": summary,
-        "attendees": attendees,
-        "known_clients": known_clients,
-        "output_schema": {
-            "client": "string or null",
-            "confidence": "number between 0 and 1",
-            "reasoning": "string",
-        },
+        "attendees": attendees[: len(packed.items("attendees"))],
+        "known_clients": packed.items("known_clients"),
+        "output_schema": output_schema,
     }
 
     try:
-        raw = gemini_chat(
+        return chat_json(
             prompt=json.dumps(payload),
             system_prompt=system_prompt,
+            schema=CLIENT_RESOLUTION_SCHEMA,
             temperature=0.0,
+            prompt_type="client_resolution",
         )
-        parsed = json.loads(raw)
-        return parsed
     except Exception as e:
         return {"client": None, "confidence": 0.0}
@@ -1,35 +1,11 @@
 """Intent recognition - classify user intent using LLM."""
-import json
-import re
 from typing import Dict, Any
-from app.llm.client import chat
+from app.llm.parsing import INTENT_SCHEMA, LLMOutputError, chat_json
 from app.llm.prompts import INTENT_RECOGNITION_SYSTEM, INTENT_RECOGNITION_USER
+from app.llm.templates import render
+from app.runtime.diagnostics import get_diagnostics
 
-import re
-
-def _extract_json(text: str) -> Dict[str, Any]:
-    """
-    Safely extract JSON object from LLM output.
-    Handles markdown fences and stray text.
-    """
-    text = text.strip()
-
-    # Remove markdown fences
-    text = re.sub(r"^```(?:json)?\s*", "", text)
-    text = re.sub(r"\s*```$", "", text)
-
-    # Try direct parse
-    try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        pass
-
-    # Fallback: extract first JSON object
-    match = re.search(r"\{.*\}", text, re.DOTALL)
-    if not match:
-        raise ValueError("No JSON object found")
-
-    return json.loads(match.group(0))
+diag = get_diagnostics("intents")
 
 
 def recognize_intent(user_message: str) -> Dict[str, Any]:
@@ -46,24 +22,17 @@ def recognize_intent(user_message: str) -> Dict[str, Any]:
             }
         }
     """
-    prompt = INTENT_RECOGNITION_USER.format(user_message=user_message)
-    
-    response_text = chat(
-        prompt=prompt,
-        system_prompt=INTENT_RECOGNITION_SYSTEM,
-        temperature=0.0  # force deterministic JSON
-    )
-
+    prompt = render(INTENT_RECOGNITION_USER, user_message=user_message)
     
     try:
-        result = _extract_json(response_text)
-        print("=" * 80)
-        print("DIAGNOSTIC: Intent recognition result")
-        print("=" * 80)
-        print(f"DIAGNOSTIC: Raw LLM response: {response_text}")
-        print(f"DIAGNOSTIC: Parsed result: {result}")
-        print(f"DIAGNOSTIC: entities: {result.get('entities', {})}")
-        print(f"DIAGNOSTIC: entities['date']: {repr(result.get('entities', {}).get('date'))}")
+        result = chat_json(
+            prompt=prompt,
+            system_prompt=INTENT_RECOGNITION_SYSTEM,
+            schema=INTENT_SCHEMA,
+            temperature=0.0,  # force deterministic JSON
+            prompt_type="intent",
+        )
+        diag.info("Intent recognition result: %s", result)
 
         entities = result.get("entities", {}) or {}
         entities["_raw_user_text"] = user_message
@@ -73,9 +42,11 @@ def recognize_intent(user_message: str) -> Dict[str, Any]:
             "confidence": float(result.get("confidence", 0.0)),
             "entities": entities,
         }
-    except (json.JSONDecodeError, ValueError, KeyError) as e:
-        print(f"DIAGNOSTIC: JSON parsing failed: {type(e).__name__}: {e}")
-        print(f"DIAGNOSTIC: Falling back to default (empty entities)")
+    except LLMOutputError as e:
+        diag.warning(
+            "Intent JSON invalid after repair (%s); falling back to default (empty entities)", e,
+        )
+        diag.debug("Raw LLM response: %s", e.raw)
         # Fallback to default
         return {
             "intent": "other",
@@ -3,13 +3,14 @@
 from typing import Dict, Any, Optional
 from datetime import datetime, date, timezone
 from dateutil import parser
-import uuid
 import re 
 
 from app.agent.intents import recognize_intent
 from app.agent.workflows import MEETING_SUMMARY_WORKFLOW
+from app.config import Config
 
-from app.memory.repo import MemoryRepo
+from app.memory.repo import MemoryRepo, DEFAULT_CONVERSATION_ID
+from app.memory.search import SEARCH_MODES
 from app.memory.schemas import MeetingCreate, MeetingUpdate, MemoryEntryCreate
 
 from app.integrations.calendar import (
@@ -17,16 +18,24 @@ from app.integrations.calendar import (
     get_meeting_by_client_and_date,
     get_next_upcoming_meeting_from_calendar,
     get_most_recent_meeting,
+    match_known_client,
 )
 
 from app.integrations.zoom import extract_zoom_meeting_id, fetch_zoom_transcript
 
 from app.tools.summarize import summarize_meeting
+from app.tools.transcript import normalize_transcript
 from app.tools.followup import generate_followup_email
-from app.tools.meeting_brief import generate_meeting_brief
+from app.tools.meeting_brief import brief_context_hash, generate_meeting_brief
 from app.agent.client_resolution import resolve_client_name
 
 from app.runtime.mode import is_demo_mode
+from app.runtime.diagnostics import get_diagnostics, start_trace
+from app.runtime.spans import span, get_trace_id
+from app.runtime.metrics import WORKFLOW_OUTCOMES, record_cache
+from app.llm import context as prompt_context
+from app.llm import ledger as llm_ledger
+from app.llm import resilience as llm_resilience
 from app.demo.transcripts import load_demo_transcript
 
 from app.integrations.hubspot import (
@@ -38,7 +47,7 @@ from app.integrations.hubspot import (
 from app.demo.calendar import (
     get_most_recent_demo_meeting,
     get_demo_meetings_for_client,
-    load_demo_events,
+    load_demo_events_with_start,
     get_demo_meeting_by_client_and_date,
     get_next_upcoming_demo_meeting,
 )
@@ -47,18 +56,38 @@ from app.demo.calendar import (
 import logging
 
 logger = logging.getLogger(__name__)
+diag = get_diagnostics("orchestrator")
 
 ENABLE_HUBSPOT = True
 
+
+def _one_line(text: Optional[str]) -> str:
+    return " ".join((text or "").split())
+
+
+def _event_start_utc(calendar_event: Dict[str, Any]) -> Optional[datetime]:
+    """Event start as naive UTC, like the model timestamps."""
+    try:
+        start = parser.parse(calendar_event.get("start") or "")
+    except (ValueError, OverflowError):
+        return None
+    if start.tzinfo is not None:
+        start = start.astimezone(timezone.utc).replace(tzinfo=None)
+    return start
+
+
 class Orchestrator:
 
-    def log_trace(self, message: str):
-        logger.info(f"[TRACE {self.trace_id}] {message}")
+    def log_trace(self, message: str, *args):
+        # diag prefixes the current "[TRACE id]"; args are formatted lazily
+        diag.info(message, *args)
 
     """Coordinates agent operations - no SQL, HTTP, or LLM prompts here."""
 
     def __init__(self, memory_repo: MemoryRepo):
         self.memory_repo = memory_repo
+        self.conversation_id = DEFAULT_CONVERSATION_ID
+        self.trace_id = None
 
     # -------------------------------------------------
     # Helpers
@@ -143,11 +172,19 @@ class Orchestrator:
         *,
         client_name: str,
         workflow: str,
+        query: str = "",
+        exclude_meeting_id: Optional[int] = None,
         limit: int = 6,
     ) -> Dict[str, Any]:
         """
         Select and prioritize memory entries for LLM context.
-        Priority order:
+
+        MEMORY_SEARCH=bm25 / hybrid: client memory entries, past summaries and
+        decisions ranked by relevance to `query` (lexical, or lexical fused with
+        embedding similarity) and fitted to MEMORY_CONTEXT_TOKEN_BUDGET
+        (see app/memory/search.py).
+
+        Otherwise, up to `limit` memory entries in priority order:
         1. Decisions
         2. Action items
         3. Meeting summaries
@@ -155,6 +192,26 @@ class Orchestrator:
         Within each group, newest first.
         """
 
+        if Config.MEMORY_SEARCH in SEARCH_MODES:
+            with span("memory.search", workflow=workflow) as s:
+                selected = self.memory_repo.search_memory(
+                    client_name, query, exclude_meeting_id=exclude_meeting_id
+                )
+                if s is not None:
+                    s.set_attribute("entries", len(selected))
+
+            # One line per entry, so packed prompt lines map back to used_entries
+            context = "\n".join(f"{doc.key}: {_one_line(doc.text)}" for doc, _ in selected)
+            used_entries = [
+                {
+                    "key": doc.key,
+                    "created_at": doc.created_at.isoformat() if doc.created_at else None,
+                    "score": round(score, 3) if score is not None else None,
+                }
+                for doc, score in selected
+            ]
+            return {"context": context, "used_entries": used_entries}
+
         entries = self.memory_repo.get_memory_for_client(client_name)
 
         if not entries:
@@ -177,7 +234,7 @@ class Orchestrator:
         ranked = sorted(entries, key=score)
         selected = ranked[:limit]
 
-        context = "\n".join(f"{e.key}: {e.value}" for e in selected)
+        context = "\n".join(f"{e.key}: {_one_line(e.value)}" for e in selected)
         used_entries = [
             {
                 "key": e.key,
@@ -188,25 +245,176 @@ class Orchestrator:
 
         return {"context": context, "used_entries": used_entries}
 
+    def _record_prompt_context(self, memory_provenance: Dict[str, Any]) -> None:
+        """
+        Attach the prompt packing reports to the response provenance.
+
+        Memory entries cut by the prompt token budget move from "entries"
+        to "dropped_entries".
+        """
+        reports = prompt_context.drain()
+        if not reports:
+            return
+        memory_provenance["prompt_context"] = reports
+
+        for report in reports:
+            for section in report["sections"]:
+                if section["name"] != "memory" or section["status"] == prompt_context.KEPT:
+                    continue
+                entries = memory_provenance.get("entries") or []
+                kept = section["kept_items"]
+                memory_provenance["entries"] = entries[:kept]
+                memory_provenance["dropped_entries"] = [
+                    {**entry, "reason": "prompt_token_budget"} for entry in entries[kept:]
+                ]
+
+    def _prepare_meeting_brief(self, client_name: Optional[str], calendar_event: Dict[str, Any]):
+        """
+        Inputs for generate_meeting_brief, their memory provenance and their
+        context hash (the key a precomputed brief is stored under).
+        """
+        memory_provenance = {"entries": []}
+        memory_context = ""
+
+        if client_name:
+            memory_result = self._select_relevant_memory(
+                client_name=client_name,
+                workflow="meeting_brief",
+                query=f"{calendar_event.get('summary', '')}\n{calendar_event.get('description', '')}",
+            )
+            memory_context = memory_result["context"]
+            memory_provenance["entries"] = memory_result["used_entries"]
+
+        brief_inputs = {
+            "client_name": client_name,
+            "meeting_title": calendar_event.get("summary", "Upcoming Meeting"),
+            "meeting_date": calendar_event.get("start"),
+            "attendees": calendar_event.get("attendees", []),
+            "memory_context": memory_context,
+        }
+        return brief_inputs, memory_provenance, brief_context_hash(**brief_inputs)
+
+    def _generate_meeting_brief(
+        self,
+        calendar_event: Dict[str, Any],
+        brief_inputs: Dict[str, Any],
+        memory_provenance: Dict[str, Any],
+        context_hash: str,
+        store: bool,
+    ) -> str:
+        brief_text = generate_meeting_brief(**brief_inputs)
+        self._record_prompt_context(memory_provenance)
+
+        # Degraded output (over an LLM budget) is not worth keeping
+        if store and calendar_event.get("id") and not llm_ledger.current().degraded:
+            self.memory_repo.save_precomputed_brief(
+                calendar_event_id=calendar_event["id"],
+                client_name=brief_inputs["client_name"],
+                meeting_start=_event_start_utc(calendar_event),
+                context_hash=context_hash,
+                brief=brief_text,
+                memory_used=memory_provenance,
+            )
+        return brief_text
+
     # -------------------------------------------------
-    # Public entry point
+    # Public entry points
     # -------------------------------------------------
 
+    def precompute_meeting_brief(self, calendar_event: Dict[str, Any], client_name: Optional[str]) -> bool:
+        """
+        Generate and store the brief for an upcoming event unless a current one
+        is already stored (see app/agent/brief_scheduler.py).
+
+        Returns True when a brief was generated.
+        """
+        self.conversation_id = "brief-scheduler"
+        self.trace_id = start_trace()
+        llm_ledger.begin(trace_id=self.trace_id, conversation_id=self.conversation_id)
+        llm_ledger.set_workflow("meeting_brief_precompute")
+        prompt_context.begin()
+        llm_ledger.refresh_daily_spend(self.memory_repo.get_llm_tokens_since)
+        llm_resilience.begin_request(0)  # Nobody is waiting: no request deadline
+
+        try:
+            with span("brief.precompute", calendar_event_id=calendar_event.get("id")), self.memory_repo.unit_of_work():
+                brief_inputs, memory_provenance, context_hash = self._prepare_meeting_brief(client_name, calendar_event)
+                if self.memory_repo.get_precomputed_brief(calendar_event["id"], context_hash) is not None:
+                    return False
+
+                self._generate_meeting_brief(calendar_event, brief_inputs, memory_provenance, context_hash, store=True)
+        finally:
+            self._persist_llm_usage()
+        return True
+
+    def _persist_llm_usage(self) -> None:
+        """
+        Write the request's ledger rows in their own commit, after the request's
+        unit of work, so a failed (rolled back) request still records the calls
+        it paid for.
+        """
+        records = llm_ledger.drain()
+        if not records:
+            return
+        try:
+            self.memory_repo.record_llm_usage(records)
+        except Exception as e:
+            self.memory_repo.session.rollback()
+            logger.warning(f"Failed to persist {len(records)} LLM usage records: {e}")
+
     def process_message(
     self,
     user_message: str,
     intent_override: Optional[str] = None,
     entities_override: Optional[Dict[str, Any]] = None,
+    conversation_id: Optional[str] = None,
 ) -> Dict[str, Any]:
 
-        self.last_interaction = self.memory_repo.get_last_interaction()
+        # Interaction history and the active meeting are scoped per conversation
+        self.conversation_id = conversation_id or DEFAULT_CONVERSATION_ID
+        # Share the span trace id (when recording) so log lines and spans correlate
+        span_trace_id = get_trace_id()
+        self.trace_id = start_trace(span_trace_id[:8] if span_trace_id else None)
+
+        llm_ledger.begin(trace_id=self.trace_id, conversation_id=self.conversation_id)
+        prompt_context.begin()
+        llm_ledger.refresh_daily_spend(self.memory_repo.get_llm_tokens_since)
+        llm_resilience.begin_request()
+
+        # One transaction per request: repo writes are flushed as they happen
+        # and committed once when the workflow completes.
+        try:
+            with span("orchestrator.process_message"), self.memory_repo.unit_of_work():
+                response = self._process_message(
+                    user_message=user_message,
+                    intent_override=intent_override,
+                    entities_override=entities_override,
+                )
+        finally:
+            self._persist_llm_usage()
+
+        degraded = llm_ledger.current().degraded
+        if degraded:
+            response.setdefault("metadata", {})["llm_degraded"] = degraded
+
+        return response
+
+    def _process_message(
+        self,
+        user_message: str,
+        intent_override: Optional[str] = None,
+        entities_override: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+
+        self.last_interaction = self.memory_repo.get_last_interaction(self.conversation_id)
 
         if intent_override:
             intent = intent_override
             entities = entities_override or {}
             logger.info(f"[INTENT OVERRIDE] intent={intent} entities={entities}")
         else:
-            intent_result = recognize_intent(user_message)
+            with span("intent.recognize"):
+                intent_result = recognize_intent(user_message)
             intent = intent_result.get("intent")
             entities = intent_result.get("entities", {})
 
@@ -215,18 +423,25 @@ class Orchestrator:
 
         if intent == "summarize_meeting":
             workflow = MEETING_SUMMARY_WORKFLOW["name"]
-            response = self._execute_meeting_summary_workflow(entities)
+            llm_ledger.set_workflow(workflow)
+            with span("workflow.summarize_meeting"):
+                response = self._execute_meeting_summary_workflow(entities)
 
         elif intent == "generate_followup":
             workflow = "generate_followup"
-            response = self._execute_followup_workflow()
+            llm_ledger.set_workflow(workflow)
+            with span("workflow.generate_followup"):
+                response = self._execute_followup_workflow()
 
         elif intent == "meeting_brief":
             workflow = "meeting_brief"
-            response = self._execute_meeting_brief_workflow(entities)
+            llm_ledger.set_workflow(workflow)
+            with span("workflow.meeting_brief"):
+                response = self._execute_meeting_brief_workflow(entities)
         
         elif intent == "approve_hubspot_tasks":
-            response = self._execute_hubspot_approval_workflow(entities)
+            with span("workflow.approve_hubspot_tasks"):
+                response = self._execute_hubspot_approval_workflow(entities)
 
         else:
             response = {
@@ -243,12 +458,18 @@ class Orchestrator:
                 "metadata": {"intent": intent},
             }
 
+        WORKFLOW_OUTCOMES.labels(
+            workflow=workflow or intent or "unknown",
+            outcome=(response.get("metadata") or {}).get("error") or "ok",
+        ).inc()
+
         self.memory_repo.create_interaction(
             user_message=user_message,
             intent=intent,
             workflow=workflow,
             response=response.get("message", ""),
             metadata=response.get("metadata", {}),
+            conversation_id=self.conversation_id,
         )
 
         return response
@@ -263,7 +484,6 @@ class Orchestrator:
     ) -> Dict[str, Any]:
         agent_notes = []
         memory_provenance = {}
-        trace_id = str(uuid.uuid4())[:8]
 
         client_name = entities.get("client_name")
 
@@ -406,13 +626,13 @@ class Orchestrator:
         )
 
         if existing_meeting:
-            logger.info(
-                f"[TRACE {trace_id}] Existing meeting found | "
-                f"meeting_id={existing_meeting.id} | "
-                f"client_name='{existing_meeting.client_name}'"
+            self.log_trace(
+                "Existing meeting found | meeting_id=%s | client_name='%s'",
+                existing_meeting.id,
+                existing_meeting.client_name,
             )
         else:
-            logger.info(f"[TRACE {trace_id}] No existing meeting found")
+            self.log_trace("No existing meeting found")
 
 
 
@@ -520,6 +740,8 @@ class Orchestrator:
         else:
             meeting = existing_meeting
 
+        llm_ledger.set_meeting(meeting.id)
+
         # -------------------------------------------------
         # HubSpot Company Resolution (safe: meeting exists)
         # -------------------------------------------------
@@ -530,8 +752,10 @@ class Orchestrator:
 
                 normalized_company = normalize_company_name(client_name)
 
-                meeting.hubspot_company_id = get_or_create_company_id(normalized_company)
-                self.memory_repo.session.commit()
+                self.memory_repo.update_meeting_company(
+                    meeting.id,
+                    get_or_create_company_id(normalized_company),
+                )
 
             except HubSpotIntegrationError as e:
                 logger.warning(
@@ -539,13 +763,31 @@ class Orchestrator:
                     exc_info=e,
                 )
 
+        # -------------------------------------------------
+        # Pre-summary attendee context (SAFE, NON-INFERRED)
+        # -------------------------------------------------
+
+
+        # The stored transcript stays raw; only the prompt gets the normalized text
+        transcript = transcript or self.memory_repo.get_meeting_transcript(meeting)
+        if transcript:
+            with span("transcript.normalize") as s:
+                normalized = normalize_transcript(transcript)
+                if s is not None:
+                    s.set_attribute("tokens_before", normalized["tokens_before"])
+                    s.set_attribute("tokens_after", normalized["tokens_after"])
+            transcript = normalized["text"]
+
         # -------------------------------------------------
         # Summarization
         # -------------------------------------------------
 
+        # Prior memory relevant to what was discussed in this meeting
         memory_result = self._select_relevant_memory(
             client_name=client_name,
             workflow="meeting_summary",
+            query=transcript or "",
+            exclude_meeting_id=meeting.id,
         )
 
         memory_context = memory_result["context"]
@@ -556,15 +798,8 @@ class Orchestrator:
                 f"Incorporated relevant prior decisions and summaries for context"
             )
 
-
-
-        # -------------------------------------------------
-        # Pre-summary attendee context (SAFE, NON-INFERRED)
-        # -------------------------------------------------
-
-
         summary_result = summarize_meeting(
-            transcript=transcript or meeting.transcript,
+            transcript=transcript,
             meeting_metadata={
                 "date": meeting.meeting_date.isoformat(),
                 "attendees": calendar_event.get("attendees", []),
@@ -572,9 +807,7 @@ class Orchestrator:
             },
             memory_context=memory_context,
         )
-
-
-
+        self._record_prompt_context(memory_provenance)
 
         self.memory_repo.update_meeting(
             meeting.id,
@@ -623,7 +856,7 @@ class Orchestrator:
         {chr(10).join(f"- {item.get('text', '')}" for item in summary_result.get('action_items', [])) or "None"}
         """
 
-        self.memory_repo.set_active_meeting(meeting.id)
+        self.memory_repo.set_active_meeting(meeting.id, self.conversation_id)
 
         recent_meetings = self.memory_repo.get_recent_meetings_for_client(
             client_name=client_name,
@@ -656,16 +889,10 @@ class Orchestrator:
                     },
                 }
 
-            demo_events = load_demo_events()
-
-            for e in demo_events:
+            for start_dt, e in load_demo_events_with_start():
                 if e["id"] == calendar_event["id"]:
                     continue
 
-                start_dt = datetime.fromisoformat(
-                    e["start"].replace("Z", "+00:00")
-                ).astimezone(timezone.utc)
-
                 event_date = start_dt.strftime("%B %d")
                 client = e.get("client_name", "the client")
 
@@ -742,7 +969,7 @@ class Orchestrator:
     # -------------------------------------------------
 
     def _execute_followup_workflow(self) -> Dict[str, Any]:
-        meeting = self.memory_repo.get_active_meeting()
+        meeting = self.memory_repo.get_active_meeting(self.conversation_id)
         agent_notes = []
         memory_provenance = {}
 
@@ -773,9 +1000,13 @@ class Orchestrator:
                 },
             }
 
+        llm_ledger.set_meeting(meeting.id)
+
         memory_result = self._select_relevant_memory(
             client_name=meeting.client_name,
             workflow="followup",
+            query="\n".join([meeting.summary, *(d for d in meeting.decisions or [] if isinstance(d, str))]),
+            exclude_meeting_id=meeting.id,
         )
 
         if memory_result["used_entries"]:
@@ -794,7 +1025,7 @@ class Orchestrator:
             meeting_date=meeting.meeting_date.date().isoformat(),
             memory_context=memory_context,
         )
-
+        self._record_prompt_context(memory_provenance)
 
         return {
             "message": followup_text,
@@ -819,7 +1050,6 @@ class Orchestrator:
 
     def _execute_meeting_brief_workflow(self, entities: Dict[str, Any]) -> Dict[str, Any]:
         client_name = entities.get("client_name")
-        calendar_event = get_next_upcoming_meeting_from_calendar(client_name)
 
         if is_demo_mode():
             calendar_event = get_next_upcoming_demo_meeting(client_name or "MTCA")
@@ -835,35 +1065,37 @@ class Orchestrator:
                 "metadata": {"error": "no_upcoming_meeting"},
             }
 
-        memory_provenance = {"entries": []}
+        # Same client resolution as the brief scheduler, so a stored brief's hash matches;
+        # the requested name is kept only when the event names no known client
+        client_name = match_known_client(calendar_event, self.memory_repo.get_distinct_client_names()) or client_name
+
         agent_notes = []
+        brief_inputs, memory_provenance, context_hash = self._prepare_meeting_brief(client_name, calendar_event)
 
         if client_name:
-            memory_result = self._select_relevant_memory(
-                client_name=client_name,
-                workflow="meeting_brief",
-            )
-            memory_context = memory_result["context"]
-            memory_provenance["entries"] = memory_result["used_entries"]
-            if memory_result["used_entries"]:
+            if memory_provenance["entries"]:
                 agent_notes.append(
                     f"Used prior {client_name} context to prepare this meeting brief"
                 )
-
         else:
-            memory_context = ""
             agent_notes.append(
                 "Prepared a briefing for the next upcoming meeting"
             )
 
+        # Served from the brief scheduler while its inputs are unchanged
+        stored = None
+        if Config.BRIEF_PRECOMPUTE and calendar_event.get("id"):
+            stored = self.memory_repo.get_precomputed_brief(calendar_event["id"], context_hash)
+            record_cache("precomputed_brief", hit=stored is not None)
 
-        brief_text = generate_meeting_brief(
-            client_name=client_name,
-            meeting_title=calendar_event.get("summary", "Upcoming Meeting"),
-            meeting_date=calendar_event.get("start"),
-            attendees=calendar_event.get("attendees", []),
-            memory_context=memory_context,
-        )
+        if stored is not None:
+            brief_text = stored.brief
+            memory_provenance = stored.memory_used or memory_provenance
+            agent_notes.append("Brief was prepared ahead of the meeting")
+        else:
+            brief_text = self._generate_meeting_brief(
+                calendar_event, brief_inputs, memory_provenance, context_hash, store=Config.BRIEF_PRECOMPUTE
+            )
 
         return {
             "message": brief_text,
@@ -894,7 +1126,7 @@ class Orchestrator:
 
 
     def _execute_hubspot_approval_workflow(self, entities):
-        meeting = self.memory_repo.get_active_meeting()
+        meeting = self.memory_repo.get_active_meeting(self.conversation_id)
 
         if not meeting:
             return {
@@ -1,12 +1,16 @@
 """Chat API endpoint - receives messages, calls orchestrator."""
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
-from app.db.session import SessionLocal
+from app.db.session import SessionLocal, ReplicaSessionLocal, get_async_sessionmaker
 from app.agent.orchestrator import Orchestrator
 from app.memory.repo import MemoryRepo
-from typing import Optional
+from app.memory.async_repo import AsyncMemoryRepo
+from typing import List, Optional
 from app.runtime.mode import is_demo_mode
+from app.runtime import spans
+from app.llm.resilience import LLMDeadlineExceeded, LLMUnavailableError
+from app.config import Config
 from datetime import datetime
 from app.memory.schemas import MeetingCreate
 
@@ -23,10 +27,40 @@ def get_db():
         db.close()
 
 
+def get_read_db():
+    """Dependency for the read-replica session (None when no replica is configured)."""
+    if ReplicaSessionLocal is None:
+        yield None
+        return
+
+    db = ReplicaSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_memory_repo():
+    """
+    Dependency for the asyncio repository (requires DB_ASYNC=true).
+    Lets async endpoints hit the DB without occupying a threadpool worker.
+    """
+    if not Config.DB_ASYNC:
+        raise HTTPException(
+            status_code=503,
+            detail="Async database access is disabled (set DB_ASYNC=true)",
+        )
+    session_factory = get_async_sessionmaker()
+    async with session_factory() as session:
+        yield AsyncMemoryRepo(session)
+
+
 class ChatRequest(BaseModel):
     message: Optional[str] = None
     intent: Optional[str] = None
     entities: Optional[dict] = None
+    conversation_id: Optional[str] = None
+    include_timings: bool = False  # Adds metadata["timings"] and a Server-Timing header
 
 
 
@@ -36,8 +70,28 @@ class ChatResponse(BaseModel):
     metadata: dict = {}
 
 
+class ClientsResponse(BaseModel):
+    """Response model for the clients endpoint."""
+    clients: List[str]
+
+
+@router.get("/api/clients", response_model=ClientsResponse)
+async def list_clients(repo: AsyncMemoryRepo = Depends(get_async_memory_repo)):
+    """
+    GET /api/clients
+
+    Known client names (from past meetings), read on the async engine.
+    """
+    return ClientsResponse(clients=await repo.get_distinct_client_names())
+
+
 @router.post("/api/chat", response_model=ChatResponse)
-def chat(request: ChatRequest, db: Session = Depends(get_db)):
+def chat(
+    request: ChatRequest,
+    response: Response,
+    db: Session = Depends(get_db),
+    read_db: Optional[Session] = Depends(get_read_db),
+):
     """
     POST /api/chat
     
@@ -50,9 +104,13 @@ def chat(request: ChatRequest, db: Session = Depends(get_db)):
             detail="Either message or intent must be provided"
         )
 
-    
+
+    include_timings = request.include_timings or Config.TRACE_TIMINGS
+    if include_timings or spans.export_enabled():
+        spans.start_recording()
+
     # Create orchestrator with memory repo
-    memory_repo = MemoryRepo(db)
+    memory_repo = MemoryRepo(db, read_db=read_db)
 
 
     # If in demo mode, create a demo meeting
@@ -72,14 +130,35 @@ def chat(request: ChatRequest, db: Session = Depends(get_db)):
     orchestrator = Orchestrator(memory_repo)
     
     # Process message
-    result = orchestrator.process_message(
-        user_message=request.message or "",
-        intent_override=request.intent,
-        entities_override=request.entities,
-    )
+    try:
+        result = orchestrator.process_message(
+            user_message=request.message or "",
+            intent_override=request.intent,
+            entities_override=request.entities,
+            conversation_id=request.conversation_id,
+        )
+    except LLMUnavailableError:
+        # Circuit open: shed load instead of queueing behind a failing provider
+        raise HTTPException(
+            status_code=503,
+            detail="The language model is temporarily unavailable. Please retry shortly.",
+            headers={"Retry-After": str(int(Config.LLM_BREAKER_COOLDOWN_SECONDS))},
+        )
+    except LLMDeadlineExceeded:
+        raise HTTPException(
+            status_code=504,
+            detail="The language model did not respond in time. Please retry.",
+        )
+    finally:
+        recorder = spans.finish_recording()
+
+    metadata = result.get("metadata", {})
+
+    if include_timings and recorder is not None:
+        metadata = {**metadata, "timings": recorder.timings()}
+        response.headers["Server-Timing"] = spans.server_timing_header(recorder)
 
-    
     return ChatResponse(
         message=result.get("message", ""),
-        metadata=result.get("metadata", {})
+        metadata=metadata
     )
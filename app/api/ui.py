@@ -766,6 +766,10 @@ def chat_ui():
 
         let lastMetadata = null;
 
+        // Per-tab conversation key: scopes "last interaction" and the active meeting
+        const conversationId = sessionStorage.getItem('conversationId') || crypto.randomUUID();
+        sessionStorage.setItem('conversationId', conversationId);
+
         
         function handleKeyPress(event) {
             if (event.key === 'Enter') {
@@ -799,7 +803,7 @@ def chat_ui():
                     headers: {
                         'Content-Type': 'application/json',
                     },
-                    body: JSON.stringify({ message: message })
+                    body: JSON.stringify({ message: message, conversation_id: conversationId })
                 });
                 
                 if (!response.ok) {
@@ -880,7 +884,7 @@ def chat_ui():
                 const response = await fetch('/api/chat', {
                     method: 'POST',
                     headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify({ message: text })
+                    body: JSON.stringify({ message: text, conversation_id: conversationId })
                 });
 
                 if (!response.ok) throw new Error('Server error');
@@ -1098,7 +1102,8 @@ def chat_ui():
                     headers: { 'Content-Type': 'application/json' },
                     body: JSON.stringify({
                         intent: "approve_hubspot_tasks",
-                        entities: { approved_task_indexes: approvedIndexes }
+                        entities: { approved_task_indexes: approvedIndexes },
+                        conversation_id: conversationId
                     })
                 });
 
@@ -1,10 +1,220 @@
 """Database session management."""
-from sqlalchemy import create_engine
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
 from app.config import Config
+from app.runtime.metrics import DB_POOL_CHECKOUTS, DB_POOL_TIMEOUTS, DB_POOL_WAIT
+from app.runtime.spans import instrument_engine
+
+
+class PoolMetrics:
+    """Thread-safe counters for connection checkout / wait behaviour."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+
+    def record_wait(self, wait_ms: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+        (DB_POOL_TIMEOUTS if timed_out else DB_POOL_CHECKOUTS).inc()
+        DB_POOL_WAIT.inc(wait_ms / 1000)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "total_wait_ms": round(self.total_wait_ms, 2),
+                "avg_wait_ms": round(self.total_wait_ms / self.checkouts, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait_ms, 2),
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.record_wait((time.perf_counter() - started) * 1000, timed_out=True)
+            raise
+        pool_metrics.record_wait((time.perf_counter() - started) * 1000)
+        return conn
+
+
+def _engine_kwargs(url: str) -> Dict[str, Any]:
+    """Build create_engine() options for the configured backend."""
+    backend = make_url(url).get_backend_name()
+    kwargs: Dict[str, Any] = {"pool_pre_ping": Config.DB_POOL_PRE_PING}
+
+    if backend == "sqlite":
+        # FastAPI runs sync endpoints on a threadpool; connections cross threads
+        kwargs["connect_args"] = {"check_same_thread": False}
+        database = make_url(url).database
+        if not database or database == ":memory:":
+            # One connection shared by every thread; the default SingletonThreadPool
+            # would give each threadpool worker its own, empty, in-memory database
+            kwargs["poolclass"] = StaticPool
+            return kwargs
+    elif backend == "postgresql" and Config.DB_STATEMENT_TIMEOUT_MS > 0:
+        kwargs["connect_args"] = {
+            "options": f"-c statement_timeout={Config.DB_STATEMENT_TIMEOUT_MS}"
+        }
+
+    kwargs.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=Config.DB_POOL_SIZE,
+        max_overflow=Config.DB_MAX_OVERFLOW,
+        pool_timeout=Config.DB_POOL_TIMEOUT,
+        pool_recycle=Config.DB_POOL_RECYCLE,
+    )
+    return kwargs
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={Config.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={Config.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA mmap_size={Config.SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA busy_timeout={Config.SQLITE_BUSY_TIMEOUT_MS}")
+    finally:
+        cursor.close()
+
+
+engine = create_engine(Config.DATABASE_URL, **_engine_kwargs(Config.DATABASE_URL))
+
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", _apply_sqlite_pragmas)
+instrument_engine(engine)
 
-engine = create_engine(Config.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Read replica (optional). None when DATABASE_REPLICA_URL is not configured.
+replica_engine = None
+ReplicaSessionLocal = None
+
+if Config.DATABASE_REPLICA_URL:
+    replica_engine = create_engine(
+        Config.DATABASE_REPLICA_URL,
+        **_engine_kwargs(Config.DATABASE_REPLICA_URL),
+    )
+    if replica_engine.dialect.name == "sqlite":
+        event.listen(replica_engine, "connect", _apply_sqlite_pragmas)
+    instrument_engine(replica_engine)
+    ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+
 Base = declarative_base()
+
+
+# ---- Async engine (opt-in via DB_ASYNC) ----
+
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+_async_engine = None
+_async_sessionmaker = None
+
+
+def _async_url(url: str) -> str:
+    """Swap the sync DBAPI driver for its asyncio counterpart."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise RuntimeError(f"❌ No async driver configured for '{backend}' databases")
+    return parsed.set(drivername=_ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def _async_engine_kwargs(url: str) -> Dict[str, Any]:
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    kwargs: Dict[str, Any] = {"pool_pre_ping": Config.DB_POOL_PRE_PING}
+
+    if backend == "sqlite":
+        if not parsed.database or parsed.database == ":memory:":
+            return kwargs
+    elif backend == "postgresql" and Config.DB_STATEMENT_TIMEOUT_MS > 0:
+        kwargs["connect_args"] = {
+            "server_settings": {"statement_timeout": str(Config.DB_STATEMENT_TIMEOUT_MS)}
+        }
+
+    kwargs.update(
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=Config.DB_POOL_SIZE,
+        max_overflow=Config.DB_MAX_OVERFLOW,
+        pool_timeout=Config.DB_POOL_TIMEOUT,
+        pool_recycle=Config.DB_POOL_RECYCLE,
+    )
+    return kwargs
+
+
+def get_async_sessionmaker():
+    """
+    Lazily build the async engine and session factory.
+    Requires DB_ASYNC=true and the matching driver (asyncpg / aiosqlite).
+    """
+    global _async_engine, _async_sessionmaker
+
+    if not Config.DB_ASYNC:
+        raise RuntimeError("❌ Async database access is disabled (set DB_ASYNC=true)")
+
+    if _async_sessionmaker is None:
+        from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+        _async_engine = create_async_engine(
+            _async_url(Config.DATABASE_URL),
+            **_async_engine_kwargs(Config.DATABASE_URL),
+        )
+        if _async_engine.dialect.name == "sqlite":
+            event.listen(_async_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+        instrument_engine(_async_engine.sync_engine)
+
+        _async_sessionmaker = async_sessionmaker(
+            _async_engine,
+            class_=AsyncSession,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+
+    return _async_sessionmaker
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Current pool occupancy plus cumulative checkout / wait metrics."""
+    pool = engine.pool
+    stats: Dict[str, Any] = {"pool_class": type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+            max_overflow=Config.DB_MAX_OVERFLOW,
+        )
+
+    stats.update(pool_metrics.snapshot())
+    return stats
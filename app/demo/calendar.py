@@ -1,84 +1,128 @@
 from pathlib import Path
 from datetime import datetime, timezone
+from bisect import bisect_right
 import json
-from typing import List, Optional, Dict
+import threading
+from typing import List, Optional, Dict, Tuple
+
+from app.runtime.metrics import record_cache
 
 _DATA_DIR = Path(__file__).resolve().parent / "data"
 _EVENTS_FILE = _DATA_DIR / "calendar_events.json"
 
-def load_demo_events() -> List[dict]:
-    return json.loads(_EVENTS_FILE.read_text(encoding="utf-8"))
 
-def get_most_recent_demo_meeting() -> Optional[dict]:
-        now = datetime.now(timezone.utc)
-        events = load_demo_events()
+class _EventIndex:
+    """
+    Parsed view of calendar_events.json.
+    Start times are parsed once; sorted start lists back the bisect lookups.
+    """
 
-        past_events = []
+    def __init__(self, events: List[dict]):
+        self.events = events
+        # (start_dt, event) in file order; unparseable starts are left out
+        self.timed: List[Tuple[datetime, dict]] = []
+        self.by_client: Dict[str, List[dict]] = {}
+        self.by_client_and_date: Dict[Tuple[str, str], dict] = {}
 
         for e in events:
-            start_dt = datetime.fromisoformat(
-                e["start"].replace("Z", "+00:00")
-            )
+            client_key = e.get("client_name", "").lower()
+            self.by_client.setdefault(client_key, []).append(e)
+            self.by_client_and_date.setdefault((client_key, e.get("start", "")[:10]), e)
+
+            try:
+                start_dt = datetime.fromisoformat(
+                    e["start"].replace("Z", "+00:00")
+                ).astimezone(timezone.utc)
+            except Exception:
+                continue
+            self.timed.append((start_dt, e))
+
+        ordered = sorted(self.timed, key=lambda x: x[0])
+        self.starts = [dt for dt, _ in ordered]
+        self.sorted_events = [e for _, e in ordered]
+
+        self.client_starts: Dict[str, List[datetime]] = {}
+        self.client_sorted_events: Dict[str, List[dict]] = {}
+        for dt, e in ordered:
+            client_key = e.get("client_name", "").lower()
+            self.client_starts.setdefault(client_key, []).append(dt)
+            self.client_sorted_events.setdefault(client_key, []).append(e)
+
+
+_index: Optional[_EventIndex] = None
+_index_mtime_ns: Optional[int] = None
+_index_lock = threading.Lock()
+
+
+def _get_index() -> _EventIndex:
+    """Return the cached index, re-reading the file only when its mtime changes."""
+    global _index, _index_mtime_ns
+
+    mtime_ns = _EVENTS_FILE.stat().st_mtime_ns
+    if _index is not None and mtime_ns == _index_mtime_ns:
+        record_cache("demo_calendar_events", hit=True)
+        return _index
+
+    record_cache("demo_calendar_events", hit=False)
+
+    with _index_lock:
+        if _index is None or mtime_ns != _index_mtime_ns:
+            events = json.loads(_EVENTS_FILE.read_text(encoding="utf-8"))
+            _index = _EventIndex(events)
+            _index_mtime_ns = mtime_ns
+        return _index
 
-            if start_dt <= now:
-                past_events.append((start_dt, e))
 
-        if not past_events:
-            return None
+def load_demo_events() -> List[dict]:
+    return list(_get_index().events)
+
 
-        # 🔑 SORT BY DATE DESCENDING
-        past_events.sort(key=lambda x: x[0], reverse=True)
+def load_demo_events_with_start() -> List[Tuple[datetime, dict]]:
+    """Events paired with their parsed UTC start, in file order."""
+    return list(_get_index().timed)
 
-        return past_events[0][1]
+
+def get_most_recent_demo_meeting() -> Optional[dict]:
+    index = _get_index()
+    # Latest start <= now
+    pos = bisect_right(index.starts, datetime.now(timezone.utc))
+    if pos == 0:
+        return None
+    return index.sorted_events[pos - 1]
 
 def get_demo_meetings_for_client(client_name: str) -> List[dict]:
-    return [
-        e for e in load_demo_events()
-        if e["client_name"].lower() == client_name.lower()
-    ]
+    return list(_get_index().by_client.get(client_name.lower(), []))
 
 
 def get_demo_meeting_by_client_and_date(
     client_name: str,
     target_date
     ) -> Optional[Dict]:
-    for e in load_demo_events():
-        if (
-            e["client_name"].lower() == client_name.lower()
-            and e["start"][:10] == target_date.isoformat()
-        ):
-            return e
-    return None
+    return _get_index().by_client_and_date.get(
+        (client_name.lower(), target_date.isoformat())
+    )
 
 def get_next_upcoming_demo_meeting(
     client_name: Optional[str] = None
 ) -> Optional[Dict]:
-    now = datetime.now(timezone.utc)
-
-    events = load_demo_events()
+    index = _get_index()
 
     if client_name:
-        events = [
-            e for e in events
-            if e.get("client_name", "").lower() == client_name.lower()
-        ]
-
-    future_events = []
-
-    for e in events:
-        try:
-            start_dt = datetime.fromisoformat(
-                e["start"].replace("Z", "+00:00")
-            ).astimezone(timezone.utc)
-        except Exception:
-            continue
-
-        if start_dt > now:
-            future_events.append((start_dt, e))
-
-    if not future_events:
+        starts = index.client_starts.get(client_name.lower(), [])
+        events = index.client_sorted_events.get(client_name.lower(), [])
+    else:
+        starts = index.starts
+        events = index.sorted_events
+
+    # 🔑 Earliest start strictly after now
+    pos = bisect_right(starts, datetime.now(timezone.utc))
+    if pos == len(starts):
         return None
+    return events[pos]
+
 
-    # 🔑 Earliest upcoming meeting
-    future_events.sort(key=lambda x: x[0])
-    return future_events[0][1]
+def get_upcoming_demo_meetings(until: datetime) -> List[Dict]:
+    """Events starting after now and no later than `until`, soonest first."""
+    index = _get_index()
+    now = datetime.now(timezone.utc)
+    return index.sorted_events[bisect_right(index.starts, now):bisect_right(index.starts, until)]
@@ -1,7 +1,15 @@
 from pathlib import Path
+import threading
+from typing import Dict, Tuple
+
+from app.runtime.metrics import record_cache
 
 BASE_PATH = Path(__file__).parent / "data"
 
+# filename -> (mtime_ns, text); re-read only when the file changes
+_transcript_cache: Dict[str, Tuple[int, str]] = {}
+_cache_lock = threading.Lock()
+
 
 def load_demo_transcript(calendar_event: dict) -> str:
     filename = calendar_event.get("transcript_file")
@@ -14,9 +22,21 @@ def load_demo_transcript(calendar_event: dict) -> str:
 
     transcript_path = BASE_PATH / filename
 
-    if not transcript_path.exists():
+    try:
+        mtime_ns = transcript_path.stat().st_mtime_ns
+    except FileNotFoundError:
         raise FileNotFoundError(
             f"Missing demo transcript file: {transcript_path}"
         )
 
-    return transcript_path.read_text(encoding="utf-8")
+    cached = _transcript_cache.get(filename)
+    if cached and cached[0] == mtime_ns:
+        record_cache("demo_transcripts", hit=True)
+        return cached[1]
+
+    record_cache("demo_transcripts", hit=False)
+
+    text = transcript_path.read_text(encoding="utf-8")
+    with _cache_lock:
+        _transcript_cache[filename] = (mtime_ns, text)
+    return text
@@ -9,15 +9,18 @@ import os
 from app.config import Config
 from dateutil import parser as date_parser
 from app.runtime.mode import is_demo_mode
-
-from app.runtime.mode import is_demo_mode
+from app.runtime.diagnostics import DEBUG, get_diagnostics
+from app.runtime.spans import traced
+from app.runtime.metrics import observe_integration
 from app.demo.calendar import (
     get_most_recent_demo_meeting,
     get_demo_meetings_for_client,
+    get_demo_meeting_by_client_and_date,
     get_next_upcoming_demo_meeting,
+    get_upcoming_demo_meetings,
 )
 
-
+diag = get_diagnostics("calendar")
 
 SCOPES = ['https://www.googleapis.com/auth/calendar.readonly']
 
@@ -59,6 +62,28 @@ def get_calendar_service():
     
     return build('calendar', 'v3', credentials=creds)
 
+def _dump_raw_events(label: str, events: List[Dict[str, Any]]) -> None:
+    """Per-event dump; only built when calendar DEBUG is enabled for this trace."""
+    if not diag.is_enabled(DEBUG):
+        return
+
+    for idx, event in enumerate(events, 1):
+        start_data = event.get('start', {})
+        diag.debug(
+            "%s event #%s: id=%s summary=%r start=%s organizer=%s creator=%s attendees=%s location=%r",
+            label,
+            idx,
+            event.get('id'),
+            event.get('summary', ''),
+            start_data.get('dateTime') or start_data.get('date'),
+            (event.get('organizer') or {}).get('email', ''),
+            (event.get('creator') or {}).get('email', ''),
+            [a.get('email', '') for a in event.get('attendees', []) if a.get('email')],
+            event.get('location', ''),
+        )
+
+@traced("calendar.get_recent_meetings")
+@observe_integration("calendar", "get_recent_meetings")
 def get_recent_meetings(days_back: int = 30) -> List[Dict[str, Any]]:
     """
     Fetch recent calendar meetings.
@@ -66,20 +91,14 @@ def get_recent_meetings(days_back: int = 30) -> List[Dict[str, Any]]:
     Returns:
         List of calendar events with id, summary, start, end, description, attendees
     """
-    print("=" * 80)
-    print("DIAGNOSTIC: get_recent_meetings()")
-    print("=" * 80)
-    
     service = get_calendar_service()
     time_min = (datetime.utcnow() - timedelta(days=days_back)).isoformat() + 'Z'
     time_max = datetime.utcnow().isoformat() + 'Z'
     
-    print(f"DIAGNOSTIC: Query parameters:")
-    print(f"  timeMin: {time_min}")
-    print(f"  timeMax: {time_max}")
-    print(f"  maxResults: 50")
-    print(f"  days_back: {days_back}")
-    print(f"  calendarId: {Config.GOOGLE_CALENDAR_ID}")
+    diag.debug(
+        "get_recent_meetings: timeMin=%s timeMax=%s maxResults=50 days_back=%s calendarId=%s",
+        time_min, time_max, days_back, Config.GOOGLE_CALENDAR_ID,
+    )
     
     all_events = []
     page_token = None
@@ -87,9 +106,6 @@ def get_recent_meetings(days_back: int = 30) -> List[Dict[str, Any]]:
     
     while True:
         page_num += 1
-        print(f"\nDIAGNOSTIC: Fetching page {page_num}")
-        print(f"  pageToken (before): {page_token}")
-        
         request_params = {
             'calendarId': Config.GOOGLE_CALENDAR_ID,
             'timeMin': time_min,
@@ -107,8 +123,10 @@ def get_recent_meetings(days_back: int = 30) -> List[Dict[str, Any]]:
         events = events_result.get('items', [])
         next_page_token = events_result.get('nextPageToken')
         
-        print(f"  Events returned this page: {len(events)}")
-        print(f"  nextPageToken (after): {next_page_token}")
+        diag.debug(
+            "page %s: pageToken=%s events=%s nextPageToken=%s",
+            page_num, page_token, len(events), next_page_token,
+        )
         
         all_events.extend(events)
         
@@ -117,24 +135,8 @@ def get_recent_meetings(days_back: int = 30) -> List[Dict[str, Any]]:
         
         page_token = next_page_token
     
-    print(f"\nDIAGNOSTIC: Total events retrieved across all pages: {len(all_events)}")
-    print(f"DIAGNOSTIC: Pagination complete: {'YES' if page_num > 1 else 'NO (single page)'}")
-    
-    print("\nDIAGNOSTIC: RAW EVENT DUMP (before filtering):")
-    print("-" * 80)
-    for idx, event in enumerate(all_events, 1):
-        print(f"\nEvent #{idx}:")
-        print(f"  id: {event.get('id')}")
-        print(f"  summary: {event.get('summary', '')}")
-        start_data = event.get('start', {})
-        start_dt = start_data.get('dateTime') or start_data.get('date')
-        print(f"  start: {start_dt}")
-        print(f"  organizer.email: {(event.get('organizer') or {}).get('email', '')}")
-        print(f"  creator.email: {(event.get('creator') or {}).get('email', '')}")
-        attendees = [a.get('email', '') for a in event.get('attendees', []) if a.get('email')]
-        print(f"  attendees: {attendees}")
-        print(f"  location: {event.get('location', '')}")
-    print("-" * 80)
+    diag.info("get_recent_meetings: %s events across %s page(s)", len(all_events), page_num)
+    _dump_raw_events("raw", all_events)
     
     events = all_events
     
@@ -155,6 +157,8 @@ def get_recent_meetings(days_back: int = 30) -> List[Dict[str, Any]]:
         for event in events
     ]
 
+@traced("calendar.get_most_recent_meeting")
+@observe_integration("calendar", "get_most_recent_meeting")
 def get_most_recent_meeting(days_back: int = 30) -> Optional[Dict[str, Any]]:
     if is_demo_mode():
         return get_most_recent_demo_meeting()
@@ -200,6 +204,8 @@ def search_meetings_by_client(client_name: str, days_back: int = 90) -> List[Dic
         if _matches_client(meeting, client_lower)
     ]
 
+@traced("calendar.get_most_recent_meeting_by_client")
+@observe_integration("calendar", "get_most_recent_meeting_by_client")
 def get_most_recent_meeting_by_client(client_name: str) -> Optional[Dict[str, Any]]:
     """Get the most recent meeting for a client."""
 
@@ -209,40 +215,29 @@ def get_most_recent_meeting_by_client(client_name: str) -> Optional[Dict[str, An
     
     meetings = search_meetings_by_client(client_name)
     if not meetings:
-        print("DIAGNOSTIC: No meetings found")
+        diag.info("No meetings found for client %r", client_name)
         return None
-    
-    for idx, m in enumerate(meetings, 1):
-        try:
-            parsed_dt = _to_utc_datetime(m["start"])
-            print(f"  #{idx}: start='{m['start']}' -> parsed={parsed_dt}, summary='{m['summary']}'")
-        except Exception as e:
-            print(f"  #{idx}: start='{m['start']}' -> PARSE ERROR: {e}, summary='{m['summary']}'")
 
     # Sort by start time, most recent first
-    print(f"\nDIAGNOSTIC: Sorting by start time (most recent first)...")
     meetings.sort(
         key=lambda x: _to_utc_datetime(x["start"]),
         reverse=True
     )
-    
-    print(f"\nDIAGNOSTIC: Meetings AFTER sorting:")
-    print("-" * 80)
-    for idx, m in enumerate(meetings, 1):
-        try:
-            parsed_dt = _to_utc_datetime(m["start"])
-            print(f"  #{idx}: start='{m['start']}' -> parsed={parsed_dt}, summary='{m['summary']}'")
-        except Exception as e:
-            print(f"  #{idx}: start='{m['start']}' -> PARSE ERROR: {e}, summary='{m['summary']}'")
-    
+
+    if diag.is_enabled(DEBUG):
+        for idx, m in enumerate(meetings, 1):
+            diag.debug("sorted #%s: start=%r summary=%r", idx, m["start"], m["summary"])
+
     selected = meetings[0]
-    print(f"\nDIAGNOSTIC: Selected meeting (most recent):")
-    print(f"  start: {selected['start']}")
-    print(f"  summary: {selected['summary']}")
-    print(f"  id: {selected.get('id')}")
+    diag.info(
+        "Selected most recent meeting: id=%s start=%s summary=%r",
+        selected.get('id'), selected['start'], selected['summary'],
+    )
     
     return selected
 
+@traced("calendar.get_meeting_by_client_and_date")
+@observe_integration("calendar", "get_meeting_by_client_and_date")
 def get_meeting_by_client_and_date(
     client_name: str,
     target_date: date,
@@ -257,13 +252,6 @@ def get_meeting_by_client_and_date(
 
 
 
-    print("=" * 80)
-    print("DIAGNOSTIC: get_meeting_by_client_and_date()")
-    print("=" * 80)
-    print(f"DIAGNOSTIC: Input parameters:")
-    print(f"  client_name: {client_name}")
-    print(f"  target_date: {target_date} (type: {type(target_date)})")
-    
     start_dt = datetime.combine(
         target_date,
         datetime.min.time(),
@@ -278,13 +266,10 @@ def get_meeting_by_client_and_date(
     start_range = start_dt.isoformat()
     end_range = end_dt.isoformat()
     
-    print(f"\nDIAGNOSTIC: Date window computation:")
-    print(f"  start_dt: {start_dt} (timezone: {start_dt.tzinfo})")
-    print(f"  end_dt: {end_dt} (timezone: {end_dt.tzinfo})")
-    print(f"  timeMin: {start_range}")
-    print(f"  timeMax: {end_range}")
-    print(f"  ISO format valid: YES")
-    print(f"  December 12, 2025 00:00-23:59 UTC covered: {'YES' if target_date == date(2025, 12, 12) else 'N/A'}")
+    diag.debug(
+        "get_meeting_by_client_and_date: client_name=%r target_date=%s timeMin=%s timeMax=%s",
+        client_name, target_date, start_range, end_range,
+    )
 
     service = get_calendar_service()
     
@@ -294,9 +279,6 @@ def get_meeting_by_client_and_date(
     
     while True:
         page_num += 1
-        print(f"\nDIAGNOSTIC: Fetching page {page_num}")
-        print(f"  pageToken (before): {page_token}")
-        
         request_params = {
             'calendarId': Config.GOOGLE_CALENDAR_ID,
             'timeMin': start_range,
@@ -309,17 +291,15 @@ def get_meeting_by_client_and_date(
         if page_token:
             request_params['pageToken'] = page_token
         
-        print(f"  timeMin: {start_range}")
-        print(f"  timeMax: {end_range}")
-        print(f"  maxResults: 20")
-        
         events_result = service.events().list(**request_params).execute()
         
         events = events_result.get("items", [])
         next_page_token = events_result.get('nextPageToken')
         
-        print(f"  Events returned this page: {len(events)}")
-        print(f"  nextPageToken (after): {next_page_token}")
+        diag.debug(
+            "page %s: pageToken=%s events=%s nextPageToken=%s",
+            page_num, page_token, len(events), next_page_token,
+        )
         
         all_events.extend(events)
         
@@ -328,31 +308,13 @@ def get_meeting_by_client_and_date(
         
         page_token = next_page_token
     
-    print(f"\nDIAGNOSTIC: Total events retrieved across all pages: {len(all_events)}")
-    print(f"DIAGNOSTIC: Pagination complete: {'YES' if page_num > 1 else 'NO (single page)'}")
-    
-    print("\nDIAGNOSTIC: RAW EVENT DUMP (before client filtering):")
-    print("-" * 80)
-    for idx, event in enumerate(all_events, 1):
-        print(f"\nEvent #{idx}:")
-        print(f"  id: {event.get('id')}")
-        print(f"  summary: {event.get('summary', '')}")
-        start_data = event.get('start', {})
-        start_dt_str = start_data.get('dateTime') or start_data.get('date')
-        print(f"  start: {start_dt_str}")
-        print(f"  organizer.email: {(event.get('organizer') or {}).get('email', '')}")
-        print(f"  creator.email: {(event.get('creator') or {}).get('email', '')}")
-        attendees = [a.get('email', '') for a in event.get('attendees', []) if a.get('email')]
-        print(f"  attendees: {attendees}")
-        print(f"  location: {event.get('location', '')}")
-    print("-" * 80)
+    diag.info("get_meeting_by_client_and_date: %s events across %s page(s)", len(all_events), page_num)
+    _dump_raw_events("raw", all_events)
     
     events = all_events
 
     client_lower = client_name.lower()
     
-    print(f"\nDIAGNOSTIC: Client matching for '{client_name}' (lowercase: '{client_lower}')")
-    print("-" * 80)
 
     for idx, event in enumerate(events, 1):
         summary = event.get("summary", "").lower()
@@ -378,7 +340,7 @@ def get_meeting_by_client_and_date(
 
         # HARD REQUIREMENT: event must be on the requested date
         if event_date != target_date:
-            print("  ✗ Date mismatch, skipping")
+            diag.debug("event #%s: date mismatch (%s), skipping", idx, event_date)
             continue
 
         # SECONDARY: client match
@@ -387,11 +349,10 @@ def get_meeting_by_client_and_date(
             or client_lower in description
         )
 
-        print(f"  date match: YES")
-        print(f"  client match: {matches}")
+        diag.debug("event #%s: date match, client match=%s", idx, matches)
 
         if matches:
-            print(f"  ✓ DATE + CLIENT MATCH FOUND - Returning this event")
+            diag.info("Date + client match found: id=%s", event.get("id"))
             return {
                 "id": event.get("id"),
                 "summary": event.get("summary", ""),
@@ -409,6 +370,69 @@ def get_meeting_by_client_and_date(
 
     return None
 
+def _upcoming_meeting(event: Dict[str, Any], start_str: str) -> Dict[str, Any]:
+    return {
+        "id": event.get("id"),
+        "summary": event.get("summary", ""),
+        "start": start_str,
+        "end": event.get("end", {}).get("dateTime") or event.get("end", {}).get("date"),
+        "description": event.get("description", ""),
+        "attendees": [a.get("email") for a in event.get("attendees", []) if a.get("email")],
+        "organizer": (event.get("organizer") or {}).get("email", ""),
+        "creator": (event.get("creator") or {}).get("email", ""),
+        "location": event.get("location", ""),
+        "hangoutLink": event.get("hangoutLink")
+            or event.get("conferenceData", {})
+            .get("entryPoints", [{}])[0]
+            .get("uri", ""),
+    }
+
+
+def match_known_client(meeting: Dict[str, Any], known_clients: List[str]) -> Optional[str]:
+    """
+    Client for a calendar event: its demo client_name, else the longest known
+    client name mentioned in the event fields.
+    """
+    if meeting.get("client_name"):
+        return meeting["client_name"]
+    for client in sorted(known_clients, key=len, reverse=True):
+        if _matches_client(meeting, client.lower()):
+            return client
+    return None
+
+
+@traced("calendar.get_upcoming_meetings")
+@observe_integration("calendar", "get_upcoming_meetings")
+def get_upcoming_meetings(hours_ahead: float = 24) -> List[Dict[str, Any]]:
+    """Calendar meetings starting within the next `hours_ahead` hours, soonest first."""
+    now = datetime.utcnow().replace(tzinfo=timezone.utc)
+    time_max = now + timedelta(hours=hours_ahead)
+
+    if is_demo_mode():
+        return get_upcoming_demo_meetings(time_max)
+
+    service = get_calendar_service()
+    events_result = service.events().list(
+        calendarId=Config.GOOGLE_CALENDAR_ID,
+        timeMin=now.isoformat(),
+        timeMax=time_max.isoformat(),
+        singleEvents=True,
+        orderBy="startTime",
+        maxResults=100,
+    ).execute()
+
+    meetings = []
+    for event in events_result.get("items", []):
+        start_str = event.get("start", {}).get("dateTime") or event.get("start", {}).get("date")
+        if start_str:
+            meetings.append(_upcoming_meeting(event, start_str))
+
+    diag.info("get_upcoming_meetings: %s events in the next %sh", len(meetings), hours_ahead)
+    return meetings
+
+
+@traced("calendar.get_next_upcoming_meeting")
+@observe_integration("calendar", "get_next_upcoming_meeting")
 def get_next_upcoming_meeting_from_calendar(
     client_name: Optional[str] = None,
     lookahead_days: int = 30,
@@ -423,20 +447,16 @@ def get_next_upcoming_meeting_from_calendar(
 
 
 
-    print("=" * 80)
-    print("DIAGNOSTIC: get_next_upcoming_meeting_from_calendar()")
-    print("=" * 80)
-    print(f"DIAGNOSTIC: client_name: {client_name}")
-    print(f"DIAGNOSTIC: lookahead_days: {lookahead_days}")
-
     service = get_calendar_service()
 
     now = datetime.utcnow().replace(tzinfo=timezone.utc)
     time_min = now.isoformat()
     time_max = (now + timedelta(days=lookahead_days)).isoformat()
 
-    print(f"DIAGNOSTIC: timeMin: {time_min}")
-    print(f"DIAGNOSTIC: timeMax: {time_max}")
+    diag.debug(
+        "get_next_upcoming_meeting_from_calendar: client_name=%r timeMin=%s timeMax=%s",
+        client_name, time_min, time_max,
+    )
 
     events_result = service.events().list(
         calendarId=Config.GOOGLE_CALENDAR_ID,
@@ -449,7 +469,7 @@ def get_next_upcoming_meeting_from_calendar(
 
     events = events_result.get("items", [])
 
-    print(f"DIAGNOSTIC: Events returned: {len(events)}")
+    diag.info("get_next_upcoming_meeting_from_calendar: %s events returned", len(events))
 
     if not events:
         return None
@@ -462,37 +482,21 @@ def get_next_upcoming_meeting_from_calendar(
         try:
             start_dt = _to_utc_datetime(start_str)
         except Exception as e:
-            print(f"DIAGNOSTIC: Skipping event #{idx}, date parse failed: {e}")
+            diag.warning("Skipping event #%s, date parse failed: %s", idx, e)
             continue
 
-        print(f"\nEvent #{idx}:")
-        print(f"  summary: {event.get('summary', '')}")
-        print(f"  start: {start_dt}")
-
-        meeting = {
-            "id": event.get("id"),
-            "summary": event.get("summary", ""),
-            "start": start_str,
-            "end": event.get("end", {}).get("dateTime") or event.get("end", {}).get("date"),
-            "description": event.get("description", ""),
-            "attendees": [a.get("email") for a in event.get("attendees", []) if a.get("email")],
-            "organizer": (event.get("organizer") or {}).get("email", ""),
-            "creator": (event.get("creator") or {}).get("email", ""),
-            "location": event.get("location", ""),
-            "hangoutLink": event.get("hangoutLink")
-                or event.get("conferenceData", {})
-                .get("entryPoints", [{}])[0]
-                .get("uri", ""),
-        }
+        diag.debug("event #%s: start=%s summary=%r", idx, start_dt, event.get('summary', ''))
+
+        meeting = _upcoming_meeting(event, start_str)
 
         if client_lower:
             if not _matches_client(meeting, client_lower):
-                print("  ✗ Client does not match, skipping")
+                diag.debug("event #%s: client does not match, skipping", idx)
                 continue
 
-        print("  ✓ Selected as next upcoming meeting")
+        diag.info("Selected next upcoming meeting: id=%s", meeting["id"])
         return meeting
 
-    print("DIAGNOSTIC: No upcoming meeting matched client filter")
+    diag.info("No upcoming meeting matched client filter %r", client_name)
     return None
 
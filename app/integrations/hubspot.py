@@ -6,6 +6,8 @@ from app.config import Config
 import logging
 logger = logging.getLogger(__name__)
 from app.runtime.mode import is_demo_mode
+from app.runtime.spans import traced
+from app.runtime.metrics import observe_integration
 
 
 
@@ -43,6 +45,8 @@ def normalize_company_name(raw_name: str) -> str:
 
     return name
 
+@traced("hubspot.get_company_by_name")
+@observe_integration("hubspot", "get_company_by_name")
 def get_company_by_name(company_name: str):
     """
     Find a HubSpot company by name (best-effort).
@@ -73,6 +77,8 @@ def get_company_by_name(company_name: str):
     results = response.get("results", [])
     return results[0] if results else None
 
+@traced("hubspot.get_or_create_company_id")
+@observe_integration("hubspot", "get_or_create_company_id")
 def get_or_create_company_id(company_name: str) -> str:
     """
     Resolve a HubSpot company ID by name.
@@ -92,6 +98,8 @@ def get_or_create_company_id(company_name: str) -> str:
     )
     return response["id"]
 
+@traced("hubspot.post")
+@observe_integration("hubspot", "post")
 def _hubspot_post(path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
     """
     Internal helper for HubSpot POST requests.
@@ -119,6 +127,8 @@ def _hubspot_post(path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         logger.warning(f"HubSpot POST failed: {path}", exc_info=e)
         raise HubSpotIntegrationError("HubSpot API request failed") from e
 
+@traced("hubspot.create_task")
+@observe_integration("hubspot", "create_task")
 def create_task(
     action_item_text: str,
     due_date: Optional[datetime],
@@ -227,6 +237,8 @@ def create_task(
         return None
 
 
+@traced("hubspot.task_exists")
+@observe_integration("hubspot", "task_exists")
 def task_exists(task_id: str) -> bool:
     """
     Check if a HubSpot task exists (for idempotency).
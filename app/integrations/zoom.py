@@ -8,6 +8,8 @@ import base64
 from datetime import datetime, timedelta
 from urllib.parse import quote
 from app.runtime.mode import is_demo_mode
+from app.runtime.spans import traced
+from app.runtime.metrics import observe_integration
 from app.demo.transcripts import load_demo_transcript
 
 
@@ -40,6 +42,8 @@ class ZoomClient:
         return {"Authorization": f"Bearer {self.access_token}"}
 
 
+@traced("zoom.resolve_meeting_uuid")
+@observe_integration("zoom", "resolve_meeting_uuid")
 def resolve_meeting_uuid(
     zoom_meeting_id: str,
     expected_date: Optional[datetime] = None
@@ -72,6 +76,8 @@ def resolve_meeting_uuid(
     return meetings[0]["uuid"]
 
 
+@traced("zoom.fetch_transcript_by_uuid")
+@observe_integration("zoom", "fetch_transcript_by_uuid")
 def fetch_transcript_by_uuid(meeting_uuid: str) -> Optional[str]:
     """
     Fetch transcript text for a Zoom meeting UUID.
@@ -186,6 +192,8 @@ def extract_zoom_meeting_id(calendar_event: dict) -> Optional[str]:
     return None
 
 
+@traced("zoom.fetch_transcript")
+@observe_integration("zoom", "fetch_transcript")
 def fetch_zoom_transcript(
     zoom_meeting_id: str,
     expected_date: Optional[datetime] = None
@@ -1,8 +1,101 @@
-"""LLM client - wraps Gemini API (safe, validated)."""
+"""LLM client - wraps Gemini API (safe, validated).
+
+LLM_PROVIDER selects the backend: "gemini" (default) or "local", the
+offline deterministic backend in app/llm/local.py.
+"""
 
 import google.generativeai as genai
-from typing import Optional, Dict, Any
+import hashlib
+import inspect
+import threading
+from collections import OrderedDict
+from datetime import timedelta
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Optional, Tuple
 from app.config import Config
+from app.runtime.diagnostics import get_diagnostics
+from app.runtime.spans import span
+from app.runtime.metrics import CACHE_REQUESTS, LLM_LATENCY, LLM_TOKENS
+from app.llm import ledger, resilience, router
+from app.llm.ledger import estimate_tokens
+import time
+
+diag = get_diagnostics("llm")
+
+# Context cache handles kept per process (oldest dropped first)
+_MAX_CONTEXT_CACHES = 64
+
+
+@lru_cache(maxsize=1)
+def _generation_config_fields() -> FrozenSet[str]:
+    """
+    GenerationConfig fields the installed SDK accepts.
+    response_mime_type / response_schema need google-generativeai >= 0.7
+    (requirements.txt pins 0.8.x); older installs drop them.
+    """
+    try:
+        params = inspect.signature(genai.types.GenerationConfig).parameters
+    except (TypeError, ValueError):
+        return frozenset({"max_output_tokens", "top_p", "top_k", "candidate_count", "stop_sequences"})
+    return frozenset(name for name in params if name != "self")
+
+
+@lru_cache(maxsize=1)
+def _supports_system_instruction() -> bool:
+    try:
+        return "system_instruction" in inspect.signature(genai.GenerativeModel).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+@lru_cache(maxsize=1)
+def _supports_request_options() -> bool:
+    try:
+        return "request_options" in inspect.signature(genai.GenerativeModel.generate_content).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+@lru_cache(maxsize=1)
+def _caching_module():
+    """google.generativeai.caching (explicit context caching), or None on SDKs before 0.7."""
+    try:
+        from google.generativeai import caching
+    except ImportError:
+        return None
+    return caching
+
+
+def record_usage(
+    *,
+    prompt_type: str,
+    model: str,
+    tokens_in: int,
+    tokens_out: int,
+    latency_ms: float,
+    status: str = "ok",
+    degraded: Optional[str] = None,
+    tokens_cached: int = 0,
+) -> None:
+    """
+    Token metrics plus a ledger entry for one backend call.
+    tokens_in excludes prompt tokens served from a context cache
+    (tokens_cached), which are billed at a discount.
+    """
+    if status == "ok":
+        LLM_TOKENS.labels(prompt_type=prompt_type, direction="in").inc(tokens_in)
+        LLM_TOKENS.labels(prompt_type=prompt_type, direction="out").inc(tokens_out)
+        if tokens_cached:
+            LLM_TOKENS.labels(prompt_type=prompt_type, direction="cached").inc(tokens_cached)
+    ledger.record(
+        prompt_type=prompt_type,
+        model=model,
+        prompt_tokens=tokens_in,
+        completion_tokens=tokens_out,
+        latency_ms=latency_ms,
+        status=status,
+        degraded=degraded,
+    )
 
 
 class GeminiClient:
@@ -14,6 +107,15 @@ class GeminiClient:
         genai.configure(api_key=Config.GEMINI_API_KEY)
 
         self.model = self._select_model()
+        # Alternate models (routed tiers, system instructions), created on first use
+        self._models: Dict[Tuple[str, Optional[str]], Any] = {}
+        # Context caches by prefix hash: (model bound to the cache or None if only seen once, expiry)
+        self._context_caches: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    @staticmethod
+    def _qualified(model_name: str) -> str:
+        return model_name if model_name.startswith("models/") else f"models/{model_name}"
 
     def _select_model(self):
         """
@@ -21,11 +123,7 @@ class GeminiClient:
         Avoids list_models() ambiguity and 404s.
         """
 
-        model_name = (
-            f"models/{Config.GEMINI_MODEL}"
-            if not Config.GEMINI_MODEL.startswith("models/")
-            else Config.GEMINI_MODEL
-        )
+        model_name = self._qualified(Config.GEMINI_MODEL)
 
         try:
             model = genai.GenerativeModel(model_name)
@@ -45,28 +143,110 @@ class GeminiClient:
                 f"Check API access or change GEMINI_MODEL. Error: {e}"
             )
 
+    def _model_for(self, model_name: Optional[str], system_prompt: Optional[str] = None):
+        model_name = model_name or Config.GEMINI_MODEL
+        if model_name == Config.GEMINI_MODEL and not system_prompt:
+            return self.model
+
+        key = (model_name, system_prompt)
+        model = self._models.get(key)
+        if model is None:
+            if system_prompt:
+                model = genai.GenerativeModel(self._qualified(model_name), system_instruction=system_prompt)
+            else:
+                model = genai.GenerativeModel(self._qualified(model_name))
+            self._models[key] = model
+        return model
+
+    def _cached_model(self, model_name: Optional[str], system_prompt: Optional[str], context: Optional[str]):
+        """
+        Model bound to a provider context cache holding system_prompt + context,
+        or None. A cache is only created the second time a prefix is seen
+        within the TTL, so one-off prompts never pay for cache storage.
+        """
+        caching = _caching_module()
+        min_tokens = Config.LLM_CONTEXT_CACHE_MIN_TOKENS
+        if caching is None or min_tokens <= 0 or not context:
+            return None
+        if estimate_tokens((system_prompt or "") + context) < min_tokens:
+            return None
+
+        model_name = model_name or Config.GEMINI_MODEL
+        ttl = Config.LLM_CONTEXT_CACHE_TTL_SECONDS
+        key = hashlib.sha256(f"{model_name}\0{system_prompt or ''}\0{context}".encode("utf-8")).hexdigest()
+        now = time.monotonic()
+
+        with self._cache_lock:
+            entry = self._context_caches.get(key)
+            if entry is not None and entry[1] > now:
+                self._context_caches.move_to_end(key)
+                if entry[0] is not None:
+                    CACHE_REQUESTS.labels(cache="llm_context", result="hit").inc()
+                    return entry[0]
+            else:
+                self._context_caches[key] = (None, now + ttl)
+                self._evict_context_caches()
+                CACHE_REQUESTS.labels(cache="llm_context", result="miss").inc()
+                return None
+
+        try:
+            cached = caching.CachedContent.create(
+                model=self._qualified(model_name),
+                system_instruction=system_prompt,
+                contents=[context],
+                ttl=timedelta(seconds=ttl),
+            )
+            model = genai.GenerativeModel.from_cached_content(cached_content=cached)
+        except Exception as e:
+            # e.g. prefix below the model's caching minimum - send it uncached
+            diag.warning("Context cache creation failed for %s: %s", model_name, e)
+            return None
+
+        with self._cache_lock:
+            # Expire locally a little before the server does
+            self._context_caches[key] = (model, now + ttl * 0.9)
+            self._evict_context_caches()
+        CACHE_REQUESTS.labels(cache="llm_context", result="miss").inc()
+        return model
+
+    def _evict_context_caches(self) -> None:
+        # Server-side caches left behind simply expire with their TTL
+        while len(self._context_caches) > _MAX_CONTEXT_CACHES:
+            self._context_caches.popitem(last=False)
+
     def chat(
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
         temperature: float = 0.7,
         response_format: Optional[Dict[str, Any]] = None,
+        prompt_type: str = "other",
+        model_name: Optional[str] = None,
+        degraded: Optional[str] = None,
+        context: Optional[str] = None,
+        timeout: Optional[float] = None,
     ) -> str:
-        full_prompt = (
-            f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
-        )
+        full_prompt = "\n\n".join(p for p in (system_prompt, context, prompt) if p)
+
+        # Static instructions and per-client context go first, in that order,
+        # so repeated calls share a prefix: an explicit context cache, else
+        # system_instruction, else plain concatenation (implicit caching)
+        model = self._cached_model(model_name, system_prompt, context)
+        if model is not None:
+            contents = prompt
+        elif system_prompt and _supports_system_instruction():
+            model = self._model_for(model_name, system_prompt)
+            contents = "\n\n".join(p for p in (context, prompt) if p)
+        else:
+            model = self._model_for(model_name)
+            contents = full_prompt
 
         generation_config = {"temperature": temperature}
 
         if response_format:
-            # Only allow keys supported by older Gemini SDKs
-            allowed_keys = {
-                "max_output_tokens",
-                "top_p",
-                "top_k",
-                "candidate_count",
-                "stop_sequences",
-            }
+            # Structured output (response_mime_type / response_schema) is
+            # passed through when the SDK supports it; other keys are dropped
+            allowed_keys = _generation_config_fields()
 
             safe_format = {
                 k: v for k, v in response_format.items() if k in allowed_keys
@@ -74,18 +254,117 @@ class GeminiClient:
 
             generation_config.update(safe_format)
 
+        request_kwargs = {}
+        if timeout and _supports_request_options():
+            # Lets the transport give up too; otherwise only the caller stops waiting
+            request_kwargs["request_options"] = {"timeout": timeout}
+
+        started = time.perf_counter()
+        try:
+            response = model.generate_content(
+                contents,
+                generation_config=genai.types.GenerationConfig(**generation_config),
+                **request_kwargs,
+            )
+            text = response.text.strip()
+        except Exception:
+            record_usage(
+                prompt_type=prompt_type,
+                model=model_name or Config.GEMINI_MODEL,
+                tokens_in=estimate_tokens(full_prompt),
+                tokens_out=0,
+                latency_ms=(time.perf_counter() - started) * 1000,
+                status="error",
+                degraded=degraded,
+            )
+            raise
+
+        # usage_metadata is only populated by newer SDK / API versions
+        usage = getattr(response, "usage_metadata", None)
+        tokens_in = getattr(usage, "prompt_token_count", None) if usage else None
+        tokens_out = getattr(usage, "candidates_token_count", None) if usage else None
+        tokens_cached = (getattr(usage, "cached_content_token_count", None) if usage else None) or 0
+        tokens_in = tokens_in if tokens_in is not None else estimate_tokens(full_prompt)
+        tokens_out = tokens_out if tokens_out is not None else estimate_tokens(text)
 
-        response = self.model.generate_content(
-            full_prompt,
-            generation_config=genai.types.GenerationConfig(**generation_config),
+        record_usage(
+            prompt_type=prompt_type,
+            model=model_name or Config.GEMINI_MODEL,
+            tokens_in=max(tokens_in - tokens_cached, 0),
+            tokens_out=tokens_out,
+            tokens_cached=tokens_cached,
+            latency_ms=(time.perf_counter() - started) * 1000,
+            degraded=degraded,
         )
 
-        return response.text.strip()
+        return text
 
 
 # ---- Public function used by the rest of your app ----
 
-_client: Optional[GeminiClient] = None
+_client = None  # GeminiClient | LocalLLMClient
+
+
+def _create_client():
+    provider = (Config.LLM_PROVIDER or "gemini").strip().lower()
+    if provider == "gemini":
+        return GeminiClient()
+    if provider == "local":
+        from app.llm.local import LocalLLMClient
+        return LocalLLMClient()
+    raise RuntimeError(f"❌ Unsupported LLM_PROVIDER '{Config.LLM_PROVIDER}' (expected gemini or local)")
+
+
+def _call(
+    prompt: str,
+    system_prompt: Optional[str],
+    temperature: float,
+    response_format: Optional[Dict[str, Any]],
+    prompt_type: str,
+    model_name: str,
+    tier: str,
+    degraded: Optional[str],
+    context: Optional[str],
+    prompt_tokens: int,
+) -> str:
+    started = time.perf_counter()
+    status = "error"
+    try:
+        with span(
+            "llm.chat",
+            model=model_name,
+            tier=tier,
+            prompt_type=prompt_type,
+            prompt_chars=len(prompt),
+            context_chars=len(context or ""),
+            degraded=degraded,
+        ) as s:
+            # Deadline, hedging and circuit breaker around the backend call
+            text = resilience.call(
+                lambda timeout: _client.chat(
+                    prompt=prompt,
+                    system_prompt=system_prompt,
+                    temperature=temperature,
+                    response_format=response_format,
+                    prompt_type=prompt_type,
+                    model_name=model_name,
+                    degraded=degraded,
+                    context=context,
+                    timeout=timeout,
+                ),
+                prompt_type=prompt_type,
+                model_name=model_name,
+                prompt_tokens=prompt_tokens,
+                degraded=degraded,
+            )
+            if s is not None:
+                s.set_attribute("response_chars", len(text))
+        status = "ok"
+        return text
+    finally:
+        LLM_LATENCY.labels(prompt_type=prompt_type, status=status).observe(
+            time.perf_counter() - started
+        )
 
 
 def chat(
@@ -93,14 +372,42 @@ def chat(
     system_prompt: Optional[str] = None,
     temperature: float = 0.7,
     response_format: Optional[Dict[str, Any]] = None,
+    prompt_type: str = "other",
+    tier: Optional[str] = None,
+    context: Optional[str] = None,
 ) -> str:
+    """
+    prompt_type labels metrics and spans: intent, summary, followup, brief,
+    client_resolution (anything else is reported as given). It also picks
+    the model tier (see app/llm/router.py) unless tier is given.
+
+    context: large, slowly changing input (e.g. per-client memory) sent
+    after the system prompt and before the prompt, so the provider can
+    cache the shared prefix across calls.
+
+    For JSON answers use app.llm.parsing.chat_json(), which validates the
+    response and repairs it once on the next tier up.
+    """
     global _client
     if _client is None:
-        _client = GeminiClient()
+        _client = _create_client()
+
+    system_tokens = estimate_tokens(system_prompt or "")
+    prompt_tokens = system_tokens + estimate_tokens(context or "") + estimate_tokens(prompt)
+    tier = tier or router.route(prompt_type, prompt_tokens)
+
+    # Token budgets: degrade (smaller model / truncated prompt) instead of failing
+    plan = ledger.plan_call(prompt_tokens)
+    if plan.max_prompt_tokens:
+        if context:
+            # Truncated prompts are one-offs anyway; trim context and prompt together
+            prompt, context = f"{context}\n\n{prompt}", None
+        prompt = ledger.truncate_middle(prompt, max(plan.max_prompt_tokens - system_tokens, 50))
 
-    return _client.chat(
-        prompt=prompt,
-        system_prompt=system_prompt,
-        temperature=temperature,
-        response_format=response_format,
+    # Budget-degraded calls stay on the degraded model
+    model_name = plan.model or router.model_for(tier)
+    return _call(
+        prompt, system_prompt, temperature, response_format,
+        prompt_type, model_name, tier, plan.degraded, context,
+        min(prompt_tokens, plan.max_prompt_tokens or prompt_tokens),
     )
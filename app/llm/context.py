@@ -0,0 +1,196 @@
+"""Token-budgeted prompt assembly.
+
+    from app.llm import context as prompt_context
+
+    builder = prompt_context.ContextBuilder("summary", reserve=[SYSTEM, TEMPLATE])
+    builder.add_text("transcript", transcript, priority=1, truncate="middle", min_tokens=2000)
+    builder.add_items("memory", memory_lines, priority=3, joiner="\\n")
+    packed = builder.build()
+    packed.text("transcript"), packed.items("memory")
+
+Each section's tokens are estimated once. The budget for the prompt type
+(LLM_PROMPT_TOKEN_BUDGETS, minus the reserved fixed text) is filled in two
+passes, both in priority order (0 = most important): first every section
+gets up to its min_tokens floor, then the rest goes to sections by priority.
+The lowest-priority sections are therefore the first to be truncated or
+dropped.
+
+    text sections    truncate="middle" keeps head and tail (transcripts),
+                     truncate="end" keeps the head
+    item sections    whole items are kept from the front (lists ordered
+                     best first: memory entries, attendees, known clients)
+
+Every build() is reported (prompt type, budget, per-section tokens and
+status) to the request's buffer; the orchestrator drain()s it into the
+response's `memory_used` provenance.
+"""
+import contextvars
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.config import Config
+from app.llm.ledger import estimate_tokens, parse_budgets, truncate_middle
+from app.runtime.metrics import PROMPT_CONTEXT_SECTIONS
+
+PROMPT_BUDGETS = parse_budgets(Config.LLM_PROMPT_TOKEN_BUDGETS)
+
+_TRUNCATED_MARKER = " [...]"
+
+KEPT, TRUNCATED, DROPPED = "kept", "truncated", "dropped"
+
+
+class _Section:
+    def __init__(self, name: str, priority: int, min_tokens: int, truncate: str,
+                 text: Optional[str] = None, items: Optional[List[str]] = None, joiner: str = "\n"):
+        self.name = name
+        self.priority = priority
+        self.min_tokens = min_tokens
+        self.truncate = truncate
+        self.text = text
+        self.items = items
+        self.joiner = joiner
+        if items is not None:
+            # Cost of each item including its joiner
+            self.item_tokens = [estimate_tokens(item + joiner) for item in items]
+            self.tokens = sum(self.item_tokens)
+        else:
+            self.tokens = estimate_tokens(text or "")
+
+
+class PackedContext:
+    def __init__(self, texts: Dict[str, str], items: Dict[str, List[str]], report: Dict[str, Any]):
+        self._texts = texts
+        self._items = items
+        self.report = report
+
+    def text(self, name: str) -> str:
+        return self._texts[name]
+
+    def items(self, name: str) -> List[str]:
+        return self._items[name]
+
+    def status(self, name: str) -> str:
+        return next(s["status"] for s in self.report["sections"] if s["name"] == name)
+
+
+def format_list(kept: Sequence[str], total: int, empty: str = "Unknown", joiner: str = ", ") -> str:
+    """Join a packed item list, noting how many items the budget left out."""
+    if not total:
+        return empty
+    text = joiner.join(kept)
+    if len(kept) < total:
+        text = f"{text}{joiner if kept else ''}(+{total - len(kept)} more)"
+    return text
+
+
+class ContextBuilder:
+    def __init__(self, prompt_type: str, reserve: Sequence[str] = (), budget: Optional[int] = None):
+        """reserve: fixed prompt text (system prompt, template) counted against the budget."""
+        self.prompt_type = prompt_type
+        self.budget = PROMPT_BUDGETS.get(prompt_type) if budget is None else budget
+        self.reserved = sum(estimate_tokens(text) for text in reserve)
+        self._sections: List[_Section] = []
+
+    def add_text(self, name: str, text: Optional[str], *, priority: int, min_tokens: int = 0,
+                 truncate: str = "end") -> "ContextBuilder":
+        self._sections.append(_Section(name, priority, min_tokens, truncate, text=text or ""))
+        return self
+
+    def add_items(self, name: str, items: Sequence[str], *, priority: int, min_tokens: int = 0,
+                  joiner: str = "\n") -> "ContextBuilder":
+        self._sections.append(_Section(name, priority, min_tokens, "items", items=list(items), joiner=joiner))
+        return self
+
+    def _allocate(self) -> Dict[str, int]:
+        if not self.budget:
+            return {s.name: s.tokens for s in self._sections}
+
+        remaining = max(self.budget - self.reserved, 0)
+        ordered = sorted(self._sections, key=lambda s: s.priority)  # stable: insertion order within a priority
+        allocation = {}
+        for section in ordered:
+            allocation[section.name] = min(section.tokens, section.min_tokens, remaining)
+            remaining -= allocation[section.name]
+        for section in ordered:
+            extra = min(section.tokens - allocation[section.name], remaining)
+            allocation[section.name] += extra
+            remaining -= extra
+        return allocation
+
+    def build(self) -> PackedContext:
+        allocation = self._allocate()
+        texts: Dict[str, str] = {}
+        items: Dict[str, List[str]] = {}
+        sections = []
+
+        for section in self._sections:
+            allowed = allocation[section.name]
+            entry: Dict[str, Any] = {"name": section.name, "priority": section.priority, "tokens": section.tokens}
+
+            if section.items is not None:
+                kept, used = [], 0
+                for item, cost in zip(section.items, section.item_tokens):
+                    if used + cost > allowed:
+                        break
+                    kept.append(item)
+                    used += cost
+                items[section.name] = kept
+                texts[section.name] = section.joiner.join(kept)
+                entry.update(kept_tokens=used, items=len(section.items), kept_items=len(kept))
+                full = len(kept) == len(section.items)
+            else:
+                text = section.text
+                if allowed < section.tokens:
+                    if allowed <= 0:
+                        text = ""
+                    elif section.truncate == "middle":
+                        text = truncate_middle(text, allowed)
+                    else:
+                        text = text[: allowed * 4].rstrip() + _TRUNCATED_MARKER
+                texts[section.name] = text
+                entry["kept_tokens"] = min(allowed, section.tokens)
+                full = allowed >= section.tokens
+
+            if full:
+                entry["status"] = KEPT
+            else:
+                entry["status"] = DROPPED if not entry["kept_tokens"] else TRUNCATED
+                PROMPT_CONTEXT_SECTIONS.labels(
+                    prompt_type=self.prompt_type, section=section.name, status=entry["status"]
+                ).inc()
+            sections.append(entry)
+
+        report = {
+            "prompt_type": self.prompt_type,
+            "budget": self.budget,
+            "tokens": self.reserved + sum(s["kept_tokens"] for s in sections),
+            "sections": sections,
+        }
+        _record(report)
+        return PackedContext(texts, items, report)
+
+
+# -------------------------------------------------
+# Request-scoped reports (for response provenance)
+# -------------------------------------------------
+
+_reports = contextvars.ContextVar("prompt_context_reports", default=None)
+
+
+def begin() -> None:
+    _reports.set([])
+
+
+def _record(report: Dict[str, Any]) -> None:
+    reports = _reports.get()
+    if reports is not None:
+        reports.append(report)
+
+
+def drain() -> List[Dict[str, Any]]:
+    """Return and clear the reports of prompts built since the last drain."""
+    reports = _reports.get()
+    if not reports:
+        return []
+    drained = list(reports)
+    reports.clear()
+    return drained
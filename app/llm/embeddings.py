@@ -0,0 +1,96 @@
+"""Text embeddings for semantic memory retrieval (see app/memory/vectors.py).
+
+EMBEDDING_PROVIDER:
+    local   deterministic feature hashing of words and word bigrams into
+            EMBEDDING_DIM dimensions; offline, used by tests and benchmarks
+    gemini  EMBEDDING_MODEL through google-generativeai (batched requests)
+
+Vectors come back as a float32 (n, dim) matrix with L2-normalized rows, so a
+dot product is the cosine similarity.
+"""
+import hashlib
+import re
+import time
+from functools import lru_cache
+from typing import List, Sequence
+
+import numpy as np
+
+from app.config import Config
+from app.llm import ledger
+
+_WORD = re.compile(r"[a-z0-9]+(?:['\-][a-z0-9]+)*")
+
+# Task types understood by models/embedding-001
+_GEMINI_TASKS = {"document": "retrieval_document", "query": "retrieval_query"}
+
+
+def _provider() -> str:
+    provider = Config.EMBEDDING_PROVIDER
+    if not provider:
+        provider = "local" if (Config.LLM_PROVIDER or "").strip().lower() == "local" else "gemini"
+    return provider
+
+
+@lru_cache(maxsize=65536)
+def _feature(token: str, dim: int):
+    digest = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+    return digest % dim, 1.0 if digest >> 63 else -1.0
+
+
+def local_embeddings(texts: Sequence[str], dim: int) -> np.ndarray:
+    """Signed feature hashing: same text, same vector, in every process."""
+    matrix = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        words = _WORD.findall(text.lower())
+        for token, weight in [(w, 1.0) for w in words] + [
+            (f"{a} {b}", 0.5) for a, b in zip(words, words[1:])
+        ]:
+            index, sign = _feature(token, dim)
+            matrix[row, index] += sign * weight
+    return _normalize(matrix)
+
+
+def _gemini_embeddings(texts: Sequence[str], task: str) -> np.ndarray:
+    import google.generativeai as genai
+
+    if not Config.GEMINI_API_KEY:
+        raise RuntimeError("❌ GEMINI_API_KEY is not set")
+    genai.configure(api_key=Config.GEMINI_API_KEY)
+
+    started = time.perf_counter()
+    result = genai.embed_content(
+        model=Config.EMBEDDING_MODEL,
+        content=list(texts),
+        task_type=_GEMINI_TASKS[task],
+    )
+    ledger.record(
+        prompt_type=f"embed_{task}",
+        model=Config.EMBEDDING_MODEL,
+        prompt_tokens=sum(ledger.estimate_tokens(t) for t in texts),
+        completion_tokens=0,
+        latency_ms=(time.perf_counter() - started) * 1000,
+    )
+    return _normalize(np.asarray(result["embedding"], dtype=np.float32))
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def embed_texts(texts: List[str], task: str = "document") -> np.ndarray:
+    """Embed texts (task: "document" when storing, "query" when searching)."""
+    if not texts:
+        return np.zeros((0, Config.EMBEDDING_DIM), dtype=np.float32)
+
+    # Long inputs (a whole transcript as the query) are cut to the model's window
+    texts = [t[: Config.EMBEDDING_MAX_CHARS] for t in texts]
+
+    provider = _provider()
+    if provider == "local":
+        return local_embeddings(texts, Config.EMBEDDING_DIM)
+    if provider == "gemini":
+        return _gemini_embeddings(texts, task)
+    raise RuntimeError(f"❌ Unsupported EMBEDDING_PROVIDER '{provider}' (expected local or gemini)")
@@ -0,0 +1,263 @@
+"""LLM usage ledger and token budgets.
+
+Every LLM call is recorded (tokens in/out, latency, model) into a
+request-scoped buffer tagged with workflow, meeting_id and trace id. The
+orchestrator writes the buffer to the `llm_usage` table in its own commit
+after the request's unit of work, so a rolled-back request still records
+the calls it paid for. Calls that finish after their request was drained (e.g. a
+hedge that lost the race) are held and written with the next drain in the
+process, so every call that spent tokens gets a row.
+
+Budgets degrade instead of failing:
+    LLM_DAILY_TOKEN_BUDGET       all calls today (UTC); over budget -> LLM_DEGRADED_MODEL
+                                 and prompts truncated to LLM_DEGRADED_MAX_PROMPT_TOKENS
+    LLM_WORKFLOW_TOKEN_BUDGETS   per workflow run, e.g. "summarize_meeting=120000";
+                                 prompts are truncated (head + tail kept) to what remains
+"""
+import contextvars
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from app.config import Config
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English prose
+    return max(1, len(text) // 4) if text else 0
+
+
+def parse_budgets(raw: str) -> Dict[str, int]:
+    budgets = {}
+    for item in raw.split(","):
+        if "=" not in item:
+            continue
+        name, value = item.split("=", 1)
+        if name.strip() and value.strip().isdigit():
+            budgets[name.strip()] = int(value.strip())
+    return budgets
+
+
+WORKFLOW_BUDGETS = parse_budgets(Config.LLM_WORKFLOW_TOKEN_BUDGETS)
+
+
+class LedgerContext:
+    """Request-scoped usage buffer."""
+
+    def __init__(self, trace_id: Optional[str], conversation_id: Optional[str]):
+        self.trace_id = trace_id
+        self.conversation_id = conversation_id
+        self.workflow: Optional[str] = None
+        self.meeting_id: Optional[int] = None
+        self.records: List[Dict[str, Any]] = []
+        self.workflow_tokens = 0
+        self.degraded: List[str] = []
+        self.drained = False
+
+
+_ledger_ctx = contextvars.ContextVar("llm_ledger", default=None)
+
+# Records of already-drained contexts, persisted by the next drain()
+_late_lock = threading.Lock()
+_late_records: List[Dict[str, Any]] = []
+
+
+def begin(trace_id: Optional[str] = None, conversation_id: Optional[str] = None) -> LedgerContext:
+    ctx = LedgerContext(trace_id, conversation_id)
+    _ledger_ctx.set(ctx)
+    return ctx
+
+
+def current() -> Optional[LedgerContext]:
+    return _ledger_ctx.get()
+
+
+def set_workflow(workflow: Optional[str]) -> None:
+    ctx = _ledger_ctx.get()
+    if ctx is not None:
+        ctx.workflow = workflow
+        ctx.workflow_tokens = 0
+
+
+def set_meeting(meeting_id: Optional[int]) -> None:
+    ctx = _ledger_ctx.get()
+    if ctx is not None:
+        ctx.meeting_id = meeting_id
+
+
+def drain() -> List[Dict[str, Any]]:
+    """Return and clear the buffered records (plus any late ones) for persistence."""
+    global _late_records
+    ctx = _ledger_ctx.get()
+    if ctx is None:
+        return []
+    with _late_lock:
+        ctx.drained = True
+        records, ctx.records = ctx.records, []
+        late, _late_records = _late_records, []
+    return records + late
+
+
+# -------------------------------------------------
+# Daily spend (shared across workers via the ledger table)
+# -------------------------------------------------
+
+class _DailySpend:
+    """
+    Today's token total = last DB total + tokens recorded locally since.
+    Refreshed from the ledger every LLM_BUDGET_REFRESH_SECONDS so other
+    workers' spend is picked up.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.day = None
+        self.db_total = 0
+        self.local = 0
+        self.refreshed_at = 0.0
+
+    def total(self) -> int:
+        with self._lock:
+            if self.day != datetime.utcnow().date():
+                return self.local
+            return self.db_total + self.local
+
+    def add(self, tokens: int) -> None:
+        with self._lock:
+            today = datetime.utcnow().date()
+            if self.day != today:
+                self.day, self.db_total, self.local = today, 0, 0
+            self.local += tokens
+
+    def needs_refresh(self) -> bool:
+        return (
+            self.day != datetime.utcnow().date()
+            or time.monotonic() - self.refreshed_at > Config.LLM_BUDGET_REFRESH_SECONDS
+        )
+
+    def refresh(self, tokens_since: Callable[[datetime], int]) -> None:
+        today = datetime.utcnow().date()
+        db_total = tokens_since(datetime.combine(today, datetime.min.time()))
+        with self._lock:
+            self.day, self.db_total, self.local = today, db_total, 0
+            self.refreshed_at = time.monotonic()
+
+
+daily_spend = _DailySpend()
+
+
+def refresh_daily_spend(tokens_since: Callable[[datetime], int]) -> None:
+    """Re-read today's total from the ledger when stale (only needed with a daily budget)."""
+    if Config.LLM_DAILY_TOKEN_BUDGET > 0 and daily_spend.needs_refresh():
+        daily_spend.refresh(tokens_since)
+
+
+# -------------------------------------------------
+# Budget decisions
+# -------------------------------------------------
+
+class CallPlan:
+    def __init__(self, model: Optional[str] = None, max_prompt_tokens: Optional[int] = None,
+                 reasons: Optional[List[str]] = None):
+        self.model = model  # None = default model
+        self.max_prompt_tokens = max_prompt_tokens
+        self.reasons = reasons or []
+
+    @property
+    def degraded(self) -> Optional[str]:
+        return ",".join(self.reasons) or None
+
+
+def plan_call(estimated_prompt_tokens: int) -> CallPlan:
+    """Choose model and prompt size for the next call given current spend."""
+    plan = CallPlan()
+    ctx = _ledger_ctx.get()
+
+    daily_budget = Config.LLM_DAILY_TOKEN_BUDGET
+    if daily_budget > 0 and daily_spend.total() >= daily_budget:
+        plan.reasons.append("daily_budget")
+        plan.model = Config.LLM_DEGRADED_MODEL or None
+        plan.max_prompt_tokens = Config.LLM_DEGRADED_MAX_PROMPT_TOKENS
+
+    workflow_budget = WORKFLOW_BUDGETS.get(ctx.workflow) if ctx and ctx.workflow else None
+    if workflow_budget:
+        remaining = workflow_budget - ctx.workflow_tokens
+        if estimated_prompt_tokens > remaining:
+            plan.reasons.append("workflow_budget")
+            if remaining > 0:
+                limit = remaining
+            else:
+                # Already spent: last-resort small call on the degraded model
+                limit = Config.LLM_DEGRADED_MAX_PROMPT_TOKENS
+                plan.model = Config.LLM_DEGRADED_MODEL or plan.model
+            plan.max_prompt_tokens = min(plan.max_prompt_tokens or limit, limit)
+
+    if ctx is not None:
+        for reason in plan.reasons:
+            if reason not in ctx.degraded:
+                ctx.degraded.append(reason)
+
+    return plan
+
+
+def can_afford(tokens: int) -> bool:
+    """Whether an optional extra call of this size (e.g. a hedge) fits today's and the workflow's budget."""
+    daily_budget = Config.LLM_DAILY_TOKEN_BUDGET
+    if daily_budget > 0 and daily_spend.total() + tokens > daily_budget:
+        return False
+
+    ctx = _ledger_ctx.get()
+    workflow_budget = WORKFLOW_BUDGETS.get(ctx.workflow) if ctx and ctx.workflow else None
+    if workflow_budget and ctx.workflow_tokens + tokens > workflow_budget:
+        return False
+    return True
+
+
+def truncate_middle(text: str, max_tokens: int, marker: str = "\n\n[... {n} characters omitted to fit the token budget ...]\n\n") -> str:
+    """Keep the head and tail of text (instructions up front, closing ask at the end)."""
+    max_chars = max_tokens * 4
+    if len(text) <= max_chars:
+        return text
+
+    head = int(max_chars * 0.6)
+    tail = max_chars - head
+    omitted = len(text) - head - tail
+    return text[:head] + marker.format(n=omitted) + text[-tail:]
+
+
+def record(
+    *,
+    prompt_type: str,
+    model: str,
+    prompt_tokens: int,
+    completion_tokens: int,
+    latency_ms: float,
+    status: str = "ok",
+    degraded: Optional[str] = None,
+) -> None:
+    """Buffer one call's usage and count it towards the daily / workflow totals."""
+    tokens = prompt_tokens + completion_tokens
+    daily_spend.add(tokens)
+
+    ctx = _ledger_ctx.get()
+    if ctx is None:
+        return
+
+    ctx.workflow_tokens += tokens
+    row = {
+        "trace_id": ctx.trace_id,
+        "conversation_id": ctx.conversation_id,
+        "workflow": ctx.workflow,
+        "meeting_id": ctx.meeting_id,
+        "prompt_type": prompt_type,
+        "model": model,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "latency_ms": int(latency_ms),
+        "status": status,
+        "degraded": degraded,
+        "created_at": datetime.utcnow(),
+    }
+    with _late_lock:
+        (_late_records if ctx.drained else ctx.records).append(row)
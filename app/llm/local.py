@@ -0,0 +1,290 @@
+"""Local LLM backend - deterministic, offline responses (LLM_PROVIDER=local).
+
+Answers every prompt in app/llm/prompts.py (plus client resolution) with
+templated output built from the prompt itself, so every workflow runs end
+to end without network access or cost:
+
+    intent             keyword classification + client / date extraction
+    summary            JSON summary, decisions and action items from the transcript
+    followup / brief   plain-text drafts naming the client and meeting
+    client_resolution  JSON "no confident match"
+    json_repair        the first JSON object in the output to repair, else {}
+
+Configuration (env):
+    LLM_LOCAL_LATENCY_MS    simulated latency per call (0)
+    LLM_LOCAL_JITTER_MS     +/- uniform jitter around the latency (0)
+    LLM_LOCAL_SEED          jitter RNG seed, for repeatable runs (0)
+    LLM_LOCAL_RESPONSES     JSON file of canned responses keyed by prompt_type
+    LLM_LOCAL_RECORD_PATH   append every received prompt as JSON lines
+
+Received prompts are also kept in memory (see recorded_prompts()).
+"""
+import json
+import random
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+from app.config import Config
+from app.llm.ledger import estimate_tokens
+
+LOCAL_MODEL = "local"
+
+# Prompts kept in memory for inspection (oldest dropped first)
+_MAX_RECORDED_PROMPTS = 1000
+
+_MONTHS = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+_DATE_PATTERN = re.compile(
+    rf"\bon\s+({_MONTHS}\s+\d{{1,2}}(?:st|nd|rd|th)?(?:,?\s+\d{{4}})?"
+    rf"|\d{{1,2}}(?:st|nd|rd|th)?\s+(?:of\s+)?{_MONTHS}(?:,?\s+\d{{4}})?"
+    rf"|\d{{1,2}}/\d{{1,2}}(?:/\d{{2,4}})?"
+    rf"|\d{{4}}-\d{{2}}-\d{{2}})",
+    re.IGNORECASE,
+)
+_CLIENT_PATTERN = re.compile(r"\bwith\s+(?:the\s+)?(.+?)(?:\s+(?:on|about|from|for)\b|[?.!,]|$)", re.IGNORECASE)
+_SELECTION_WORDS = {"first": 0, "second": 1, "third": 2, "fourth": 3, "fifth": 4}
+_FIRST_N_PATTERN = re.compile(r"\bfirst\s+(two|three|four|five|\d+)\b", re.IGNORECASE)
+_COUNT_WORDS = {"two": 2, "three": 3, "four": 4, "five": 5}
+
+_INTENT_KEYWORDS = [
+    ("approve_hubspot_tasks", ("hubspot", "approve", "add those", "create the tasks", "sync them", "action items")),
+    ("generate_followup", ("follow-up", "follow up", "followup", "email")),
+    ("meeting_brief", ("brief", "prepare", "prep ", "upcoming", "next meeting")),
+    ("summarize_meeting", ("summar", "recap", "what happened")),
+]
+
+
+def _field(prompt: str, name: str) -> Optional[str]:
+    match = re.search(rf"^{re.escape(name)}:\s*(.*)$", prompt, re.MULTILINE)
+    value = match.group(1).strip() if match else ""
+    return value or None
+
+
+def _classify(message: str) -> Dict[str, Any]:
+    lowered = message.lower()
+    intent = next(
+        (name for name, keywords in _INTENT_KEYWORDS if any(k in lowered for k in keywords)),
+        "other",
+    )
+
+    date_match = _DATE_PATTERN.search(message)
+    client_match = _CLIENT_PATTERN.search(message)
+    client_name = client_match.group(1).strip() if client_match else None
+    if client_name and client_name.lower().startswith(("my ", "me", "them", "him", "her")):
+        client_name = None
+
+    first_n = _FIRST_N_PATTERN.search(lowered)
+    if first_n:
+        count = first_n.group(1)
+        selection = list(range(int(count) if count.isdigit() else _COUNT_WORDS[count]))
+    else:
+        selection = sorted({i for word, i in _SELECTION_WORDS.items() if word in lowered}) or None
+
+    return {
+        "intent": intent,
+        "confidence": 0.9 if intent != "other" else 0.3,
+        "entities": {
+            "client_name": client_name,
+            "date_text": date_match.group(1) if date_match else None,
+            "task_selection": selection if intent == "approve_hubspot_tasks" else None,
+            "email": None,
+            "preferred_name": None,
+        },
+    }
+
+
+def _summarize(prompt: str) -> Dict[str, Any]:
+    client = _field(prompt, "Client") or "the client"
+    meeting_date = (_field(prompt, "Meeting Date") or "")[:10] or "the meeting date"
+    transcript = prompt.split("Transcript:", 1)[-1]
+    lines = [
+        line.strip() for line in transcript.splitlines()
+        if ":" in line and not line.strip().startswith("Generate the summary")
+    ]
+
+    decisions = [
+        line.split(":", 1)[1].strip()
+        for line in lines
+        if re.search(r"\b(agree|decid|approv|finali)", line, re.IGNORECASE)
+    ][:3]
+    action_items = [
+        {"text": line.split(":", 1)[1].strip(), "owner": line.split(":", 1)[0].strip(), "deadline": None}
+        for line in lines
+        if re.search(r"\b(will|to do|follow up|send|schedule)\b", line, re.IGNORECASE)
+    ][:3]
+
+    return {
+        "summary": (
+            f"{client} met on {meeting_date} to review progress across {len(lines)} discussion points. "
+            "The group aligned on priorities and agreed on next steps for the coming weeks."
+        ),
+        "decisions": decisions or [f"Continue the current plan with {client}"],
+        "action_items": action_items or [
+            {"text": f"Send {client} a recap of the meeting", "owner": None, "deadline": None}
+        ],
+    }
+
+
+def _repair(prompt: str) -> str:
+    output = prompt.split("Output to repair:", 1)[-1]
+    start = output.find("{")
+    if start != -1:
+        try:
+            value, _ = json.JSONDecoder().raw_decode(output, start)
+            return json.dumps(value)
+        except json.JSONDecodeError:
+            pass
+    return "{}"
+
+
+def _followup(prompt: str) -> str:
+    client = _field(prompt, "Client") or "team"
+    meeting_date = _field(prompt, "Meeting Date") or "our recent meeting"
+    action_items = prompt.split("Action Items:", 1)[-1].split("Client:", 1)[0].strip()
+    return (
+        f"Subject: Follow-up from our meeting on {meeting_date}\n\n"
+        f"Hi {client} team,\n\n"
+        "Thank you for your time today. As discussed, here are the next steps:\n\n"
+        f"{action_items or 'None'}\n\n"
+        "Please let me know if I missed anything.\n\n"
+        "Best regards"
+    )
+
+
+def _brief(prompt: str) -> str:
+    meeting = _field(prompt, "Meeting") or "Upcoming meeting"
+    client = _field(prompt, "Client") or "the client"
+    meeting_date = _field(prompt, "Date") or "an upcoming date"
+    attendees = _field(prompt, "Attendees") or "Unknown"
+    return (
+        f"**Purpose**\n{meeting} with {client} on {meeting_date}.\n\n"
+        f"**Background**\nAttendees: {attendees}. Review the latest decisions and open action items.\n\n"
+        "**Likely discussion points**\nProgress since the last meeting, open risks and next milestones.\n\n"
+        "**Preparation**\nConfirm owners and dates for outstanding action items."
+    )
+
+
+_SYSTEM_PROMPT_TYPES = [
+    ("You are an intent classifier", "intent"),
+    ("You are a meeting intelligence assistant", "summary"),
+    ("You are a professional email writer", "followup"),
+    ("You are an executive meeting preparation assistant", "brief"),
+    ("You are a strict client name resolution assistant", "client_resolution"),
+    ("You are a JSON repair assistant", "json_repair"),
+]
+
+
+class LocalLLMClient:
+    """Drop-in for GeminiClient with the same chat() signature."""
+
+    def __init__(self):
+        self.latency_ms = Config.LLM_LOCAL_LATENCY_MS
+        self.jitter_ms = Config.LLM_LOCAL_JITTER_MS
+        self.record_path = Config.LLM_LOCAL_RECORD_PATH
+        self._rng = random.Random(Config.LLM_LOCAL_SEED)
+        self._lock = threading.Lock()
+        self._recorded: Deque[Dict[str, Any]] = deque(maxlen=_MAX_RECORDED_PROMPTS)
+        self._canned = self._load_canned(Config.LLM_LOCAL_RESPONSES)
+
+    @staticmethod
+    def _load_canned(path: str) -> Dict[str, str]:
+        if not path:
+            return {}
+        with open(path, "r", encoding="utf-8") as f:
+            canned = json.load(f)
+        # Non-string values (JSON objects) are returned serialized
+        return {k: v if isinstance(v, str) else json.dumps(v) for k, v in canned.items()}
+
+    def _delay(self) -> float:
+        with self._lock:
+            jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+    def _record_prompt(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._recorded.append(entry)
+            if self.record_path:
+                with open(self.record_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry) + "\n")
+
+    @staticmethod
+    def _model_label(model_name: Optional[str]) -> str:
+        # Keep the routed model visible without claiming a real model served it
+        return f"{LOCAL_MODEL}/{model_name}" if model_name else LOCAL_MODEL
+
+    def recorded_prompts(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._recorded)
+
+    def clear_recorded(self) -> None:
+        with self._lock:
+            self._recorded.clear()
+
+    def respond(self, prompt: str, system_prompt: Optional[str], prompt_type: str) -> str:
+        if prompt_type not in {"intent", "summary", "followup", "brief", "client_resolution", "json_repair"}:
+            prompt_type = next(
+                (t for prefix, t in _SYSTEM_PROMPT_TYPES if (system_prompt or "").startswith(prefix)),
+                prompt_type,
+            )
+
+        if prompt_type in self._canned:
+            return self._canned[prompt_type]
+
+        if prompt_type == "intent":
+            message = prompt.split("User message:", 1)[-1].split("\n\n", 1)[0].strip()
+            return json.dumps(_classify(message))
+        if prompt_type == "summary":
+            return json.dumps(_summarize(prompt))
+        if prompt_type == "followup":
+            return _followup(prompt)
+        if prompt_type == "brief":
+            return _brief(prompt)
+        if prompt_type == "client_resolution":
+            return json.dumps({"client": None, "confidence": 0.0, "reasoning": "local provider"})
+        if prompt_type == "json_repair":
+            return _repair(prompt)
+        return "OK"
+
+    def chat(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        response_format: Optional[Dict[str, Any]] = None,
+        prompt_type: str = "other",
+        model_name: Optional[str] = None,
+        degraded: Optional[str] = None,
+        context: Optional[str] = None,
+        timeout: Optional[float] = None,  # Deadline is enforced by the caller (app/llm/resilience.py)
+    ) -> str:
+        from app.llm.client import record_usage
+
+        started = time.perf_counter()
+        self._record_prompt({
+            "at": datetime.utcnow().isoformat() + "Z",
+            "prompt_type": prompt_type,
+            "model": self._model_label(model_name),
+            "system_prompt": system_prompt,
+            "context": context,
+            "prompt": prompt,
+        })
+
+        delay = self._delay()
+        if delay:
+            time.sleep(delay)
+
+        text = self.respond(prompt, system_prompt, prompt_type)
+
+        full_prompt = "\n\n".join(p for p in (system_prompt, context, prompt) if p)
+        record_usage(
+            prompt_type=prompt_type,
+            model=self._model_label(model_name),
+            tokens_in=estimate_tokens(full_prompt),
+            tokens_out=estimate_tokens(text),
+            latency_ms=(time.perf_counter() - started) * 1000,
+            degraded=degraded,
+        )
+        return text
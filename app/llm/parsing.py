@@ -0,0 +1,242 @@
+"""Structured LLM output - schemas, single-pass parsing and targeted repair.
+
+    from app.llm.parsing import SUMMARY_SCHEMA, chat_json
+
+    result = chat_json(prompt=..., system_prompt=..., schema=SUMMARY_SCHEMA, prompt_type="summary")
+
+chat_json() asks the model for JSON natively (response_mime_type plus
+response_schema, where the installed SDK supports them) and parses the
+reply in one pass: decode the first JSON object in the text, ignoring
+fences or prose around it, then validate it against the schema.
+
+On failure it makes one repair call instead of re-running the prompt. The
+call sends only the bad output, the parse error and the schema (not the
+transcript), on the next model tier up. If that fails too, LLMOutputError
+is raised.
+"""
+import json
+from typing import Any, Dict, Optional
+
+from app.llm import router
+from app.llm.client import chat
+from app.llm.ledger import estimate_tokens
+from app.llm.prompts import JSON_REPAIR_SYSTEM, JSON_REPAIR_USER
+from app.llm.templates import render
+from app.runtime.diagnostics import get_diagnostics
+from app.runtime.metrics import LLM_ESCALATIONS, LLM_REPAIRS
+
+diag = get_diagnostics("llm")
+
+# Bad output sent to the repair call is capped to keep it cheap
+_MAX_REPAIR_OUTPUT_CHARS = 8000
+
+_decoder = json.JSONDecoder()
+
+
+class LLMOutputError(ValueError):
+    """LLM response is not valid JSON for the expected schema."""
+
+    def __init__(self, message: str, raw: str = ""):
+        super().__init__(message)
+        self.raw = raw
+
+
+# -------------------------------------------------
+# Schemas (JSON Schema subset: type, properties, required, items, enum, nullable)
+# -------------------------------------------------
+
+INTENT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "intent": {
+            "type": "string",
+            "enum": [
+                "summarize_meeting",
+                "generate_followup",
+                "meeting_brief",
+                "approve_hubspot_tasks",
+                "other",
+            ],
+        },
+        "confidence": {"type": "number"},
+        "entities": {
+            "type": "object",
+            "properties": {
+                "client_name": {"type": "string", "nullable": True},
+                "date_text": {"type": "string", "nullable": True},
+                "task_selection": {"type": "array", "items": {"type": "integer"}, "nullable": True},
+                "email": {"type": "string", "nullable": True},
+                "preferred_name": {"type": "string", "nullable": True},
+            },
+        },
+    },
+    "required": ["intent"],
+}
+
+SUMMARY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": "string"},
+        "decisions": {"type": "array", "items": {"type": "string"}},
+        "action_items": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "text": {"type": "string"},
+                    "owner": {"type": "string", "nullable": True},
+                    "deadline": {"type": "string", "nullable": True},
+                },
+                "required": ["text"],
+            },
+        },
+    },
+    "required": ["summary", "decisions", "action_items"],
+}
+
+CLIENT_RESOLUTION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "client": {"type": "string", "nullable": True},
+        "confidence": {"type": "number"},
+        "reasoning": {"type": "string"},
+    },
+    "required": ["client", "confidence"],
+}
+
+
+_TYPE_CHECKS = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+}
+
+
+def validate(value: Any, schema: Dict[str, Any], path: str = "$") -> None:
+    """Raise LLMOutputError at the first mismatch. Unknown keys are allowed."""
+    if value is None:
+        if schema.get("nullable"):
+            return
+        raise LLMOutputError(f"{path}: expected {schema.get('type')}, got null")
+
+    expected = schema.get("type")
+    if expected and not _TYPE_CHECKS[expected](value):
+        raise LLMOutputError(f"{path}: expected {expected}, got {type(value).__name__}")
+
+    if "enum" in schema and value not in schema["enum"]:
+        raise LLMOutputError(f"{path}: {value!r} is not one of {schema['enum']}")
+
+    if expected == "object":
+        for key in schema.get("required", []):
+            if key not in value:
+                raise LLMOutputError(f"{path}: missing required key '{key}'")
+        for key, sub_schema in schema.get("properties", {}).items():
+            if key in value:
+                validate(value[key], sub_schema, f"{path}.{key}")
+
+    elif expected == "array" and "items" in schema:
+        for i, item in enumerate(value):
+            validate(item, schema["items"], f"{path}[{i}]")
+
+
+def parse_json(text: str, schema: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Decode the first JSON object in text (one pass; fences and surrounding
+    prose are skipped, trailing text is ignored) and validate it.
+    """
+    start = text.find("{")
+    if start == -1:
+        raise LLMOutputError("no JSON object in response", raw=text)
+
+    try:
+        value, _ = _decoder.raw_decode(text, start)
+    except json.JSONDecodeError as e:
+        raise LLMOutputError(f"invalid JSON: {e.msg} at char {e.pos}", raw=text)
+
+    if schema is not None:
+        try:
+            validate(value, schema)
+        except LLMOutputError as e:
+            e.raw = text
+            raise
+    return value
+
+
+def to_gemini_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Gemini's response_schema is an OpenAPI subset with upper-case type names."""
+    out: Dict[str, Any] = {}
+    for key, value in schema.items():
+        if key == "type":
+            out[key] = value.upper()
+        elif key == "properties":
+            out[key] = {name: to_gemini_schema(sub) for name, sub in value.items()}
+        elif key == "items":
+            out[key] = to_gemini_schema(value)
+        else:
+            out[key] = value
+    return out
+
+
+def json_response_format(schema: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "response_mime_type": "application/json",
+        "response_schema": to_gemini_schema(schema),
+    }
+
+
+def chat_json(
+    prompt: str,
+    schema: Dict[str, Any],
+    system_prompt: Optional[str] = None,
+    temperature: float = 0.0,
+    prompt_type: str = "other",
+    context: Optional[str] = None,
+) -> Dict[str, Any]:
+    """chat() for JSON answers: native structured output, one parse, one repair."""
+    response_format = json_response_format(schema)
+    text = chat(
+        prompt=prompt,
+        system_prompt=system_prompt,
+        temperature=temperature,
+        response_format=response_format,
+        prompt_type=prompt_type,
+        context=context,
+    )
+
+    try:
+        return parse_json(text, schema)
+    except LLMOutputError as e:
+        error = e
+
+    diag.warning("%s response failed validation (%s); attempting repair", prompt_type, error)
+
+    tier = router.route(prompt_type, estimate_tokens((system_prompt or "") + (context or "") + prompt))
+    repair_tier = router.escalate(tier) or tier
+    if repair_tier != tier:
+        LLM_ESCALATIONS.labels(prompt_type=prompt_type, from_tier=tier, to_tier=repair_tier).inc()
+
+    repaired = chat(
+        prompt=render(
+            JSON_REPAIR_USER,
+            error=str(error),
+            schema=json.dumps(schema),
+            output=text[:_MAX_REPAIR_OUTPUT_CHARS],
+        ),
+        system_prompt=JSON_REPAIR_SYSTEM,
+        temperature=0.0,
+        response_format=response_format,
+        prompt_type=f"{prompt_type}_repair",
+        tier=repair_tier,
+    )
+
+    try:
+        result = parse_json(repaired, schema)
+    except LLMOutputError:
+        LLM_REPAIRS.labels(prompt_type=prompt_type, result="failed").inc()
+        raise
+
+    LLM_REPAIRS.labels(prompt_type=prompt_type, result="repaired").inc()
+    return result
@@ -87,14 +87,18 @@ MEETING_SUMMARY_USER = """Meeting Date: {meeting_date}
 Attendees: {attendees}
 Client: {client_name}
 
-{memory_context}
-
 Transcript:
 {transcript}
 
 Generate the summary, decisions, and action items."""
 
 
+# Per-client memory, sent between the system instructions and the request
+# so repeated calls for the same client share a cacheable prefix
+MEMORY_CONTEXT = """Relevant context from previous meetings:
+{memory_context}"""
+
+
 FOLLOWUP_EMAIL_SYSTEM = """You are a professional email writer. Generate polished follow-up emails based on meeting summaries.
 
 Use the meeting summary, decisions, and action items to craft a professional follow-up email.
@@ -144,12 +148,23 @@ Date: {meeting_date}
 Client: {client_name}
 Attendees: {attendees}
 
-Relevant context from previous meetings:
-{memory_context}
-
 Generate a concise briefing with:
 1. Purpose of the meeting
 2. Relevant background
 3. Likely discussion points
 4. Suggested preparation notes
-"""
\ No newline at end of file
+"""
+JSON_REPAIR_SYSTEM = """You are a JSON repair assistant.
+
+Fix the JSON below so it is valid and matches the schema.
+Keep every value that is already correct; do not invent content.
+Return ONLY the corrected JSON object, no markdown, no explanation."""
+
+JSON_REPAIR_USER = """Error: {error}
+
+Schema:
+{schema}
+
+Output to repair:
+{output}
+"""
@@ -0,0 +1,357 @@
+"""LLM call resilience - deadlines, hedged requests and a circuit breaker.
+
+Every backend call made by app.llm.client.chat() goes through call():
+
+    deadline   each /api/chat request gets LLM_REQUEST_BUDGET_SECONDS
+               (begin_request()); a call waits at most the smaller of
+               LLM_CALL_TIMEOUT_SECONDS and what is left of that budget
+    hedging    if the call is still running after the p95 latency of recent
+               calls with the same prompt type and model, a duplicate is sent
+               and the first response wins. The slower call is cancelled if
+               it has not started, otherwise its result is discarded (its
+               usage is still recorded, see app/llm/ledger.py)
+    breaker    after LLM_BREAKER_FAILURES consecutive timeouts (of the full
+               LLM_CALL_TIMEOUT_SECONDS) or transport / 5xx errors on a model, calls to it fail fast
+               (LLMUnavailableError) for LLM_BREAKER_COOLDOWN_SECONDS, then
+               one probe call decides whether it closes again. Errors the
+               provider answered with (4xx, safety blocks, bad output) say
+               nothing about its health and are not counted
+
+Hedges spend tokens, so they are rationed. At most LLM_HEDGE_MAX_RATIO of
+calls may hedge, and only when:
+    - the prompt is under LLM_HEDGE_MAX_PROMPT_TOKENS;
+    - the call is not budget-degraded;
+    - the duplicate still fits the daily and workflow token budgets.
+"""
+import contextvars
+import socket
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from app.config import Config
+from app.llm import ledger
+from app.runtime.diagnostics import get_diagnostics
+from app.runtime.metrics import LLM_HEDGES, LLM_SHED
+
+diag = get_diagnostics("llm")
+
+# Recent successful latencies kept per (prompt_type, model) for the hedge delay
+_LATENCY_WINDOW = 200
+
+
+class LLMUnavailableError(RuntimeError):
+    """The provider is failing (circuit open); the call was not attempted."""
+
+
+class LLMDeadlineExceeded(TimeoutError):
+    """No response within the call's deadline."""
+
+
+# -------------------------------------------------
+# Request deadline
+# -------------------------------------------------
+
+_deadline = contextvars.ContextVar("llm_deadline", default=None)
+
+
+def begin_request(budget_seconds: Optional[float] = None) -> None:
+    """Start the LLM time budget for the current request (0 = no request budget)."""
+    budget = Config.LLM_REQUEST_BUDGET_SECONDS if budget_seconds is None else budget_seconds
+    _deadline.set(time.monotonic() + budget if budget > 0 else None)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left in the request budget, or None without one."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def call_timeout() -> float:
+    timeout = Config.LLM_CALL_TIMEOUT_SECONDS
+    left = remaining()
+    if left is not None:
+        if left <= 0:
+            raise LLMDeadlineExceeded("request LLM budget exhausted")
+        timeout = min(timeout, left)
+    return timeout
+
+
+# -------------------------------------------------
+# Latency tracking and hedge budget
+# -------------------------------------------------
+
+class LatencyWindow:
+    def __init__(self, size: int = _LATENCY_WINDOW):
+        self._lock = threading.Lock()
+        self._samples: Deque[float] = deque(maxlen=size)
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float, min_samples: int) -> Optional[float]:
+        with self._lock:
+            if len(self._samples) < max(min_samples, 1):
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+class HedgeBudget:
+    """Token bucket: each call earns `ratio` hedges (up to `burst`), each hedge spends one."""
+
+    def __init__(self, ratio: float, burst: float = 5.0):
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+
+    def earn(self) -> None:
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+
+# -------------------------------------------------
+# Circuit breaker
+# -------------------------------------------------
+
+class CircuitBreaker:
+    CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+
+    def __init__(self, failure_threshold: int, cooldown_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state(time.monotonic())
+
+    def _state(self, now: float) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if now - self._opened_at < self.cooldown_seconds:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def allow(self) -> bool:
+        if self.failure_threshold <= 0:
+            return True
+        with self._lock:
+            state = self._state(time.monotonic())
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """The call failed for a reason unrelated to provider health; let another probe through."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probe_in_flight or (
+                self.failure_threshold > 0 and self._failures >= self.failure_threshold
+            ):
+                if self._opened_at is None or self._probe_in_flight:
+                    diag.warning("LLM circuit opened after %s consecutive failures", self._failures)
+                self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+
+def _transport_errors() -> Tuple[type, ...]:
+    """Exception types meaning the provider is unreachable or failing server-side."""
+    errors: Tuple[type, ...] = (TimeoutError, ConnectionError, socket.timeout)
+    try:
+        from google.api_core import exceptions as api_exceptions
+        # ServerError covers 5xx, including DeadlineExceeded / ServiceUnavailable
+        errors += (api_exceptions.ServerError, api_exceptions.RetryError)
+    except ImportError:
+        pass
+    try:
+        import requests
+        errors += (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+    except ImportError:
+        pass
+    return errors
+
+
+_TRANSPORT_ERRORS = _transport_errors()
+
+
+def _is_provider_failure(error: BaseException) -> bool:
+    """Whether an error should count towards opening the circuit."""
+    if isinstance(error, _TRANSPORT_ERRORS):
+        return True
+    status = getattr(error, "code", None)
+    return isinstance(status, int) and status >= 500
+
+
+_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+_latencies: Dict[Tuple[str, str], LatencyWindow] = {}
+_breakers: Dict[str, CircuitBreaker] = {}
+_hedge_budget = HedgeBudget(Config.LLM_HEDGE_MAX_RATIO)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=Config.LLM_MAX_CONCURRENCY, thread_name_prefix="llm"
+                )
+    return _executor
+
+
+def _latency_window(prompt_type: str, model_name: str) -> LatencyWindow:
+    key = (prompt_type, model_name)
+    window = _latencies.get(key)
+    if window is None:
+        with _lock:
+            window = _latencies.setdefault(key, LatencyWindow())
+    return window
+
+
+def breaker_for(model_name: str) -> CircuitBreaker:
+    breaker = _breakers.get(model_name)
+    if breaker is None:
+        with _lock:
+            breaker = _breakers.setdefault(
+                model_name,
+                CircuitBreaker(Config.LLM_BREAKER_FAILURES, Config.LLM_BREAKER_COOLDOWN_SECONDS),
+            )
+    return breaker
+
+
+def breaker_states() -> Dict[str, str]:
+    return {model: breaker.state for model, breaker in list(_breakers.items())}
+
+
+def _submit(fn: Callable[[float], str], timeout: float) -> Future:
+    # Each attempt runs in its own copy of the caller's context (ledger, spans)
+    ctx = contextvars.copy_context()
+    return _get_executor().submit(ctx.run, fn, timeout)
+
+
+def _hedge_delay(window: LatencyWindow, prompt_tokens: int, degraded: Optional[str], timeout: float) -> Optional[float]:
+    if Config.LLM_HEDGE_MAX_RATIO <= 0 or degraded:
+        return None
+    if prompt_tokens > Config.LLM_HEDGE_MAX_PROMPT_TOKENS:
+        return None
+    delay = window.percentile(0.95, Config.LLM_HEDGE_MIN_SAMPLES)
+    if delay is None or delay >= timeout:
+        return None
+    return delay
+
+
+def call(
+    fn: Callable[[float], str],
+    *,
+    prompt_type: str,
+    model_name: str,
+    prompt_tokens: int,
+    degraded: Optional[str] = None,
+) -> str:
+    """Run fn(timeout) under the deadline, hedging and breaker rules above."""
+    breaker = breaker_for(model_name)
+    if not breaker.allow():
+        LLM_SHED.labels(prompt_type=prompt_type, reason="circuit_open").inc()
+        raise LLMUnavailableError(f"LLM model '{model_name}' is failing; circuit open")
+
+    try:
+        timeout = call_timeout()
+    except LLMDeadlineExceeded:
+        LLM_SHED.labels(prompt_type=prompt_type, reason="deadline").inc()
+        raise
+
+    window = _latency_window(prompt_type, model_name)
+    hedge_delay = _hedge_delay(window, prompt_tokens, degraded, timeout)
+    _hedge_budget.earn()
+
+    started = time.monotonic()
+    deadline = started + timeout
+    primary = _submit(fn, timeout)
+    futures: List[Future] = [primary]
+    hedge_pending = hedge_delay is not None
+    hedge_fired = False
+    error: Optional[BaseException] = None
+
+    while futures:
+        now = time.monotonic()
+        wait_for = deadline - now
+        if hedge_pending:
+            wait_for = min(wait_for, started + hedge_delay - now)
+
+        done, _ = wait(futures, timeout=max(wait_for, 0), return_when=FIRST_COMPLETED)
+
+        for future in done:
+            futures.remove(future)
+            if future.exception() is not None:
+                error = error or future.exception()
+                continue
+
+            for other in futures:
+                other.cancel()
+            window.add(time.monotonic() - started)
+            breaker.record_success()
+            if hedge_fired:
+                LLM_HEDGES.labels(prompt_type=prompt_type, result="lost" if future is primary else "won").inc()
+            return future.result()
+
+        if done:
+            continue
+        if time.monotonic() >= deadline:
+            break
+
+        # Past the hedge delay with the first call still running
+        hedge_pending = False
+        if ledger.can_afford(prompt_tokens) and _hedge_budget.try_spend():
+            futures.append(_submit(fn, deadline - time.monotonic()))
+            hedge_fired = True
+            LLM_HEDGES.labels(prompt_type=prompt_type, result="fired").inc()
+
+    for future in futures:
+        future.cancel()
+
+    if error is not None and not futures:
+        if _is_provider_failure(error):
+            breaker.record_failure()
+        else:
+            breaker.release_probe()
+        raise error
+
+    if timeout < Config.LLM_CALL_TIMEOUT_SECONDS:
+        # Cut short by the caller's request budget: says nothing about the provider
+        breaker.release_probe()
+        LLM_SHED.labels(prompt_type=prompt_type, reason="deadline").inc()
+        raise LLMDeadlineExceeded(f"LLM call stopped after {timeout:.1f}s: request LLM budget exhausted")
+
+    breaker.record_failure()
+    LLM_SHED.labels(prompt_type=prompt_type, reason="timeout").inc()
+    raise LLMDeadlineExceeded(f"LLM call timed out after {timeout:.1f}s")
@@ -0,0 +1,73 @@
+"""Model routing - map each call to a model tier by prompt type and size.
+
+    LLM_ROUTES="intent=fast,client_resolution=fast,brief=fast,followup=standard,summary=standard,summary>20000=large,*=standard"
+
+Each entry is `prompt_type=tier` or `prompt_type>TOKENS=tier` (used when the
+estimated prompt exceeds TOKENS; the highest matching threshold wins);
+`*` is the fallback. Tiers resolve to models through LLM_MODEL_FAST,
+LLM_MODEL_STANDARD and LLM_MODEL_LARGE (empty = GEMINI_MODEL).
+
+When a JSON response fails schema validation, app.llm.parsing.chat_json()
+repairs it once on the next tier up the ladder: fast -> standard -> large.
+"""
+import re
+from typing import Dict, List, Optional, Tuple
+
+from app.config import Config
+
+TIERS = ("fast", "standard", "large")
+
+_ROUTE_KEY = re.compile(r"^\s*([\w*]+)\s*(?:>\s*(\d+))?\s*$")
+
+
+def _parse_routes(raw: str) -> Tuple[Dict[str, str], Dict[str, List[Tuple[int, str]]]]:
+    base: Dict[str, str] = {}
+    by_size: Dict[str, List[Tuple[int, str]]] = {}
+
+    for item in raw.split(","):
+        if "=" not in item:
+            continue
+        key, tier = item.rsplit("=", 1)
+        tier = tier.strip().lower()
+        match = _ROUTE_KEY.match(key)
+        if not match or tier not in TIERS:
+            continue
+
+        prompt_type, threshold = match.group(1), match.group(2)
+        if threshold is None:
+            base[prompt_type] = tier
+        else:
+            by_size.setdefault(prompt_type, []).append((int(threshold), tier))
+
+    for rules in by_size.values():
+        rules.sort(reverse=True)
+    return base, by_size
+
+
+_BASE_ROUTES, _SIZE_ROUTES = _parse_routes(Config.LLM_ROUTES)
+
+
+def route(prompt_type: str, prompt_tokens: int) -> str:
+    """Tier for a call of this prompt type and estimated prompt size."""
+    for threshold, tier in _SIZE_ROUTES.get(prompt_type, []):
+        if prompt_tokens > threshold:
+            return tier
+    return _BASE_ROUTES.get(prompt_type) or _BASE_ROUTES.get("*") or "standard"
+
+
+def model_for(tier: str) -> str:
+    models = {
+        "fast": Config.LLM_MODEL_FAST,
+        "standard": Config.LLM_MODEL_STANDARD,
+        "large": Config.LLM_MODEL_LARGE,
+    }
+    return models.get(tier) or Config.GEMINI_MODEL
+
+
+def escalate(tier: str) -> Optional[str]:
+    """Next tier up that maps to a different model, or None at the top."""
+    current = model_for(tier)
+    for higher in TIERS[TIERS.index(tier) + 1:]:
+        if model_for(higher) != current:
+            return higher
+    return None
@@ -0,0 +1,39 @@
+"""Prompt templates - compiled once per process, rendered by concatenation.
+
+    from app.llm.templates import render
+
+    prompt = render(MEETING_BRIEF_USER, meeting_title=..., ...)
+
+render() is a drop-in for template.format(**values). Each template is split
+into literal / field pieces on first use and cached, so repeated calls skip
+re-parsing the (often long) prompt text.
+"""
+from functools import lru_cache
+from string import Formatter
+from typing import Any, Optional, Tuple
+
+_Piece = Tuple[str, Optional[str]]  # (literal text, field name or None)
+
+
+@lru_cache(maxsize=128)
+def compile_template(template: str) -> Optional[Tuple[_Piece, ...]]:
+    """Literal / field pieces, or None when the template needs full str.format."""
+    pieces = []
+    for literal, field, spec, conversion in Formatter().parse(template):
+        if field is not None and (spec or conversion or not field.isidentifier()):
+            return None
+        pieces.append((literal, field))
+    return tuple(pieces)
+
+
+def render(template: str, **values: Any) -> str:
+    pieces = compile_template(template)
+    if pieces is None:
+        return template.format(**values)
+
+    parts = []
+    for literal, field in pieces:
+        parts.append(literal)
+        if field is not None:
+            parts.append(str(values[field]))
+    return "".join(parts)
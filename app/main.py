@@ -1,9 +1,13 @@
 """FastAPI application entry point."""
 from fastapi import FastAPI
+from fastapi.responses import Response
 from app.api import chat, ui
 from fastapi.staticfiles import StaticFiles
 from app.runtime.mode import get_app_mode
 from app.middleware.demo_auth import DemoBasicAuthMiddleware
+from app.db.session import get_pool_stats
+from app.runtime.metrics import CONTENT_TYPE, render_metrics
+from app.agent.brief_scheduler import start_scheduler, stop_scheduler
 from init_db import init_db
 import os
 
@@ -25,9 +29,30 @@ def health():
         "mode": get_app_mode(),
     }
 
+
+@app.get("/health/db")
+def health_db():
+    """Connection pool occupancy and checkout wait metrics."""
+    return {
+        "status": "ok",
+        "pool": get_pool_stats(),
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint (LLM, integrations, caches, DB pool, workflows)."""
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE)
+
 @app.on_event("startup")
 def on_startup():
     init_db()
+    start_scheduler()  # No-op unless BRIEF_PRECOMPUTE=true
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    stop_scheduler()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,500 @@
+"""Async memory repository - same API as MemoryRepo on an AsyncSession.
+
+Writes stage the same post-commit hooks as MemoryRepo (search index, vector
+store, memory listeners such as the brief scheduler); they run in a worker
+thread once the transaction commits.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+from functools import partial
+from typing import Optional, List, Dict, Any, Callable
+
+from sqlalchemy import delete, func, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import Config
+from app.memory.models import Meeting, MemoryEntry, Commitment, Interaction, ActiveMeeting, LLMUsage, PrecomputedBrief
+from app.memory.blobs import get_blob_store
+from app.memory.schemas import MeetingCreate, MeetingUpdate, MemoryEntryCreate, CommitmentCreate
+from app.memory.repo import DEFAULT_CONVERSATION_ID, _memory_listeners, _notify_memory_listeners
+from app.memory.search import (
+    SEARCH_MODES,
+    entry_document,
+    meeting_documents,
+    memory_index,
+    publish_entry,
+    publish_meeting,
+)
+
+
+class AsyncMemoryRepo:
+    """Repository for memory operations (asyncio)."""
+
+    def __init__(self, db: AsyncSession, read_db: Optional[AsyncSession] = None):
+        self.session = db
+        self.read_session = read_db
+        self._in_unit_of_work = False
+        self._has_written = False
+        # Search index updates and memory listener calls, applied once the writes commit
+        self._pending_index: List[Callable[[], None]] = []
+
+    @property
+    def _read_session(self) -> AsyncSession:
+        """Replica for read-only lookups until this repo writes (read-your-writes)."""
+        if self.read_session is None or self._has_written:
+            return self.session
+        return self.read_session
+
+    # Unit of work
+    @asynccontextmanager
+    async def unit_of_work(self):
+        """Async counterpart of MemoryRepo.unit_of_work()."""
+        if self._in_unit_of_work:
+            yield self
+            return
+
+        self._in_unit_of_work = True
+        try:
+            yield self
+            await self.session.commit()
+            await self._apply_pending_index()
+        except Exception:
+            await self.session.rollback()
+            self._pending_index.clear()
+            raise
+        finally:
+            self._in_unit_of_work = False
+
+    async def _save(self, instance=None, refresh: bool = False, index: Optional[Callable[[], Callable]] = None) -> None:
+        """Async counterpart of MemoryRepo._save()."""
+        self._has_written = True
+        if index is not None and Config.MEMORY_SEARCH in SEARCH_MODES:
+            # Snapshot now: attributes expire on commit
+            await self.session.flush()
+            self._pending_index.append(index())
+
+        if self._in_unit_of_work:
+            await self.session.flush()
+        else:
+            await self.session.commit()
+            await self._apply_pending_index()
+
+        if refresh and instance is not None:
+            await self.session.refresh(instance)
+
+    async def _apply_pending_index(self) -> None:
+        pending, self._pending_index = self._pending_index, []
+        for update in pending:
+            # Index updates take a lock and may embed text: keep them off the event loop
+            await asyncio.to_thread(update)
+
+    def _queue_memory_change(self, client_name: Optional[str]) -> None:
+        if _memory_listeners:
+            self._pending_index.append(partial(_notify_memory_listeners, client_name))
+
+    async def _first(self, stmt, session: Optional[AsyncSession] = None):
+        result = await (session or self.session).execute(stmt.limit(1))
+        return result.scalars().first()
+
+    async def _all(self, stmt, session: Optional[AsyncSession] = None) -> list:
+        result = await (session or self.session).execute(stmt)
+        return list(result.scalars().all())
+
+    # Client resolution operations
+    async def get_distinct_client_names(self, limit: int = 200):
+        result = await self._read_session.execute(
+            select(Meeting.client_name)
+            .where(Meeting.client_name.isnot(None))
+            .where(Meeting.client_name != "")
+            .distinct()
+            .limit(limit)
+        )
+        return [r[0] for r in result.all()]
+
+    # Meeting operations
+    async def create_meeting(self, meeting_data: MeetingCreate) -> Meeting:
+        """Create a new meeting record. Transcripts are offloaded to the blob store."""
+        data = meeting_data.dict()
+        transcript = data.pop("transcript", None)
+        if transcript:
+            data["transcript_ref"] = await asyncio.to_thread(get_blob_store().put_text, transcript)
+        meeting = Meeting(**data)
+        self.session.add(meeting)
+        await self._save(meeting)
+        return meeting
+
+    async def get_meeting_by_calendar_id(self, calendar_event_id: str) -> Optional[Meeting]:
+        """Get meeting by calendar event ID."""
+        return await self._first(
+            select(Meeting).where(Meeting.calendar_event_id == calendar_event_id)
+        )
+
+    async def get_recent_meeting_by_client(self, client_name: str, limit: int = 1) -> Optional[Meeting]:
+        """Get most recent meeting for a client."""
+        return await self._first(
+            select(Meeting)
+            .where(Meeting.client_name.ilike(f"%{client_name}%"))
+            .order_by(Meeting.meeting_date.desc())
+        )
+
+    async def get_most_recent_meeting(self):
+        return await self._first(select(Meeting).order_by(Meeting.meeting_date.desc()))
+
+    async def get_next_upcoming_meeting(self, client_name: Optional[str] = None):
+        """
+        Returns the next upcoming meeting.
+        If client_name is provided, scopes to that client.
+        """
+        stmt = select(Meeting).where(Meeting.meeting_date >= datetime.utcnow())
+        if client_name:
+            stmt = stmt.where(Meeting.client_name.ilike(f"%{client_name}%"))
+        return await self._first(stmt.order_by(Meeting.meeting_date.asc()))
+
+    async def update_meeting(self, meeting_id: int, update_data: MeetingUpdate) -> Meeting:
+        """Update meeting with summary, decisions, action items."""
+        meeting = await self.session.get(Meeting, meeting_id)
+        if not meeting:
+            raise ValueError(f"Meeting {meeting_id} not found")
+
+        if update_data.summary:
+            meeting.summary = update_data.summary
+        if update_data.decisions:
+            meeting.decisions = update_data.decisions
+        if update_data.action_items:
+            meeting.action_items = update_data.action_items
+
+        meeting.updated_at = datetime.utcnow()
+        self._queue_memory_change(meeting.client_name)
+        await self._save(
+            meeting,
+            index=lambda: partial(publish_meeting, meeting.id, meeting_documents(meeting)),
+        )
+        return meeting
+
+    async def set_active_meeting(
+        self,
+        meeting_id: int,
+        conversation_id: str = DEFAULT_CONVERSATION_ID,
+    ) -> None:
+        """
+        Persistently marks a meeting as active for a conversation.
+        Replaces the conversation's previous pointer (single-row PK upsert).
+        """
+        pointer = await self.session.get(ActiveMeeting, conversation_id)
+        if pointer:
+            pointer.meeting_id = meeting_id
+        else:
+            self.session.add(
+                ActiveMeeting(conversation_id=conversation_id, meeting_id=meeting_id)
+            )
+        await self._save()
+
+    async def get_active_meeting(
+        self,
+        conversation_id: str = DEFAULT_CONVERSATION_ID,
+    ) -> Optional[Meeting]:
+        """
+        Returns the conversation's active meeting.
+        """
+        return await self._first(
+            select(Meeting)
+            .join(ActiveMeeting, ActiveMeeting.meeting_id == Meeting.id)
+            .where(ActiveMeeting.conversation_id == conversation_id)
+        )
+
+    async def update_meeting_company(self, meeting_id: int, hubspot_company_id: str):
+        meeting = await self.session.get(Meeting, meeting_id)
+        if meeting:
+            meeting.hubspot_company_id = hubspot_company_id
+            await self._save()
+
+    async def get_meeting_transcript(self, meeting: Meeting) -> Optional[str]:
+        """
+        Resolve a meeting's transcript.
+        Blob reference first; falls back to the legacy inline column.
+        """
+        if meeting.transcript_ref:
+            return await asyncio.to_thread(get_blob_store().get_text, meeting.transcript_ref)
+        # Deferred column: load explicitly, lazy loads are not allowed under asyncio
+        return await self.session.scalar(
+            select(Meeting.transcript).where(Meeting.id == meeting.id)
+        )
+
+    async def get_meeting(self, meeting_id: int) -> Optional[Meeting]:
+        return await self.session.get(Meeting, meeting_id)
+
+    async def create_memory_entry(self, entry_data: MemoryEntryCreate) -> MemoryEntry:
+        """Create a memory entry."""
+        data = entry_data.dict()
+        # Map metadata to meta_data to avoid SQLAlchemy reserved name conflict
+        if "metadata" in data:
+            data["meta_data"] = data.pop("metadata")
+        entry = MemoryEntry(**data)
+        self.session.add(entry)
+        client_name = await self._client_name(entry)
+        self._queue_memory_change(client_name)
+        await self._save(entry, index=lambda: partial(publish_entry, entry_document(entry, client_name)))
+        return entry
+
+    async def _client_name(self, entry: MemoryEntry) -> Optional[str]:
+        meeting = await self.session.get(Meeting, entry.meeting_id) if entry.meeting_id else None
+        return meeting.client_name if meeting else None
+
+    async def get_memory_by_key(self, key: str, limit: int = 10) -> List[MemoryEntry]:
+        """Get memory entries by key."""
+        return await self._all(
+            select(MemoryEntry)
+            .where(MemoryEntry.key == key)
+            .order_by(MemoryEntry.created_at.desc())
+            .limit(limit)
+        )
+
+    async def get_memory_for_client(self, client_name: str) -> List[MemoryEntry]:
+        """Get memory entries related to a client."""
+        meeting_ids = select(Meeting.id).where(Meeting.client_name.ilike(f"%{client_name}%"))
+        return await self._all(
+            select(MemoryEntry).where(MemoryEntry.meeting_id.in_(meeting_ids)),
+            session=self._read_session,
+        )
+
+    async def search_memory(
+        self,
+        client_name: str,
+        query: str = "",
+        exclude_meeting_id: Optional[int] = None,
+    ):
+        """Async counterpart of MemoryRepo.search_memory()."""
+        cursors = memory_index.claim_sync()
+        if cursors is not None:
+            changes = await self.get_memory_changes(*cursors)
+            await asyncio.to_thread(memory_index.apply_changes, *changes)
+        if memory_index.needs_client(client_name):
+            changes = await self.get_memory_changes(client_name=client_name)
+            await asyncio.to_thread(memory_index.apply_client, client_name, *changes)
+        return await asyncio.to_thread(
+            memory_index.select, client_name, query, exclude_meeting_id=exclude_meeting_id
+        )
+
+    async def get_memory_changes(
+        self,
+        entries_created_since: Optional[datetime] = None,
+        meetings_updated_since: Optional[datetime] = None,
+        client_name: Optional[str] = None,
+    ):
+        """Async counterpart of MemoryRepo.get_memory_changes()."""
+        entries = (
+            select(MemoryEntry, Meeting.client_name)
+            .outerjoin(Meeting, Meeting.id == MemoryEntry.meeting_id)
+        )
+        if entries_created_since is not None:
+            entries = entries.where(MemoryEntry.created_at >= entries_created_since)
+
+        meetings = select(Meeting).where(or_(Meeting.summary.isnot(None), Meeting.decisions.isnot(None)))
+        if meetings_updated_since is not None:
+            meetings = meetings.where(Meeting.updated_at >= meetings_updated_since)
+
+        if client_name is not None:
+            entries = entries.where(Meeting.client_name.ilike(f"%{client_name}%"))
+            meetings = meetings.where(Meeting.client_name.ilike(f"%{client_name}%"))
+
+        entry_rows = (await self._read_session.execute(entries)).all()
+        return [tuple(row) for row in entry_rows], await self._all(meetings, session=self._read_session)
+
+    async def get_recent_meetings_for_client(
+        self,
+        client_name: str,
+        exclude_meeting_id: Optional[int] = None,
+        limit: int = 3,
+    ):
+        stmt = (
+            select(Meeting)
+            .where(Meeting.client_name == client_name)
+            .order_by(Meeting.meeting_date.desc())
+        )
+
+        if exclude_meeting_id:
+            stmt = stmt.where(Meeting.id != exclude_meeting_id)
+
+        return await self._all(stmt.limit(limit), session=self._read_session)
+
+    # Commitment operations
+    async def create_commitment(self, commitment_data: CommitmentCreate) -> Commitment:
+        """Create a commitment record."""
+        commitment = Commitment(**commitment_data.dict())
+        self.session.add(commitment)
+        await self._save(commitment)
+        return commitment
+
+    async def get_commitments_by_meeting(self, meeting_id: int) -> List[Commitment]:
+        """Get all commitments for a meeting."""
+        return await self._all(select(Commitment).where(Commitment.meeting_id == meeting_id))
+
+    async def _get_commitment_or_raise(self, commitment_id: int) -> Commitment:
+        commitment = await self.session.get(Commitment, commitment_id)
+        if not commitment:
+            raise ValueError(f"Commitment {commitment_id} not found")
+        return commitment
+
+    async def update_commitment_status(self, commitment_id: int, status: str) -> Commitment:
+        """Update commitment status."""
+        commitment = await self._get_commitment_or_raise(commitment_id)
+        commitment.status = status
+        commitment.updated_at = datetime.utcnow()
+        await self._save(commitment)
+        return commitment
+
+    async def get_pending_commitments(self, meeting_id: int) -> List[Commitment]:
+        """Return all pending commitments for a meeting."""
+        return await self._all(
+            select(Commitment).where(
+                Commitment.meeting_id == meeting_id,
+                Commitment.status == "pending",
+            )
+        )
+
+    async def mark_commitment_created(
+        self,
+        commitment_id: int,
+        hubspot_task_id: str,
+    ) -> Commitment:
+        """Mark commitment as successfully created in HubSpot."""
+        commitment = await self._get_commitment_or_raise(commitment_id)
+        commitment.hubspot_task_id = hubspot_task_id
+        commitment.status = "created"
+        commitment.updated_at = datetime.utcnow()
+        await self._save(commitment)
+        return commitment
+
+    async def mark_commitment_failed(self, commitment_id: int) -> Commitment:
+        """Mark commitment as failed during HubSpot creation."""
+        commitment = await self._get_commitment_or_raise(commitment_id)
+        commitment.status = "failed"
+        commitment.updated_at = datetime.utcnow()
+        await self._save(commitment)
+        return commitment
+
+    # Interaction operations
+    async def create_interaction(self, user_message: str, intent: str, response: str,
+                                 workflow: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None,
+                                 conversation_id: str = DEFAULT_CONVERSATION_ID) -> Interaction:
+        """Create an interaction record."""
+        interaction = Interaction(
+            conversation_id=conversation_id,
+            user_message=user_message,
+            intent=intent,
+            workflow=workflow,
+            response=response,
+            meta_data=metadata,
+        )
+        self.session.add(interaction)
+        await self._save(interaction)
+        return interaction
+
+    async def get_last_interaction(
+        self,
+        conversation_id: str = DEFAULT_CONVERSATION_ID,
+    ) -> Optional[Interaction]:
+        """
+        Returns the most recent interaction in a conversation.
+        """
+        return await self._first(
+            select(Interaction)
+            .where(Interaction.conversation_id == conversation_id)
+            .order_by(Interaction.created_at.desc()),
+            session=self._read_session,
+        )
+
+    async def get_recent_interactions(
+        self,
+        limit: int = 3,
+        conversation_id: str = DEFAULT_CONVERSATION_ID,
+    ) -> List[Interaction]:
+        """
+        Returns the most recent N interactions in a conversation.
+        """
+        return await self._all(
+            select(Interaction)
+            .where(Interaction.conversation_id == conversation_id)
+            .order_by(Interaction.created_at.desc())
+            .limit(limit),
+            session=self._read_session,
+        )
+
+    # Precomputed brief operations
+    async def get_precomputed_brief(self, calendar_event_id: str, context_hash: str) -> Optional[PrecomputedBrief]:
+        return await self._first(
+            select(PrecomputedBrief).where(
+                PrecomputedBrief.calendar_event_id == calendar_event_id,
+                PrecomputedBrief.context_hash == context_hash,
+            ),
+            session=self._read_session,
+        )
+
+    async def save_precomputed_brief(
+        self,
+        *,
+        calendar_event_id: str,
+        client_name: Optional[str],
+        meeting_start: Optional[datetime],
+        context_hash: str,
+        brief: str,
+        memory_used: Optional[Dict[str, Any]] = None,
+    ) -> Optional[PrecomputedBrief]:
+        """
+        Store a brief, replacing the superseded one for the same event and client.
+        If another process stored the same brief first, its row is kept and returned.
+        """
+        row = PrecomputedBrief(
+            calendar_event_id=calendar_event_id,
+            client_name=client_name,
+            meeting_start=meeting_start,
+            context_hash=context_hash,
+            brief=brief,
+            memory_used=memory_used,
+        )
+        try:
+            # Savepoint: losing the race must not roll back the caller's unit of work
+            async with self.session.begin_nested():
+                await self.session.execute(
+                    delete(PrecomputedBrief).where(
+                        PrecomputedBrief.calendar_event_id == calendar_event_id,
+                        PrecomputedBrief.client_name == client_name,
+                    )
+                    # Evict the replaced row so its reused id can't clash in the identity map
+                    .execution_options(synchronize_session="fetch")
+                )
+                self.session.add(row)
+        except IntegrityError:
+            return await self.get_precomputed_brief(calendar_event_id, context_hash)
+        await self._save(row)
+        return row
+
+    async def delete_precomputed_briefs_before(self, cutoff: datetime) -> int:
+        """Drop briefs for meetings that started before `cutoff`."""
+        result = await self.session.execute(
+            delete(PrecomputedBrief).where(PrecomputedBrief.meeting_start < cutoff)
+        )
+        if result.rowcount:
+            await self._save()
+        return result.rowcount
+
+    # LLM usage ledger operations
+    async def record_llm_usage(self, records: List[Dict[str, Any]]) -> None:
+        """Persist buffered LLM usage records (see app/llm/ledger.py)."""
+        if not records:
+            return
+        self.session.add_all([LLMUsage(**r) for r in records])
+        await self._save()
+
+    async def get_llm_tokens_since(self, since: datetime, workflow: Optional[str] = None) -> int:
+        """Total prompt + completion tokens recorded since a point in time."""
+        stmt = select(
+            func.coalesce(func.sum(LLMUsage.prompt_tokens + LLMUsage.completion_tokens), 0)
+        ).where(LLMUsage.created_at >= since)
+
+        if workflow:
+            stmt = stmt.where(LLMUsage.workflow == workflow)
+
+        return int(await self.session.scalar(stmt) or 0)
@@ -0,0 +1,164 @@
+"""Content-addressed blob store for large meeting payloads (transcripts).
+
+Blobs are keyed by the SHA-256 of their UTF-8 content, so identical
+transcripts are stored once. `Meeting` rows only hold the reference.
+"""
+import hashlib
+import mmap
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from app.config import Config
+
+
+class BlobNotFoundError(Exception):
+    """Raised when a blob reference cannot be resolved."""
+    pass
+
+
+def content_key(data: bytes) -> str:
+    """Return the content address (hex SHA-256) for raw bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class BlobStore:
+    """Interface for content-addressed blob backends."""
+
+    def put_bytes(self, data: bytes) -> str:
+        raise NotImplementedError
+
+    def get_bytes(self, key: str) -> bytes:
+        raise NotImplementedError
+
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def put_text(self, text: str) -> str:
+        """Store text and return its content key. Identical text is deduplicated."""
+        return self.put_bytes(text.encode("utf-8"))
+
+    def get_text(self, key: str) -> str:
+        return self.get_bytes(key).decode("utf-8")
+
+
+class LocalBlobStore(BlobStore):
+    """
+    Filesystem backend.
+
+    Layout: <root>/<key[:2]>/<key[2:4]>/<key>
+    Writes are atomic (temp file + rename); reads are memory-mapped.
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / key[2:4] / key
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def put_bytes(self, data: bytes) -> str:
+        key = content_key(data)
+        path = self._path(key)
+
+        # Deduplicate: same content -> same key -> nothing to write
+        if path.exists():
+            return key
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        return key
+
+    def get_bytes(self, key: str) -> bytes:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if size == 0:
+                    return b""
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return mm[:]
+        except FileNotFoundError as e:
+            raise BlobNotFoundError(f"Blob {key} not found in {self.root}") from e
+
+
+class S3BlobStore(BlobStore):
+    """S3 / S3-compatible backend (requires boto3)."""
+
+    def __init__(self, bucket: str, prefix: str = "", endpoint_url: Optional[str] = None):
+        try:
+            import boto3
+        except ImportError as e:
+            raise RuntimeError(
+                "❌ BLOB_STORE_BACKEND=s3 requires boto3 (pip install boto3)"
+            ) from e
+
+        if not bucket:
+            raise RuntimeError("❌ BLOB_STORE_S3_BUCKET is not set")
+
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = boto3.client("s3", endpoint_url=endpoint_url or None)
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+            return True
+        except ClientError:
+            return False
+
+    def put_bytes(self, data: bytes) -> str:
+        key = content_key(data)
+        if not self.exists(key):
+            self.client.put_object(
+                Bucket=self.bucket,
+                Key=self._object_key(key),
+                Body=data,
+                ContentType="text/plain; charset=utf-8",
+            )
+        return key
+
+    def get_bytes(self, key: str) -> bytes:
+        from botocore.exceptions import ClientError
+
+        try:
+            obj = self.client.get_object(Bucket=self.bucket, Key=self._object_key(key))
+        except ClientError as e:
+            raise BlobNotFoundError(f"Blob {key} not found in s3://{self.bucket}") from e
+        return obj["Body"].read()
+
+
+# ---- Public accessor used by the rest of the app ----
+
+_store: Optional[BlobStore] = None
+
+
+def get_blob_store() -> BlobStore:
+    global _store
+    if _store is None:
+        if Config.BLOB_STORE_BACKEND == "s3":
+            _store = S3BlobStore(
+                bucket=Config.BLOB_STORE_S3_BUCKET,
+                prefix=Config.BLOB_STORE_S3_PREFIX,
+                endpoint_url=Config.BLOB_STORE_S3_ENDPOINT_URL,
+            )
+        else:
+            _store = LocalBlobStore(Config.BLOB_STORE_PATH)
+    return _store
@@ -1,6 +1,6 @@
 """SQLAlchemy models for persistent memory."""
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Boolean, Index, UniqueConstraint
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 from app.db.session import Base
 
@@ -14,13 +14,17 @@ class Meeting(Base):
     meeting_date = Column(DateTime)
     calendar_event_id = Column(String, unique=True)
     zoom_meeting_id = Column(String, nullable=True)
-    transcript = Column(Text, nullable=True)
+    # Legacy inline transcript; new rows store it in the blob store (see transcript_ref).
+    # Deferred so list/lookup queries never pull multi-hundred-KB payloads.
+    transcript = deferred(Column(Text, nullable=True))
+    transcript_ref = Column(String(64), nullable=True, index=True)  # SHA-256 content key
     summary = Column(Text, nullable=True)
     decisions = Column(JSON, nullable=True)  # List of decision strings
     action_items = Column(JSON, nullable=True)  # List of action item dicts
     
     hubspot_company_id = Column(String, nullable=True)
 
+    # Legacy global flag; active meetings are tracked per conversation in active_meetings
     is_active = Column(Boolean, default=False, index=True)
 
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -67,11 +71,64 @@ class Commitment(Base):
 class Interaction(Base):
     """User interaction history."""
     __tablename__ = "interactions"
+    __table_args__ = (
+        # "Latest interaction(s) for a conversation" is an index range scan
+        Index("ix_interactions_conversation_created", "conversation_id", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
+    conversation_id = Column(String, nullable=True)  # Conversation / user key
     user_message = Column(Text)
     intent = Column(String)
     workflow = Column(String, nullable=True)
     response = Column(Text)
     meta_data = Column("metadata", JSON, nullable=True)  # Using meta_data to avoid SQLAlchemy reserved name
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)  # Partition key on Postgres
+
+
+class ActiveMeeting(Base):
+    """Per-conversation pointer to the meeting the user is currently working on."""
+    __tablename__ = "active_meetings"
+
+    conversation_id = Column(String, primary_key=True)
+    meeting_id = Column(Integer, ForeignKey("meetings.id"), nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    meeting = relationship("Meeting")
+
+
+class LLMUsage(Base):
+    """Ledger of LLM calls - tokens and latency, tagged for cost attribution."""
+    __tablename__ = "llm_usage"
+
+    id = Column(Integer, primary_key=True, index=True)
+    trace_id = Column(String, nullable=True, index=True)
+    conversation_id = Column(String, nullable=True)
+    workflow = Column(String, nullable=True, index=True)
+    meeting_id = Column(Integer, ForeignKey("meetings.id"), nullable=True)
+    prompt_type = Column(String, nullable=True)  # intent, summary, followup, brief, client_resolution
+    model = Column(String, nullable=True)
+    prompt_tokens = Column(Integer, default=0)
+    completion_tokens = Column(Integer, default=0)
+    latency_ms = Column(Integer, nullable=True)
+    status = Column(String, default="ok")  # ok, error
+    degraded = Column(String, nullable=True)  # e.g. "daily_budget,workflow_budget"
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+
+class PrecomputedBrief(Base):
+    """Meeting brief generated ahead of an upcoming event (see app/agent/brief_scheduler.py)."""
+    __tablename__ = "precomputed_briefs"
+    __table_args__ = (
+        # One brief per event and set of inputs; a new hash means the inputs changed
+        UniqueConstraint("calendar_event_id", "context_hash", name="uq_precomputed_briefs_event_hash"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    calendar_event_id = Column(String, nullable=False, index=True)
+    client_name = Column(String, nullable=True)
+    meeting_start = Column(DateTime, nullable=True, index=True)  # UTC; past briefs are pruned
+    context_hash = Column(String(64), nullable=False)  # SHA-256 of event details, memory and prompt
+    brief = Column(Text)
+    memory_used = Column(JSON, nullable=True)  # Provenance returned with the brief
     created_at = Column(DateTime, default=datetime.utcnow)
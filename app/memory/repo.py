@@ -1,20 +1,130 @@
 """Memory repository - read/write operations only."""
+from sqlalchemy import func, or_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import Optional, List, Dict, Any
+from contextlib import contextmanager
+from functools import partial
+from typing import Optional, List, Dict, Any, Callable
 from datetime import datetime
-from app.memory.models import Meeting, MemoryEntry, Commitment, Interaction
+import logging
+from app.memory.models import Meeting, MemoryEntry, Commitment, Interaction, ActiveMeeting, LLMUsage, PrecomputedBrief
+from app.memory.blobs import get_blob_store
+from app.memory.search import (
+    SEARCH_MODES,
+    entry_document,
+    meeting_documents,
+    memory_index,
+    publish_entry,
+    publish_meeting,
+)
+from app.config import Config
 from app.memory.schemas import MeetingCreate, MeetingUpdate, MemoryEntryCreate, CommitmentCreate
 
+# Conversation key used when the caller does not supply one
+DEFAULT_CONVERSATION_ID = "default"
+
+logger = logging.getLogger(__name__)
+
+# Called with a client name once new memory for that client commits (e.g. the brief scheduler)
+_memory_listeners: List[Callable[[Optional[str]], None]] = []
+
+
+def add_memory_listener(listener: Callable[[Optional[str]], None]) -> None:
+    _memory_listeners.append(listener)
+
+
+def remove_memory_listener(listener: Callable[[Optional[str]], None]) -> None:
+    if listener in _memory_listeners:
+        _memory_listeners.remove(listener)
+
+
+def _notify_memory_listeners(client_name: Optional[str]) -> None:
+    for listener in list(_memory_listeners):
+        try:
+            listener(client_name)
+        except Exception as e:
+            logger.warning(f"Memory listener failed: {e}")
+
+
 class MemoryRepo:
     """Repository for memory operations."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, read_db: Optional[Session] = None):
         self.session = db
+        self.read_session = read_db
+        self._in_unit_of_work = False
+        self._has_written = False
+        # Search index updates and memory listener calls, applied once the writes commit
+        self._pending_index: List[Callable[[], None]] = []
+
+    @property
+    def _read_session(self) -> Session:
+        """
+        Session for read-only lookups.
+        Uses the replica when configured, but sticks to the primary once this
+        repo has written so the request always reads its own writes.
+        """
+        if self.read_session is None or self._has_written:
+            return self.session
+        return self.read_session
+
+    # Unit of work
+    @contextmanager
+    def unit_of_work(self):
+        """
+        Batch every write inside the block into a single transaction.
+        Writes are flushed (so ids are available) and committed once on exit;
+        any exception rolls the whole unit back.
+        """
+        if self._in_unit_of_work:
+            # Nested use joins the outer unit
+            yield self
+            return
+
+        self._in_unit_of_work = True
+        try:
+            yield self
+            self.session.commit()
+            self._apply_pending_index()
+        except Exception:
+            self.session.rollback()
+            self._pending_index.clear()
+            raise
+        finally:
+            self._in_unit_of_work = False
+
+    def _save(self, instance=None, refresh: bool = False, index: Optional[Callable[[], None]] = None) -> None:
+        """
+        Persist pending changes.
+        Flush-only inside a unit of work, commit otherwise. Column defaults are
+        applied client-side, so a refresh is only needed for server defaults.
+        `index` builds the search index update from the flushed row; it is
+        applied after commit.
+        """
+        self._has_written = True
+        if index is not None and Config.MEMORY_SEARCH in SEARCH_MODES:
+            # Snapshot now: attributes expire on commit
+            self.session.flush()
+            self._pending_index.append(index())
+
+        if self._in_unit_of_work:
+            self.session.flush()
+        else:
+            self.session.commit()
+            self._apply_pending_index()
+
+        if refresh and instance is not None:
+            self.session.refresh(instance)
+
+    def _apply_pending_index(self) -> None:
+        pending, self._pending_index = self._pending_index, []
+        for update in pending:
+            update()
 
     # Client resolution operations
     def get_distinct_client_names(self, limit: int = 200):
         rows = (
-            self.session.query(Meeting.client_name)
+            self._read_session.query(Meeting.client_name)
             .filter(Meeting.client_name.isnot(None))
             .filter(Meeting.client_name != "")
             .distinct()
@@ -26,11 +136,14 @@ class MemoryRepo:
 
     # Meeting operations
     def create_meeting(self, meeting_data: MeetingCreate) -> Meeting:
-        """Create a new meeting record."""
-        meeting = Meeting(**meeting_data.dict())
+        """Create a new meeting record. Transcripts are offloaded to the blob store."""
+        data = meeting_data.dict()
+        transcript = data.pop("transcript", None)
+        if transcript:
+            data["transcript_ref"] = get_blob_store().put_text(transcript)
+        meeting = Meeting(**data)
         self.session.add(meeting)
-        self.session.commit()
-        self.session.refresh(meeting)
+        self._save(meeting)
         return meeting
     
     def get_meeting_by_calendar_id(self, calendar_event_id: str) -> Optional[Meeting]:
@@ -73,7 +186,7 @@ class MemoryRepo:
 
     def update_meeting(self, meeting_id: int, update_data: MeetingUpdate) -> Meeting:
         """Update meeting with summary, decisions, action items."""
-        meeting = self.session.query(Meeting).filter(Meeting.id == meeting_id).first()
+        meeting = self.session.get(Meeting, meeting_id)
         if not meeting:
             raise ValueError(f"Meeting {meeting_id} not found")
         
@@ -85,45 +198,59 @@ class MemoryRepo:
             meeting.action_items = update_data.action_items
         
         meeting.updated_at = datetime.utcnow()
-        self.session.commit()
-        self.session.refresh(meeting)
+        self._queue_memory_change(meeting.client_name)
+        self._save(
+            meeting,
+            index=lambda: partial(publish_meeting, meeting.id, meeting_documents(meeting)),
+        )
         return meeting
     
-    def set_active_meeting(self, meeting_id: int) -> None:
+    def set_active_meeting(
+        self,
+        meeting_id: int,
+        conversation_id: str = DEFAULT_CONVERSATION_ID,
+    ) -> None:
         """
-        Persistently marks a meeting as active.
-        Clears any previously active meeting.
+        Persistently marks a meeting as active for a conversation.
+        Replaces the conversation's previous pointer (single-row PK upsert).
         """
-        # Clear existing active meeting(s)
-        self.session.query(Meeting).filter(Meeting.is_active == True).update(
-            {"is_active": False}
-        )
-
-        meeting = self.session.query(Meeting).filter(Meeting.id == meeting_id).first()
-        if meeting:
-            meeting.is_active = True
-            self.session.commit()
+        pointer = self.session.get(ActiveMeeting, conversation_id)
+        if pointer:
+            pointer.meeting_id = meeting_id
+        else:
+            self.session.add(
+                ActiveMeeting(conversation_id=conversation_id, meeting_id=meeting_id)
+            )
+        self._save()
 
-    def get_active_meeting(self) -> Optional[Meeting]:
+    def get_active_meeting(
+        self,
+        conversation_id: str = DEFAULT_CONVERSATION_ID,
+    ) -> Optional[Meeting]:
         """
-        Returns the most recently active meeting.
+        Returns the conversation's active meeting.
         """
         return (
             self.session.query(Meeting)
-            .filter(Meeting.is_active == True)
-            .order_by(Meeting.meeting_date.desc())
+            .join(ActiveMeeting, ActiveMeeting.meeting_id == Meeting.id)
+            .filter(ActiveMeeting.conversation_id == conversation_id)
             .first()
         )
 
     def update_meeting_company(self, meeting_id: int, hubspot_company_id: str):
-        meeting = (
-            self.session.query(Meeting)
-            .filter(Meeting.id == meeting_id)
-            .first()
-        )
+        meeting = self.session.get(Meeting, meeting_id)
         if meeting:
             meeting.hubspot_company_id = hubspot_company_id
-            self.session.commit()
+            self._save()
+
+    def get_meeting_transcript(self, meeting: Meeting) -> Optional[str]:
+        """
+        Resolve a meeting's transcript.
+        Blob reference first; falls back to the legacy inline column.
+        """
+        if meeting.transcript_ref:
+            return get_blob_store().get_text(meeting.transcript_ref)
+        return meeting.transcript
 
     def get_meeting(self, meeting_id: int) -> Optional[Meeting]:
         return (
@@ -140,9 +267,19 @@ class MemoryRepo:
             data["meta_data"] = data.pop("metadata")
         entry = MemoryEntry(**data)
         self.session.add(entry)
-        self.session.commit()
-        self.session.refresh(entry)
+        if _memory_listeners:
+            self._queue_memory_change(self._client_name(entry))
+        self._save(entry, index=lambda: partial(publish_entry, entry_document(entry, self._client_name(entry))))
         return entry
+
+    def _queue_memory_change(self, client_name: Optional[str]) -> None:
+        """Notify memory listeners after commit (a rolled-back write never reaches them)."""
+        if _memory_listeners:
+            self._pending_index.append(partial(_notify_memory_listeners, client_name))
+
+    def _client_name(self, entry: MemoryEntry) -> Optional[str]:
+        meeting = self.session.get(Meeting, entry.meeting_id) if entry.meeting_id else None
+        return meeting.client_name if meeting else None
     
     def get_memory_by_key(self, key: str, limit: int = 10) -> List[MemoryEntry]:
         """Get memory entries by key."""
@@ -152,14 +289,56 @@ class MemoryRepo:
     
     def get_memory_for_client(self, client_name: str) -> List[MemoryEntry]:
         """Get memory entries related to a client."""
-        meetings = self.session.query(Meeting).filter(
+        meeting_ids = self._read_session.query(Meeting.id).filter(
             Meeting.client_name.ilike(f"%{client_name}%")
-        ).all()
-        meeting_ids = [m.id for m in meetings]
-        return self.session.query(MemoryEntry).filter(
-            MemoryEntry.meeting_id.in_(meeting_ids)
+        )
+        return self._read_session.query(MemoryEntry).filter(
+            MemoryEntry.meeting_id.in_(meeting_ids.scalar_subquery())
         ).all()
 
+    def search_memory(
+        self,
+        client_name: str,
+        query: str = "",
+        exclude_meeting_id: Optional[int] = None,
+    ):
+        """
+        Client memory most relevant to `query` within the context token budget
+        (see app/memory/search.py). Returns [(Document, score or None)].
+        """
+        memory_index.sync(self.get_memory_changes)
+        memory_index.ensure_client(client_name, lambda name: self.get_memory_changes(client_name=name))
+        return memory_index.select(client_name, query, exclude_meeting_id=exclude_meeting_id)
+
+    def get_memory_changes(
+        self,
+        entries_created_since: Optional[datetime] = None,
+        meetings_updated_since: Optional[datetime] = None,
+        client_name: Optional[str] = None,
+    ):
+        """
+        Memory entries (with client name) and summarized meetings written since
+        the index sync cursors (see MemoryIndex.sync_cursors); None = all rows.
+        client_name limits both to that client (case-insensitive substring).
+        """
+        entries = (
+            self._read_session.query(MemoryEntry, Meeting.client_name)
+            .outerjoin(Meeting, Meeting.id == MemoryEntry.meeting_id)
+        )
+        if entries_created_since is not None:
+            entries = entries.filter(MemoryEntry.created_at >= entries_created_since)
+
+        meetings = self._read_session.query(Meeting).filter(
+            or_(Meeting.summary.isnot(None), Meeting.decisions.isnot(None))
+        )
+        if meetings_updated_since is not None:
+            meetings = meetings.filter(Meeting.updated_at >= meetings_updated_since)
+
+        if client_name is not None:
+            entries = entries.filter(Meeting.client_name.ilike(f"%{client_name}%"))
+            meetings = meetings.filter(Meeting.client_name.ilike(f"%{client_name}%"))
+        return entries.all(), meetings.all()
+
     def get_recent_meetings_for_client(
         self,
         client_name: str,
@@ -167,7 +346,7 @@ class MemoryRepo:
         limit: int = 3,
     ):
         query = (
-            self.session.query(Meeting)
+            self._read_session.query(Meeting)
             .filter(Meeting.client_name == client_name)
             .order_by(Meeting.meeting_date.desc())
         )
@@ -185,8 +364,7 @@ class MemoryRepo:
         """Create a commitment record."""
         commitment = Commitment(**commitment_data.dict())
         self.session.add(commitment)
-        self.session.commit()
-        self.session.refresh(commitment)
+        self._save(commitment)
         return commitment
     
     def get_commitments_by_meeting(self, meeting_id: int) -> List[Commitment]:
@@ -201,8 +379,7 @@ class MemoryRepo:
         
         commitment.status = status
         commitment.updated_at = datetime.utcnow()
-        self.session.commit()
-        self.session.refresh(commitment)
+        self._save(commitment)
         return commitment
     
     def get_pending_commitments(self, meeting_id: int) -> List[Commitment]:
@@ -234,8 +411,7 @@ class MemoryRepo:
         commitment.status = "created"
         commitment.updated_at = datetime.utcnow()
 
-        self.session.commit()
-        self.session.refresh(commitment)
+        self._save(commitment)
         return commitment
 
     def mark_commitment_failed(self, commitment_id: int) -> Commitment:
@@ -251,8 +427,7 @@ class MemoryRepo:
         commitment.status = "failed"
         commitment.updated_at = datetime.utcnow()
 
-        self.session.commit()
-        self.session.refresh(commitment)
+        self._save(commitment)
         return commitment
 
 
@@ -260,9 +435,11 @@ class MemoryRepo:
 
     # Interaction operations
     def create_interaction(self, user_message: str, intent: str, response: str, 
-                          workflow: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None) -> Interaction:
+                          workflow: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None,
+                          conversation_id: str = DEFAULT_CONVERSATION_ID) -> Interaction:
         """Create an interaction record."""
         interaction = Interaction(
+            conversation_id=conversation_id,
             user_message=user_message,
             intent=intent,
             workflow=workflow,
@@ -270,29 +447,114 @@ class MemoryRepo:
             meta_data=metadata  # Use meta_data to avoid SQLAlchemy reserved name
         )
         self.session.add(interaction)
-        self.session.commit()
-        self.session.refresh(interaction)
+        self._save(interaction)
         return interaction
 
 
-    def get_last_interaction(self) -> Optional[Interaction]:
+    def get_last_interaction(
+        self,
+        conversation_id: str = DEFAULT_CONVERSATION_ID,
+    ) -> Optional[Interaction]:
         """
-        Returns the most recent interaction.
+        Returns the most recent interaction in a conversation.
         """
         return (
-            self.session.query(Interaction)
+            self._read_session.query(Interaction)
+            .filter(Interaction.conversation_id == conversation_id)
             .order_by(Interaction.created_at.desc())
             .first()
         )
 
 
-    def get_recent_interactions(self, limit: int = 3) -> List[Interaction]:
+    def get_recent_interactions(
+        self,
+        limit: int = 3,
+        conversation_id: str = DEFAULT_CONVERSATION_ID,
+    ) -> List[Interaction]:
         """
-        Returns the most recent N interactions.
+        Returns the most recent N interactions in a conversation.
         """
         return (
-            self.session.query(Interaction)
+            self._read_session.query(Interaction)
+            .filter(Interaction.conversation_id == conversation_id)
             .order_by(Interaction.created_at.desc())
             .limit(limit)
             .all()
         )
+
+    # Precomputed brief operations
+    def get_precomputed_brief(self, calendar_event_id: str, context_hash: str) -> Optional[PrecomputedBrief]:
+        return (
+            self._read_session.query(PrecomputedBrief)
+            .filter(
+                PrecomputedBrief.calendar_event_id == calendar_event_id,
+                PrecomputedBrief.context_hash == context_hash,
+            )
+            .first()
+        )
+
+    def save_precomputed_brief(
+        self,
+        *,
+        calendar_event_id: str,
+        client_name: Optional[str],
+        meeting_start: Optional[datetime],
+        context_hash: str,
+        brief: str,
+        memory_used: Optional[Dict[str, Any]] = None,
+    ) -> Optional[PrecomputedBrief]:
+        """
+        Store a brief, replacing the superseded one for the same event and client.
+        If another process stored the same brief first, its row is kept and returned.
+        """
+        row = PrecomputedBrief(
+            calendar_event_id=calendar_event_id,
+            client_name=client_name,
+            meeting_start=meeting_start,
+            context_hash=context_hash,
+            brief=brief,
+            memory_used=memory_used,
+        )
+        try:
+            # Savepoint: losing the race must not roll back the caller's unit of work
+            with self.session.begin_nested():
+                # Evict the replaced row so its reused id can't clash in the identity map
+                self.session.query(PrecomputedBrief).filter(
+                    PrecomputedBrief.calendar_event_id == calendar_event_id,
+                    PrecomputedBrief.client_name == client_name,
+                ).delete(synchronize_session="fetch")
+                self.session.add(row)
+        except IntegrityError:
+            return self.get_precomputed_brief(calendar_event_id, context_hash)
+        self._save(row)
+        return row
+
+    def delete_precomputed_briefs_before(self, cutoff: datetime) -> int:
+        """Drop briefs for meetings that started before `cutoff`."""
+        deleted = (
+            self.session.query(PrecomputedBrief)
+            .filter(PrecomputedBrief.meeting_start < cutoff)
+            .delete(synchronize_session=False)
+        )
+        if deleted:
+            self._save()
+        return deleted
+
+    # LLM usage ledger operations
+    def record_llm_usage(self, records: List[Dict[str, Any]]) -> None:
+        """Persist buffered LLM usage records (see app/llm/ledger.py)."""
+        if not records:
+            return
+        self.session.add_all([LLMUsage(**r) for r in records])
+        self._save()
+
+    def get_llm_tokens_since(self, since: datetime, workflow: Optional[str] = None) -> int:
+        """Total prompt + completion tokens recorded since a point in time."""
+        query = self.session.query(
+            func.coalesce(func.sum(LLMUsage.prompt_tokens + LLMUsage.completion_tokens), 0)
+        ).filter(LLMUsage.created_at >= since)
+
+        if workflow:
+            query = query.filter(LLMUsage.workflow == workflow)
+
+        return int(query.scalar() or 0)
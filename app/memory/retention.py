@@ -0,0 +1,291 @@
+"""Interaction retention - archive old rows to compressed JSONL, keep the hot table small.
+
+Run periodically (cron / Heroku scheduler):
+
+    python -m app.memory.retention --days 90
+
+On Postgres, `interactions` is range-partitioned by month on created_at.
+The job also pre-creates upcoming partitions and drops partitions that
+are fully archived.
+"""
+import argparse
+import gzip
+import json
+import os
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import Config
+from app.memory.models import Interaction
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+PARTITION_PREFIX = "interactions_p"
+DEFAULT_PARTITION = f"{PARTITION_PREFIX}default"
+
+
+def _month_start(d: date) -> date:
+    return date(d.year, d.month, 1)
+
+
+def _add_months(d: date, months: int) -> date:
+    month_index = d.year * 12 + (d.month - 1) + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARTITION_PREFIX}{month.year:04d}{month.month:02d}"
+
+
+def _serialize(interaction: Interaction) -> Dict[str, Any]:
+    return {
+        "id": interaction.id,
+        "conversation_id": interaction.conversation_id,
+        "user_message": interaction.user_message,
+        "intent": interaction.intent,
+        "workflow": interaction.workflow,
+        "response": interaction.response,
+        "metadata": interaction.meta_data,
+        "created_at": interaction.created_at.isoformat() if interaction.created_at else None,
+    }
+
+
+def _write_archive(archive_dir: Path, rows: List[Interaction]) -> None:
+    """
+    Append rows to one gzip JSONL file per month.
+    gzip members concatenate, so appending across runs yields a valid stream.
+    Files are fsync'd before the caller deletes the rows.
+    """
+    by_month: Dict[str, List[Interaction]] = {}
+    for row in rows:
+        created = row.created_at or datetime.utcnow()
+        by_month.setdefault(created.strftime("%Y-%m"), []).append(row)
+
+    archive_dir.mkdir(parents=True, exist_ok=True)
+
+    for month, month_rows in by_month.items():
+        path = archive_dir / f"interactions-{month}.jsonl.gz"
+        with open(path, "ab") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="ab") as gz:
+                for row in month_rows:
+                    gz.write(json.dumps(_serialize(row), default=str).encode("utf-8"))
+                    gz.write(b"\n")
+            raw.flush()
+            os.fsync(raw.fileno())
+
+
+def archive_interactions(
+    session: Session,
+    older_than_days: int = Config.INTERACTION_RETENTION_DAYS,
+    archive_dir: str = Config.INTERACTION_ARCHIVE_DIR,
+    batch_size: int = 1000,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """
+    Move interactions older than the cutoff into compressed JSONL archives.
+    Works in batches of the oldest remaining rows (re-queried after each
+    delete); each batch is archived, then deleted and committed, so the job
+    can be interrupted safely.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    archived = 0
+
+    while True:
+        rows = (
+            session.query(Interaction)
+            .filter(Interaction.created_at < cutoff)
+            .order_by(Interaction.created_at.asc(), Interaction.id.asc())
+            .limit(batch_size)
+            .all()
+        )
+
+        if not rows:
+            break
+
+        if dry_run:
+            archived += session.query(Interaction).filter(Interaction.created_at < cutoff).count()
+            break
+
+        _write_archive(Path(archive_dir), rows)
+
+        ids = [r.id for r in rows]
+        session.query(Interaction).filter(Interaction.id.in_(ids)).delete(
+            synchronize_session=False
+        )
+        session.commit()
+        archived += len(rows)
+
+        if len(rows) < batch_size:
+            break
+
+    logger.info(
+        f"[RETENTION] archived={archived} cutoff={cutoff.isoformat()} dry_run={dry_run}"
+    )
+    return {"archived": archived, "cutoff": cutoff.isoformat(), "dry_run": dry_run}
+
+
+# -------------------------------------------------
+# Postgres partition maintenance
+# -------------------------------------------------
+
+def _is_partitioned(session: Session) -> bool:
+    if session.get_bind().dialect.name != "postgresql":
+        return False
+    return bool(
+        session.execute(
+            text(
+                "SELECT 1 FROM pg_partitioned_table pt "
+                "JOIN pg_class c ON c.oid = pt.partrelid "
+                "WHERE c.relname = 'interactions'"
+            )
+        ).scalar()
+    )
+
+
+def ensure_interaction_partitions(
+    session: Session,
+    months_ahead: int = Config.INTERACTION_PARTITION_MONTHS_AHEAD,
+) -> List[str]:
+    """
+    Create monthly partitions from the current month through months_ahead.
+
+    Postgres refuses to create a partition while the DEFAULT partition holds
+    rows in its range (the job ran late). Those rows are moved: the default
+    partition is detached, the new partition created and filled from it, and
+    the default re-attached, all in one transaction.
+    """
+    if not _is_partitioned(session):
+        return []
+
+    created = []
+    current = _month_start(datetime.utcnow().date())
+
+    for offset in range(months_ahead + 1):
+        start = _add_months(current, offset)
+        end = _add_months(start, 1)
+        name = partition_name(start)
+        created.append(name)
+        if session.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar():
+            continue
+
+        bounds = {"start": start, "end": end}
+        in_range = "created_at >= :start AND created_at < :end"
+        stranded = session.execute(
+            text(f"SELECT count(*) FROM {DEFAULT_PARTITION} WHERE {in_range}"), bounds
+        ).scalar()
+
+        if stranded:
+            logger.warning(
+                f"[RETENTION] {stranded} rows for {name} landed in {DEFAULT_PARTITION}; "
+                "moving them (partition maintenance is running late)"
+            )
+            session.execute(text(f"ALTER TABLE interactions DETACH PARTITION {DEFAULT_PARTITION}"))
+
+        session.execute(
+            text(
+                f"CREATE TABLE {name} PARTITION OF interactions "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            )
+        )
+
+        if stranded:
+            session.execute(text(f"INSERT INTO {name} SELECT * FROM {DEFAULT_PARTITION} WHERE {in_range}"), bounds)
+            session.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_range}"), bounds)
+            session.execute(text(f"ALTER TABLE interactions ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+
+        session.commit()
+
+    return created
+
+
+def drop_archived_partitions(session: Session, older_than_days: int) -> List[str]:
+    """
+    Drop monthly partitions that end before the retention cutoff and are empty
+    (i.e. already archived). Dropping a partition is O(1), unlike DELETE.
+    """
+    if not _is_partitioned(session):
+        return []
+
+    cutoff = (datetime.utcnow() - timedelta(days=older_than_days)).date()
+    names = session.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = 'interactions' AND c.relname LIKE :prefix"
+        ),
+        {"prefix": f"{PARTITION_PREFIX}%"},
+    ).scalars().all()
+
+    dropped = []
+    for name in names:
+        suffix = name[len(PARTITION_PREFIX):]
+        if not suffix.isdigit():
+            continue  # e.g. the default partition
+
+        month = date(int(suffix[:4]), int(suffix[4:6]), 1)
+        if _add_months(month, 1) > cutoff:
+            continue
+
+        has_rows = session.execute(text(f"SELECT 1 FROM {name} LIMIT 1")).scalar()
+        if has_rows:
+            continue
+
+        session.execute(text(f"DROP TABLE {name}"))
+        dropped.append(name)
+
+    session.commit()
+    return dropped
+
+
+def run_retention(
+    session: Session,
+    older_than_days: int = Config.INTERACTION_RETENTION_DAYS,
+    archive_dir: str = Config.INTERACTION_ARCHIVE_DIR,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """Full retention pass: archive, then partition maintenance (Postgres)."""
+    result = archive_interactions(
+        session,
+        older_than_days=older_than_days,
+        archive_dir=archive_dir,
+        dry_run=dry_run,
+    )
+
+    if not dry_run:
+        result["partitions_ensured"] = ensure_interaction_partitions(session)
+        result["partitions_dropped"] = drop_archived_partitions(session, older_than_days)
+
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from app.db.session import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Archive and prune old interactions.")
+    parser.add_argument("--days", type=int, default=Config.INTERACTION_RETENTION_DAYS)
+    parser.add_argument("--archive-dir", default=Config.INTERACTION_ARCHIVE_DIR)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        result = run_retention(
+            db,
+            older_than_days=args.days,
+            archive_dir=args.archive_dir,
+            dry_run=args.dry_run,
+        )
+        print(json.dumps(result, indent=2))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
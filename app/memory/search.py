@@ -0,0 +1,472 @@
+"""Lexical (BM25) retrieval over client memory.
+
+An in-process inverted index over:
+
+    m:<entry_id>         MemoryEntry.value
+    s:<meeting_id>       Meeting.summary
+    d:<meeting_id>:<n>   each of Meeting.decisions
+
+MemoryRepo stages index updates for memory entries and meeting summaries /
+decisions it writes and applies them once the transaction commits (a rollback
+discards them). The index is built lazily per client: the first search for
+a client loads only that client's rows, so a fresh worker never reads the
+whole memory table on the request path. Rows written by other workers are
+picked up every MEMORY_INDEX_SYNC_SECONDS by created_at / updated_at cursors
+(started when the index is first used) that re-read a trailing
+MEMORY_INDEX_SYNC_OVERLAP_SECONDS window, so rows that commit out of order
+are not skipped. Database reads happen outside the index lock.
+
+select() returns the documents for a client that best match the query text
+(the transcript, the meeting being followed up, the upcoming event) within
+MEMORY_CONTEXT_TOKEN_BUDGET. With MEMORY_SEARCH=hybrid the BM25 ranking is
+fused with embedding similarity from the vector store (app/memory/vectors.py).
+Vector updates are embedded on a background worker, off the request path,
+and their embedding calls are written to the LLM ledger under the request's
+trace id once they finish. Without a query or without any match
+it falls back to key priority, then recency.
+"""
+import math
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.config import Config
+from app.llm import ledger
+from app.llm.ledger import estimate_tokens
+from app.runtime.diagnostics import get_diagnostics
+
+diag = get_diagnostics("memory")
+
+# BM25 parameters (standard defaults)
+_K1 = 1.2
+_B = 0.75
+
+# Highest-IDF query terms kept; a whole transcript would otherwise touch every posting list
+_MAX_QUERY_TERMS = 64
+
+# Reciprocal rank fusion constant (MEMORY_SEARCH=hybrid)
+_RRF_K = 60
+
+# MEMORY_SEARCH values that use this module; "hybrid" adds app/memory/vectors.py
+SEARCH_MODES = ("bm25", "hybrid")
+
+# Fallback ranking when nothing matches
+PRIORITY_ORDER = {
+    "decision": 0,
+    "action_item": 1,
+    "meeting_summary": 2,
+    "note": 3,
+}
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:['\-][a-z0-9]+)*")
+_STOPWORDS = frozenset(
+    """
+    a about above after again all also am an and any are as at be because been before being
+    below between both but by can could did do does doing down during each few for from further
+    had has have having he her here hers him his how i if in into is it its itself just let me
+    more most my no nor not now of off on once only or other our ours out over own same she
+    should so some such than that the their theirs them then there these they this those through
+    to too under until up very was we were what when where which while who whom why will with
+    would you your yours yeah okay um uh going get got think know really like well thing things
+    """.split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN.findall(text.lower()) if len(t) > 1 and t not in _STOPWORDS]
+
+
+class Document:
+    __slots__ = ("doc_id", "client", "meeting_id", "key", "text", "created_at", "length")
+
+    def __init__(self, doc_id: str, client: Optional[str], meeting_id: Optional[int],
+                 key: str, text: str, created_at: Optional[datetime]):
+        self.doc_id = doc_id
+        self.client = (client or "").lower()
+        self.meeting_id = meeting_id
+        self.key = key
+        self.text = text
+        self.created_at = created_at
+        self.length = 0
+
+
+def entry_document(entry, client_name: Optional[str]) -> Optional[Document]:
+    if not entry.value:
+        return None
+    return Document(f"m:{entry.id}", client_name, entry.meeting_id, entry.key, entry.value, entry.created_at)
+
+
+def meeting_documents(meeting) -> List[Document]:
+    """Summary and one document per decision; replaces whatever the meeting had before."""
+    created_at = meeting.updated_at or meeting.created_at
+    docs = []
+    if meeting.summary:
+        docs.append(Document(f"s:{meeting.id}", meeting.client_name, meeting.id,
+                             "meeting_summary", meeting.summary, created_at))
+    decisions = [d for d in meeting.decisions or [] if isinstance(d, str) and d.strip()]
+    for n, decision in enumerate(decisions):
+        docs.append(Document(f"d:{meeting.id}:{n}", meeting.client_name, meeting.id,
+                             "decision", decision, created_at))
+    return docs
+
+
+class MemoryIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._docs: Dict[str, Document] = {}
+            self._postings: Dict[str, Dict[str, int]] = {}
+            self._by_client: Dict[str, Set[str]] = {}
+            self._by_meeting: Dict[int, Set[str]] = {}
+            self._total_length = 0
+            # Lowercased client names whose rows have been loaded
+            self._loaded_clients: Set[str] = set()
+            # Sync cursors: newest row timestamps seen (None = never used)
+            self._synced_at: Optional[float] = None
+            self._entries_created_at: Optional[datetime] = None
+            self._meetings_updated_at: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    # Writes
+    def _remove(self, doc_id: str) -> None:
+        doc = self._docs.pop(doc_id, None)
+        if doc is None:
+            return
+        for term in set(tokenize(doc.text)):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= doc.length
+        self._by_client.get(doc.client, set()).discard(doc_id)
+        if doc.meeting_id is not None:
+            self._by_meeting.get(doc.meeting_id, set()).discard(doc_id)
+
+    def _add(self, doc: Document) -> None:
+        self._remove(doc.doc_id)
+        terms = Counter(tokenize(doc.text))
+        doc.length = sum(terms.values())
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[doc.doc_id] = tf
+        self._docs[doc.doc_id] = doc
+        self._total_length += doc.length
+        self._by_client.setdefault(doc.client, set()).add(doc.doc_id)
+        if doc.meeting_id is not None:
+            self._by_meeting.setdefault(doc.meeting_id, set()).add(doc.doc_id)
+
+    def add(self, doc: Optional[Document]) -> None:
+        if doc is None:
+            return
+        with self._lock:
+            self._add(doc)
+
+    def replace_meeting(self, meeting_id: int, docs: Iterable[Document]) -> None:
+        """Swap a meeting's summary / decision documents (memory entries are kept)."""
+        with self._lock:
+            for doc_id in list(self._by_meeting.get(meeting_id, ())):
+                if not doc_id.startswith("m:"):
+                    self._remove(doc_id)
+            for doc in docs:
+                self._add(doc)
+
+    # Sync
+    def needs_sync(self) -> bool:
+        if self._synced_at is None:
+            return True
+        interval = Config.MEMORY_INDEX_SYNC_SECONDS
+        return interval > 0 and time.monotonic() - self._synced_at > interval
+
+    def sync_cursors(self) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """
+        (entries_created_since, meetings_updated_since) for the next sync. Each
+        cursor trails the newest timestamp seen by MEMORY_INDEX_SYNC_OVERLAP_SECONDS:
+        ids and timestamps are assigned before commit, so on a shared database
+        a row can become visible after newer ones. Re-reading the window is
+        harmless (documents are replaced by id).
+        """
+        overlap = timedelta(seconds=Config.MEMORY_INDEX_SYNC_OVERLAP_SECONDS)
+        return tuple(
+            None if seen is None else seen - overlap
+            for seen in (self._entries_created_at, self._meetings_updated_at)
+        )
+
+    def claim_sync(self) -> Optional[Tuple[Optional[datetime], Optional[datetime]]]:
+        """
+        Cursors to load changes from when a sync is due, else None. The first
+        call only starts the cursors (history is loaded per client); a claimed
+        sync is not handed to concurrent callers.
+        """
+        with self._lock:
+            if not self.needs_sync():
+                return None
+            first = self._synced_at is None
+            self._synced_at = time.monotonic()
+            if first:
+                self._entries_created_at = self._meetings_updated_at = datetime.utcnow()
+                return None
+            return self.sync_cursors()
+
+    def sync(self, load_changes: Callable[[Optional[datetime], Optional[datetime]], Tuple[list, list]]) -> None:
+        """
+        Pull rows written since the last sync.
+        load_changes(entries_created_since, meetings_updated_since) returns
+        ([(MemoryEntry, client_name)], [Meeting]).
+        """
+        cursors = self.claim_sync()
+        if cursors is not None:
+            self.apply_changes(*load_changes(*cursors))
+
+    def _is_loaded(self, client_name: Optional[str]) -> bool:
+        # Rows loaded for "acme" include every client "acme corp" matches
+        name = (client_name or "").lower()
+        return any(loaded in name for loaded in self._loaded_clients)
+
+    def needs_client(self, client_name: str) -> bool:
+        with self._lock:
+            return not self._is_loaded(client_name)
+
+    def ensure_client(self, client_name: str, load_client: Callable[[str], Tuple[list, list]]) -> None:
+        """
+        Load a client's rows on its first search. load_client(client_name)
+        returns ([(MemoryEntry, client_name)], [Meeting]) like load_changes,
+        using the same case-insensitive substring match as select().
+        """
+        if self.needs_client(client_name):
+            self.apply_client(client_name, *load_client(client_name))
+
+    def apply_client(self, client_name: str, entries: list, meetings: list) -> None:
+        """Index a client's rows (see ensure_client); sync cursors are left alone."""
+        self.apply_changes(entries, meetings, advance_cursors=False)
+        with self._lock:
+            self._loaded_clients.add((client_name or "").lower())
+        diag.debug("Memory index loaded client %r: %s entries, %s meetings", client_name, len(entries), len(meetings))
+
+    def apply_changes(self, entries: list, meetings: list, advance_cursors: bool = True) -> None:
+        """
+        Index rows returned by a sync or a client load. A sync skips clients
+        not loaded yet: their first search loads all their rows anyway.
+        """
+        with self._lock:
+            for entry, client_name in entries:
+                if advance_cursors and not self._is_loaded(client_name):
+                    continue
+                self.add(entry_document(entry, client_name))
+                if advance_cursors and entry.created_at and (
+                    self._entries_created_at is None or entry.created_at > self._entries_created_at
+                ):
+                    self._entries_created_at = entry.created_at
+            for meeting in meetings:
+                wanted = not advance_cursors or self._is_loaded(meeting.client_name)
+                # Loads run outside the lock: never replace a newer version indexed meanwhile
+                if wanted and not self._indexed_newer(meeting.id, meeting.updated_at or meeting.created_at):
+                    self.replace_meeting(meeting.id, meeting_documents(meeting))
+                if advance_cursors and meeting.updated_at and (
+                    self._meetings_updated_at is None or meeting.updated_at > self._meetings_updated_at
+                ):
+                    self._meetings_updated_at = meeting.updated_at
+
+    def _indexed_newer(self, meeting_id: int, updated_at: Optional[datetime]) -> bool:
+        if updated_at is None:
+            return False
+        return any(
+            not doc_id.startswith("m:") and self._docs[doc_id].created_at and self._docs[doc_id].created_at > updated_at
+            for doc_id in self._by_meeting.get(meeting_id, ())
+        )
+
+    # Reads
+    def _client_docs(self, client_name: str) -> Set[str]:
+        # Same matching as MemoryRepo.get_memory_for_client (case-insensitive substring)
+        needle = (client_name or "").lower()
+        matched: Set[str] = set()
+        for client, doc_ids in self._by_client.items():
+            if needle in client:
+                matched |= doc_ids
+        return matched
+
+    def _query_terms(self, query: str) -> List[Tuple[str, float]]:
+        n_docs = len(self._docs)
+        weighted = []
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if postings:
+                df = len(postings)
+                weighted.append((term, math.log(1 + (n_docs - df + 0.5) / (df + 0.5))))
+        weighted.sort(key=lambda item: item[1], reverse=True)
+        return weighted[:_MAX_QUERY_TERMS]
+
+    def score(self, candidates: Set[str], query: str) -> Dict[str, float]:
+        """BM25 score for every candidate that shares a term with the query."""
+        scores: Dict[str, float] = {}
+        if not candidates or not self._docs:
+            return scores
+        avgdl = self._total_length / len(self._docs) or 1.0
+        for term, idf in self._query_terms(query):
+            postings = self._postings[term]
+            # Walk whichever side is shorter: common terms have long posting lists
+            if len(postings) > len(candidates):
+                matches = ((doc_id, postings[doc_id]) for doc_id in candidates if doc_id in postings)
+            else:
+                matches = ((doc_id, tf) for doc_id, tf in postings.items() if doc_id in candidates)
+            for doc_id, tf in matches:
+                norm = _K1 * (1 - _B + _B * self._docs[doc_id].length / avgdl)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (_K1 + 1) / (tf + norm)
+        return scores
+
+    def select(
+        self,
+        client_name: str,
+        query: str = "",
+        *,
+        exclude_meeting_id: Optional[int] = None,
+        token_budget: Optional[int] = None,
+        max_entries: Optional[int] = None,
+    ) -> List[Tuple[Document, Optional[float]]]:
+        """
+        Documents for prompt context, best first: (document, relevance score or
+        None for the priority / recency fallback). The score is BM25, or the
+        reciprocal rank fusion of BM25 and embedding similarity with
+        MEMORY_SEARCH=hybrid. Near-identical texts (a summary memory entry and
+        the meeting's own summary) are kept once.
+        """
+        token_budget = Config.MEMORY_CONTEXT_TOKEN_BUDGET if token_budget is None else token_budget
+        max_entries = Config.MEMORY_CONTEXT_MAX_ENTRIES if max_entries is None else max_entries
+
+        with self._lock:
+            candidates = {
+                doc_id: self._docs[doc_id] for doc_id in self._client_docs(client_name)
+                if exclude_meeting_id is None or self._docs[doc_id].meeting_id != exclude_meeting_id
+            }
+            scores = self.score(set(candidates), query) if query else {}
+
+        if query and candidates and Config.MEMORY_SEARCH == "hybrid":
+            scores = _fuse(scores, _semantic_scores(query, candidates, max_entries * 4))
+
+        if scores:
+            ranked = sorted(scores, key=lambda doc_id: (-scores[doc_id], doc_id))
+        else:
+            ranked = sorted(candidates, key=lambda doc_id: _fallback_rank(candidates[doc_id]))
+        docs = [candidates[doc_id] for doc_id in ranked]
+
+        selected: List[Tuple[Document, Optional[float]]] = []
+        seen: Set[str] = set()
+        used_tokens = 0
+        for doc in docs:
+            if len(selected) >= max_entries:
+                break
+            fingerprint = " ".join(tokenize(doc.text)[:40])
+            if fingerprint in seen:
+                continue
+            cost = estimate_tokens(f"{doc.key}: {doc.text}")
+            if token_budget > 0 and used_tokens + cost > token_budget:
+                continue
+            seen.add(fingerprint)
+            used_tokens += cost
+            selected.append((doc, scores.get(doc.doc_id)))
+        return selected
+
+
+def _semantic_scores(query: str, candidates: Dict[str, Document], k: int) -> Dict[str, float]:
+    from app.memory import vectors
+
+    try:
+        return vectors.semantic_scores(query, candidates, k)
+    except Exception as e:
+        # Embedding provider down: lexical ranking alone still works
+        diag.warning("Semantic memory search failed, using BM25 only: %s", e)
+        return {}
+
+
+def _fuse(*rankings: Dict[str, float]) -> Dict[str, float]:
+    """Reciprocal rank fusion: scale-free, so BM25 and cosine scores combine without tuning."""
+    fused: Dict[str, float] = {}
+    for scores in rankings:
+        for rank, doc_id in enumerate(sorted(scores, key=lambda d: (-scores[d], d))):
+            fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (_RRF_K + rank + 1)
+    return fused
+
+
+def _fallback_rank(doc: Document) -> Tuple[int, float, str]:
+    recency = -(doc.created_at.timestamp() if doc.created_at else 0)
+    return PRIORITY_ORDER.get(doc.key, 99), recency, doc.doc_id
+
+
+memory_index = MemoryIndex()
+
+
+def publish_entry(doc: Optional[Document]) -> None:
+    """Apply a committed memory entry to the lexical index (and the vector store when hybrid)."""
+    memory_index.add(doc)
+    if doc is not None and Config.MEMORY_SEARCH == "hybrid":
+        _publish_vectors(lambda vectors: vectors.index_documents([doc]))
+
+
+def publish_meeting(meeting_id: int, docs: List[Document]) -> None:
+    """Apply a committed meeting summary / decisions update."""
+    memory_index.replace_meeting(meeting_id, docs)
+    if Config.MEMORY_SEARCH == "hybrid":
+        _publish_vectors(lambda vectors: vectors.replace_meeting(meeting_id, docs))
+
+
+_vector_executor: Optional[ThreadPoolExecutor] = None
+_vector_executor_lock = threading.Lock()
+
+
+def _get_vector_executor() -> ThreadPoolExecutor:
+    global _vector_executor
+    if _vector_executor is None:
+        with _vector_executor_lock:
+            if _vector_executor is None:
+                # One worker: updates to the same meeting apply in commit order
+                _vector_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memory-vectors")
+    return _vector_executor
+
+
+def _publish_vectors(update: Callable) -> Future:
+    """Embed and store in the background; the request does not wait on the embedding call."""
+    return _get_vector_executor().submit(_apply_vectors, update, ledger.current())
+
+
+def _apply_vectors(update: Callable, parent: Optional[ledger.LedgerContext]) -> None:
+    from app.memory import vectors
+
+    # Own ledger buffer tagged like the request that wrote the rows
+    ledger.begin(
+        trace_id=parent.trace_id if parent else None,
+        conversation_id=parent.conversation_id if parent else None,
+    )
+    if parent is not None:
+        ledger.set_workflow(parent.workflow)
+        ledger.set_meeting(parent.meeting_id)
+    try:
+        update(vectors)
+    except Exception as e:
+        # The rows are committed; `python -m app.memory.vectors --backfill` embeds what was missed
+        diag.warning("Vector store update failed: %s", e)
+    finally:
+        _persist_usage(ledger.drain())
+
+
+def _persist_usage(records: List[Dict]) -> None:
+    if not records:
+        return
+    from app.db.session import SessionLocal
+    from app.memory.repo import MemoryRepo
+
+    db = SessionLocal()
+    try:
+        MemoryRepo(db).record_llm_usage(records)
+    except Exception as e:
+        db.rollback()
+        diag.warning("Failed to persist %s embedding usage records: %s", len(records), e)
+    finally:
+        db.close()
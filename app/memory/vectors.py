@@ -0,0 +1,346 @@
+"""Vector memory store - float32 embeddings in a memory-mapped NumPy matrix.
+
+Layout under MEMORY_VECTOR_PATH:
+
+    meta.json     {"dim": ...}
+    vectors.f32   (capacity, dim) float32 rows, memory-mapped, capacity doubles as it fills
+    ids.log       append-only id map: "row<TAB>doc_id" assigns a row,
+                  "row<TAB>" frees it (the row is zeroed and reused)
+
+Document ids match the lexical index (app/memory/search.py): m:<entry_id>,
+s:<meeting_id>, d:<meeting_id>:<n>. Writers hold an exclusive file lock.
+Readers replay new ids.log lines before each search, so vectors written by
+other workers show up without a reload.
+
+search() scores a batch of query vectors against every row, or only the
+given ids, with one matrix product per chunk and keeps the top k with
+np.argpartition.
+
+Existing memory is embedded with:
+
+    python -m app.memory.vectors --backfill
+"""
+import argparse
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from app.config import Config
+from app.llm.embeddings import embed_texts
+from app.runtime.diagnostics import get_diagnostics
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process use only
+    fcntl = None
+
+diag = get_diagnostics("memory")
+
+# Rows scored per matrix product in a full scan (bounds the score buffer)
+_CHUNK_ROWS = 65536
+_MIN_CAPACITY = 1024
+
+Hits = List[Tuple[str, float]]
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Column indices of the k best scores per row, best first."""
+    if k >= scores.shape[1]:
+        return np.argsort(-scores, axis=1)
+    part = np.argpartition(scores, -k, axis=1)[:, -k:]
+    order = np.argsort(-np.take_along_axis(scores, part, axis=1), axis=1)
+    return np.take_along_axis(part, order, axis=1)
+
+
+class VectorStore:
+    def __init__(self, root: str, dim: Optional[int] = None):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._meta_path = self.root / "meta.json"
+        self._matrix_path = self.root / "vectors.f32"
+        self._log_path = self.root / "ids.log"
+        self._lock_path = self.root / ".lock"
+        self._lock = threading.RLock()
+
+        self.dim = dim
+        self._read_meta()
+
+        self._matrix: Optional[np.memmap] = None
+        self._capacity = 0
+        self._ids: Dict[str, int] = {}
+        self._row_ids: List[Optional[str]] = []
+        self._free: Set[int] = set()
+        self._log_offset = 0
+        self._refresh()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._ids)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._ids
+
+    # Id map / file handling
+    @contextmanager
+    def _file_lock(self):
+        with open(self._lock_path, "a") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _apply(self, line: str) -> None:
+        row_text, _, doc_id = line.partition("\t")
+        row = int(row_text)
+        if row >= len(self._row_ids):
+            self._free.update(range(len(self._row_ids), row))
+            self._row_ids.extend([None] * (row + 1 - len(self._row_ids)))
+
+        previous = self._row_ids[row]
+        if previous is not None:
+            self._ids.pop(previous, None)
+        if doc_id:
+            self._ids[doc_id] = row
+            self._row_ids[row] = doc_id
+            self._free.discard(row)
+        else:
+            self._row_ids[row] = None
+            self._free.add(row)
+
+    def _refresh(self) -> None:
+        """Replay id map lines appended since the last read and remap a grown matrix."""
+        if self._log_path.exists() and self._log_path.stat().st_size > self._log_offset:
+            with open(self._log_path, "rb") as f:
+                f.seek(self._log_offset)
+                data = f.read()
+            complete = data[: data.rfind(b"\n") + 1]  # a writer may be mid-line
+            for line in complete.decode("utf-8").splitlines():
+                self._apply(line)
+            self._log_offset += len(complete)
+        self._map()
+
+    def _read_meta(self) -> None:
+        if not self._meta_path.exists():
+            return
+        stored = json.loads(self._meta_path.read_text())["dim"]
+        if self.dim is not None and self.dim != stored:
+            raise RuntimeError(f"❌ Vector store {self.root} holds {stored}-dimensional vectors, not {self.dim}")
+        self.dim = stored
+
+    def _map(self) -> None:
+        if self.dim is None:
+            # Another process may have created the store since
+            self._read_meta()
+        if self.dim is None or not self._matrix_path.exists():
+            return
+        capacity = self._matrix_path.stat().st_size // (self.dim * 4)
+        if capacity and capacity != self._capacity:
+            self._matrix = np.memmap(self._matrix_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+            self._capacity = capacity
+
+    def _ensure_capacity(self, rows: int, dim: int) -> None:
+        if self.dim is None:
+            self.dim = dim
+            self._meta_path.write_text(json.dumps({"dim": dim}))
+        elif dim != self.dim:
+            raise RuntimeError(f"❌ Vector store {self.root} holds {self.dim}-dimensional vectors, not {dim}")
+
+        if rows <= self._capacity:
+            return
+        capacity = max(self._capacity, _MIN_CAPACITY)
+        while capacity < rows:
+            capacity *= 2
+        if self._matrix is not None:
+            self._matrix.flush()
+        self._matrix_path.touch()
+        os.truncate(self._matrix_path, capacity * self.dim * 4)  # sparse zero fill
+        self._map()
+
+    # Writes
+    def upsert(self, ids: Sequence[str], vectors: np.ndarray) -> None:
+        """Store vectors (one row per id); existing ids are overwritten in place."""
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(ids), -1)
+        if not len(ids):
+            return
+
+        with self._lock, self._file_lock():
+            self._refresh()
+            free = sorted(self._free)
+            next_row = len(self._row_ids)
+            assigned: Dict[str, int] = {}
+            for doc_id in ids:
+                if doc_id in assigned:
+                    continue
+                row = self._ids.get(doc_id)
+                if row is None:
+                    if free:
+                        row = free.pop(0)
+                    else:
+                        row, next_row = next_row, next_row + 1
+                assigned[doc_id] = row
+
+            self._ensure_capacity(next_row, vectors.shape[1])
+            # Last vector wins for an id given twice
+            positions = {doc_id: i for i, doc_id in enumerate(ids)}
+            rows = np.fromiter(assigned.values(), dtype=np.int64, count=len(assigned))
+            self._matrix[rows] = vectors[[positions[doc_id] for doc_id in assigned]]
+            self._matrix.flush()
+
+            # Rows are written before their ids, so readers never see an id without its vector
+            with open(self._log_path, "a", encoding="utf-8") as log:
+                log.write("".join(f"{row}\t{doc_id}\n" for doc_id, row in assigned.items()))
+            self._refresh()
+
+    def remove(self, ids: Iterable[str]) -> None:
+        with self._lock, self._file_lock():
+            self._refresh()
+            rows = [self._ids[doc_id] for doc_id in set(ids) if doc_id in self._ids]
+            if not rows:
+                return
+            self._matrix[rows] = 0.0
+            self._matrix.flush()
+            with open(self._log_path, "a", encoding="utf-8") as log:
+                log.write("".join(f"{row}\t\n" for row in rows))
+            self._refresh()
+
+    # Reads
+    def search(self, queries: np.ndarray, k: int = 10, ids: Optional[Iterable[str]] = None) -> List[Hits]:
+        """
+        Top-k (doc_id, cosine similarity) per query vector, best first.
+        `ids` restricts the search to those documents (e.g. one client's memory).
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        if queries.ndim == 1:
+            queries = queries[None, :]
+
+        with self._lock:
+            self._refresh()
+            if self._matrix is None or not self._ids or k <= 0:
+                return [[] for _ in range(len(queries))]
+
+            if ids is not None:
+                rows = np.fromiter((self._ids[i] for i in ids if i in self._ids), dtype=np.int64)
+                if not rows.size:
+                    return [[] for _ in range(len(queries))]
+                scores = queries @ self._matrix[rows].T
+                top = _top_k(scores, k)
+                return [
+                    [(self._row_ids[rows[j]], float(scores[q, j])) for j in top[q]]
+                    for q in range(len(queries))
+                ]
+
+            # Freed rows are zero vectors; fetch enough extra to drop them afterwards
+            count = len(self._row_ids)
+            wanted = k + len(self._free)
+            best_rows = np.empty((len(queries), 0), dtype=np.int64)
+            best_scores = np.empty((len(queries), 0), dtype=np.float32)
+            for start in range(0, count, _CHUNK_ROWS):
+                # One matrix product per chunk for the whole query batch
+                scores = queries @ self._matrix[start:min(start + _CHUNK_ROWS, count)].T
+                top = _top_k(scores, wanted)
+                best_rows = np.concatenate([best_rows, top + start], axis=1)
+                best_scores = np.concatenate([best_scores, np.take_along_axis(scores, top, axis=1)], axis=1)
+                keep = _top_k(best_scores, wanted)
+                best_rows = np.take_along_axis(best_rows, keep, axis=1)
+                best_scores = np.take_along_axis(best_scores, keep, axis=1)
+
+            results = []
+            for q in range(len(queries)):
+                hits = [
+                    (self._row_ids[row], float(score))
+                    for row, score in zip(best_rows[q], best_scores[q])
+                    if self._row_ids[row] is not None
+                ]
+                results.append(hits[:k])
+            return results
+
+
+# ---- Public accessors used by the rest of the app ----
+
+_store: Optional[VectorStore] = None
+_store_lock = threading.Lock()
+
+
+def get_vector_store() -> VectorStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = VectorStore(Config.MEMORY_VECTOR_PATH)
+    return _store
+
+
+def index_documents(docs: Sequence) -> None:
+    """Embed and store search documents (anything with .doc_id and .text)."""
+    docs = [doc for doc in docs if doc is not None and doc.text]
+    if docs:
+        get_vector_store().upsert([doc.doc_id for doc in docs], embed_texts([doc.text for doc in docs]))
+
+
+def replace_meeting(meeting_id: int, docs: Sequence) -> None:
+    """Store a meeting's summary / decision vectors and drop the ones it no longer has."""
+    store = get_vector_store()
+    index_documents(docs)
+
+    current = {doc.doc_id for doc in docs}
+    stale = [] if f"s:{meeting_id}" in current else [f"s:{meeting_id}"]
+    # Decision ids are numbered from 0 without gaps
+    n = sum(1 for doc_id in current if doc_id.startswith("d:"))
+    while f"d:{meeting_id}:{n}" in store:
+        stale.append(f"d:{meeting_id}:{n}")
+        n += 1
+    store.remove(stale)
+
+
+def semantic_scores(query: str, doc_ids: Iterable[str], k: int) -> Dict[str, float]:
+    """Cosine similarity of the k documents (among doc_ids) closest to the query."""
+    vector = embed_texts([query], task="query")
+    return dict(get_vector_store().search(vector, k=k, ids=doc_ids)[0])
+
+
+def backfill(batch_size: int = 100) -> Dict[str, int]:
+    """Embed every memory entry, summary and decision that has no vector yet."""
+    from app.db.session import SessionLocal
+    from app.memory.repo import MemoryRepo
+    from app.memory.search import entry_document, meeting_documents
+
+    db = SessionLocal()
+    try:
+        entries, meetings = MemoryRepo(db).get_memory_changes()
+        docs = [entry_document(entry, client_name) for entry, client_name in entries]
+        docs += [doc for meeting in meetings for doc in meeting_documents(meeting)]
+    finally:
+        db.close()
+
+    store = get_vector_store()
+    missing = [doc for doc in docs if doc is not None and doc.doc_id not in store]
+    for start in range(0, len(missing), batch_size):
+        index_documents(missing[start:start + batch_size])
+    diag.info("Vector backfill: %s documents, %s embedded", len(docs), len(missing))
+    return {"documents": len(docs), "embedded": len(missing), "stored": len(store)}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Maintain the vector memory store.")
+    parser.add_argument("--backfill", action="store_true", help="Embed memory that has no vector yet")
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    if args.backfill:
+        print(json.dumps(backfill(args.batch_size), indent=2))
+    else:
+        store = get_vector_store()
+        print(json.dumps({"path": str(store.root), "dim": store.dim, "stored": len(store)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
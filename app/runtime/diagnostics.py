@@ -0,0 +1,170 @@
+"""Leveled, sampled diagnostics for request tracing.
+
+    from app.runtime.diagnostics import get_diagnostics
+    diag = get_diagnostics("calendar")
+
+    diag.debug("events returned: %s", len(events))   # formatted only if emitted
+    if diag.is_enabled(DEBUG):                       # guard expensive dumps
+        ...
+
+Configuration (env):
+    DIAGNOSTICS_LEVEL         default level for every subsystem (WARNING)
+    DIAGNOSTICS_LEVELS        per-subsystem overrides, e.g. "calendar=DEBUG,intents=INFO"
+    DIAGNOSTICS_SAMPLE_RATE   fraction of traces whose sub-WARNING diagnostics are emitted
+    DIAGNOSTICS_SAMPLE_RATES  per-subsystem overrides, e.g. "calendar=0.05"
+
+Every line is prefixed with the current "[TRACE id]" set by start_trace(),
+the same convention Orchestrator.log_trace uses. Sampling is decided per
+trace and subsystem, so a sampled request logs all of its diagnostics.
+WARNING and above are never sampled out.
+"""
+import contextvars
+import logging
+import random
+import sys
+import uuid
+import zlib
+from logging import DEBUG, INFO, WARNING, ERROR
+from typing import Dict, Optional
+
+from app.config import Config
+
+__all__ = [
+    "DEBUG", "INFO", "WARNING", "ERROR",
+    "Diagnostics", "get_diagnostics", "start_trace", "get_trace_id",
+]
+
+_ROOT_LOGGER_NAME = "app.diagnostics"
+
+_trace_id_ctx = contextvars.ContextVar("diagnostics_trace_id", default=None)
+
+
+def _parse_overrides(raw: str) -> Dict[str, str]:
+    overrides = {}
+    for item in raw.split(","):
+        if "=" not in item:
+            continue
+        name, value = item.split("=", 1)
+        if name.strip():
+            overrides[name.strip().lower()] = value.strip()
+    return overrides
+
+
+def _parse_level(value: str) -> int:
+    value = value.strip().upper()
+    if value.isdigit():
+        return int(value)
+    level = logging.getLevelName(value)
+    return level if isinstance(level, int) else WARNING
+
+
+def start_trace(trace_id: Optional[str] = None) -> str:
+    """Bind a trace id to the current context (request / thread / task)."""
+    trace_id = trace_id or str(uuid.uuid4())[:8]
+    _trace_id_ctx.set(trace_id)
+    return trace_id
+
+
+def get_trace_id() -> Optional[str]:
+    return _trace_id_ctx.get()
+
+
+class Diagnostics:
+    """
+    Per-subsystem diagnostic emitter.
+    Disabled calls cost one integer comparison; arguments are %-formatted
+    by logging only for records that are actually written.
+    """
+
+    def __init__(self, subsystem: str, level: int, sample_rate: float):
+        self.subsystem = subsystem
+        self.level = level
+        self.sample_rate = sample_rate
+        self._logger = logging.getLogger(f"{_ROOT_LOGGER_NAME}.{subsystem}")
+        self._sample_threshold = int(max(0.0, min(1.0, sample_rate)) * 0xFFFFFFFF)
+
+    def _sampled(self) -> bool:
+        if self.sample_rate >= 1.0:
+            return True
+        if self.sample_rate <= 0.0:
+            return False
+
+        trace_id = _trace_id_ctx.get()
+        if trace_id is None:
+            return random.random() < self.sample_rate
+
+        # Deterministic per (trace, subsystem): whole traces are kept or dropped
+        key = f"{trace_id}:{self.subsystem}".encode("utf-8")
+        return zlib.crc32(key) <= self._sample_threshold
+
+    def is_enabled(self, level: int = DEBUG) -> bool:
+        if level < self.level:
+            return False
+        return level >= WARNING or self._sampled()
+
+    def log(self, level: int, msg: str, *args, **kwargs) -> None:
+        if level < self.level:
+            return
+        if level < WARNING and not self._sampled():
+            return
+
+        trace_id = _trace_id_ctx.get() or "-"
+        self._logger.log(level, f"[TRACE {trace_id}] [{self.subsystem}] {msg}", *args, **kwargs)
+
+    def debug(self, msg: str, *args, **kwargs) -> None:
+        if DEBUG >= self.level:
+            self.log(DEBUG, msg, *args, **kwargs)
+
+    def info(self, msg: str, *args, **kwargs) -> None:
+        if INFO >= self.level:
+            self.log(INFO, msg, *args, **kwargs)
+
+    def warning(self, msg: str, *args, **kwargs) -> None:
+        self.log(WARNING, msg, *args, **kwargs)
+
+    def error(self, msg: str, *args, **kwargs) -> None:
+        self.log(ERROR, msg, *args, **kwargs)
+
+
+_registry: Dict[str, Diagnostics] = {}
+_default_level = _parse_level(Config.DIAGNOSTICS_LEVEL)
+_level_overrides = {
+    name: _parse_level(value)
+    for name, value in _parse_overrides(Config.DIAGNOSTICS_LEVELS).items()
+}
+_sample_overrides = {
+    name: float(value)
+    for name, value in _parse_overrides(Config.DIAGNOSTICS_SAMPLE_RATES).items()
+}
+
+
+def _configure_output() -> None:
+    """
+    Diagnostics get their own stderr handler so enabling them does not
+    depend on the server's logging setup (uvicorn leaves the root at WARNING).
+    """
+    root = logging.getLogger(_ROOT_LOGGER_NAME)
+    if root.handlers:
+        return
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    root.addHandler(handler)
+    root.setLevel(DEBUG)
+    root.propagate = False
+
+
+_configure_output()
+
+
+def get_diagnostics(subsystem: str) -> Diagnostics:
+    """Return the (cached) emitter for a subsystem."""
+    subsystem = subsystem.lower()
+    diag = _registry.get(subsystem)
+    if diag is None:
+        diag = Diagnostics(
+            subsystem,
+            level=_level_overrides.get(subsystem, _default_level),
+            sample_rate=_sample_overrides.get(subsystem, Config.DIAGNOSTICS_SAMPLE_RATE),
+        )
+        _registry[subsystem] = diag
+    return diag
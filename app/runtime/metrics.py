@@ -0,0 +1,358 @@
+"""Prometheus metrics - a minimal in-process registry with text exposition.
+
+    from app.runtime.metrics import LLM_LATENCY
+    LLM_LATENCY.labels(prompt_type="summary", status="ok").observe(1.2)
+
+GET /metrics renders every registered metric in the Prometheus text
+format (0.0.4). Values are per process; with several workers, scrape
+each one (or run a single worker per container).
+"""
+import functools
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[LabelValues, object] = {}
+
+    def labels(self, **labels: str):
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class _CounterChild:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def _samples(self):
+        for key, child in list(self._children.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}"
+
+
+class _GaugeChild:
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Gauge(_Metric):
+    """Gauge; pass `callback` to compute label->value pairs at scrape time."""
+
+    type_name = "gauge"
+
+    def __init__(self, name, documentation, labelnames=(), callback: Optional[Callable[[], Dict[LabelValues, float]]] = None):
+        super().__init__(name, documentation, labelnames)
+        self._callback = callback
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def _samples(self):
+        if self._callback is not None:
+            items = self._callback().items()
+        else:
+            items = ((key, child.value) for key, child in list(self._children.items()))
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class _HistogramChild:
+    def __init__(self, buckets: Sequence[float]):
+        self._lock = threading.Lock()
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _samples(self):
+        for key, child in list(self._children.items()):
+            with child._lock:
+                counts = list(child.counts)
+                total = child.sum
+
+            cumulative = 0
+            for bound, count in zip(list(self.buckets) + [math.inf], counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(m.render() for m in self._metrics) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = (), callback=None) -> Gauge:
+    return REGISTRY.register(Gauge(name, documentation, labelnames, callback))
+
+
+# -------------------------------------------------
+# Application metrics
+# -------------------------------------------------
+
+LLM_LATENCY = histogram(
+    "llm_request_duration_seconds",
+    "LLM call latency by prompt type.",
+    ("prompt_type", "status"),
+)
+LLM_TOKENS = counter(
+    "llm_tokens_total",
+    "LLM tokens by prompt type and direction (in = prompt, out = completion).",
+    ("prompt_type", "direction"),
+)
+LLM_ESCALATIONS = counter(
+    "llm_escalations_total",
+    "Calls retried on a larger model tier after the response failed validation.",
+    ("prompt_type", "from_tier", "to_tier"),
+)
+LLM_REPAIRS = counter(
+    "llm_json_repairs_total",
+    "JSON repair calls after a response failed schema validation, by result (repaired / failed).",
+    ("prompt_type", "result"),
+)
+LLM_HEDGES = counter(
+    "llm_hedged_requests_total",
+    "Hedged LLM calls: fired, and which attempt answered first (won = the hedge, lost = the original).",
+    ("prompt_type", "result"),
+)
+LLM_SHED = counter(
+    "llm_shed_requests_total",
+    "LLM calls failed fast or abandoned, by reason (circuit_open / deadline / timeout).",
+    ("prompt_type", "reason"),
+)
+
+CACHE_REQUESTS = counter(
+    "cache_requests_total",
+    "Cache lookups by cache and result (hit / miss).",
+    ("cache", "result"),
+)
+
+INTEGRATION_LATENCY = histogram(
+    "integration_request_duration_seconds",
+    "External integration call latency.",
+    ("integration", "endpoint"),
+)
+INTEGRATION_ERRORS = counter(
+    "integration_errors_total",
+    "External integration calls that raised.",
+    ("integration", "endpoint"),
+)
+
+TRANSCRIPT_TOKENS = counter(
+    "transcript_tokens_total",
+    "Estimated transcript tokens before (raw) and after (normalized) pre-processing.",
+    ("stage",),
+)
+
+PROMPT_CONTEXT_SECTIONS = counter(
+    "prompt_context_sections_total",
+    "Prompt sections cut to fit the prompt token budget, by prompt type, section and status (truncated / dropped).",
+    ("prompt_type", "section", "status"),
+)
+
+PRECOMPUTED_BRIEFS = counter(
+    "precomputed_briefs_total",
+    "Upcoming events handled by the brief scheduler, by outcome (generated / current / failed).",
+    ("outcome",),
+)
+
+WORKFLOW_OUTCOMES = counter(
+    "workflow_outcomes_total",
+    "Completed workflows by outcome (metadata error code, or ok).",
+    ("workflow", "outcome"),
+)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def observe_integration(integration: str, endpoint: str):
+    """Decorator: latency histogram plus error counter for an integration call."""
+    def decorator(fn):
+        latency = INTEGRATION_LATENCY.labels(integration=integration, endpoint=endpoint)
+        errors = INTEGRATION_ERRORS.labels(integration=integration, endpoint=endpoint)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                errors.inc()
+                raise
+            finally:
+                latency.observe(time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+def _pool_gauges() -> Dict[LabelValues, float]:
+    from app.db.session import get_pool_stats
+
+    stats = get_pool_stats()
+    return {
+        (key,): float(stats[key])
+        for key in ("size", "checked_out", "checked_in", "overflow")
+        if key in stats
+    }
+
+
+DB_POOL = gauge(
+    "db_pool",
+    "Primary connection pool occupancy (see /health/db).",
+    ("stat",),
+    callback=_pool_gauges,
+)
+DB_POOL_CHECKOUTS = counter(
+    "db_pool_checkouts_total",
+    "Connections checked out of the primary pool.",
+)
+DB_POOL_TIMEOUTS = counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after DB_POOL_TIMEOUT.",
+)
+DB_POOL_WAIT = counter(
+    "db_pool_checkout_wait_seconds_total",
+    "Time spent waiting for a pooled connection (divide by checkouts for the mean).",
+)
+for _pool_counter in (DB_POOL_CHECKOUTS, DB_POOL_TIMEOUTS, DB_POOL_WAIT):
+    _pool_counter.labels()  # Export 0 before the first checkout
+
+
+def _breaker_gauges() -> Dict[LabelValues, float]:
+    from app.llm.resilience import breaker_states
+
+    codes = {"closed": 0.0, "half_open": 1.0, "open": 2.0}
+    return {(model,): codes[state] for model, state in breaker_states().items()}
+
+
+LLM_CIRCUIT = gauge(
+    "llm_circuit_state",
+    "LLM circuit breaker state per model (0 = closed, 1 = half-open, 2 = open).",
+    ("model",),
+    callback=_breaker_gauges,
+)
+
+
+def render_metrics() -> str:
+    return REGISTRY.render()
@@ -0,0 +1,359 @@
+"""Per-request span tracing with OpenTelemetry-compatible export.
+
+    from app.runtime.spans import span, traced
+
+    with span("zoom.fetch_transcript", meeting_id=zoom_id):
+        ...
+
+    @traced("calendar.get_most_recent_meeting")
+    def get_most_recent_meeting(...): ...
+
+Spans are collected only while a request recorder is active (see
+start_recording / finish_recording in the chat endpoint); otherwise span()
+is a contextvar lookup and nothing else.
+
+Finished requests are exported as OTLP/JSON (one ExportTraceServiceRequest
+per request) by a background worker:
+    TRACE_EXPORT=file   append to TRACE_EXPORT_PATH (JSON lines)
+    TRACE_EXPORT=otlp   POST to TRACE_OTLP_ENDPOINT (e.g. a collector's /v1/traces)
+"""
+import contextvars
+import functools
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from app.config import Config
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "meeting-intelligence"
+
+# OTLP status codes
+_STATUS_OK = 1
+_STATUS_ERROR = 2
+
+# Statement text kept on db spans
+_MAX_STATEMENT_CHARS = 500
+
+
+class Span:
+    __slots__ = (
+        "name", "trace_id", "span_id", "parent_span_id",
+        "start_ns", "end_ns", "attributes", "error",
+    )
+
+    def __init__(self, name: str, trace_id: str, parent_span_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_span_id = parent_span_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1e6
+
+    def to_otlp(self) -> Dict[str, Any]:
+        out = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": (
+                {"code": _STATUS_ERROR, "message": self.error}
+                if self.error else {"code": _STATUS_OK}
+            ),
+        }
+        if self.parent_span_id:
+            out["parentSpanId"] = self.parent_span_id
+        return out
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [
+        {"key": key, "value": _otlp_value(value)}
+        for key, value in attributes.items()
+        if value is not None
+    ]
+
+
+class SpanRecorder:
+    """Collects the finished spans of one request."""
+
+    def __init__(self, trace_id: Optional[str] = None):
+        self.trace_id = trace_id or uuid.uuid4().hex
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+        self.started_ns = time.time_ns()
+
+    def add(self, finished: Span) -> None:
+        with self._lock:
+            self.spans.append(finished)
+
+    def timings(self) -> Dict[str, Any]:
+        """
+        Per-category totals (category = span name prefix before the first '.').
+        Categories can nest (an intent span contains its llm span), so totals
+        are not additive; "total_ms" is the wall time of the request.
+        """
+        breakdown: Dict[str, Dict[str, Any]] = {}
+        for s in self.spans:
+            category = s.name.split(".", 1)[0]
+            entry = breakdown.setdefault(category, {"ms": 0.0, "count": 0})
+            entry["ms"] += s.duration_ms
+            entry["count"] += 1
+
+        for entry in breakdown.values():
+            entry["ms"] = round(entry["ms"], 2)
+
+        return {
+            "trace_id": self.trace_id,
+            "total_ms": round((time.time_ns() - self.started_ns) / 1e6, 2),
+            "breakdown": breakdown,
+            "spans": [
+                {
+                    "name": s.name,
+                    "ms": round(s.duration_ms, 2),
+                    "parent": s.parent_span_id,
+                    "id": s.span_id,
+                }
+                for s in self.spans
+            ],
+        }
+
+    def to_otlp(self) -> Dict[str, Any]:
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": _otlp_attributes({"service.name": SERVICE_NAME}),
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": __name__},
+                            "spans": [s.to_otlp() for s in self.spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+
+_recorder_ctx = contextvars.ContextVar("span_recorder", default=None)
+_current_span_ctx = contextvars.ContextVar("current_span", default=None)
+
+
+def export_enabled() -> bool:
+    return Config.TRACE_EXPORT in {"file", "otlp"}
+
+
+def start_recording(trace_id: Optional[str] = None) -> SpanRecorder:
+    """Begin collecting spans for the current request context."""
+    recorder = SpanRecorder(trace_id)
+    _recorder_ctx.set(recorder)
+    _current_span_ctx.set(None)
+    return recorder
+
+
+def finish_recording() -> Optional[SpanRecorder]:
+    """Stop collecting, queue the request's spans for export and return the recorder."""
+    recorder = _recorder_ctx.get()
+    if recorder is None:
+        return None
+
+    _recorder_ctx.set(None)
+    _current_span_ctx.set(None)
+
+    if export_enabled() and recorder.spans:
+        _get_exporter().submit(recorder.to_otlp())
+
+    return recorder
+
+
+def get_trace_id() -> Optional[str]:
+    recorder = _recorder_ctx.get()
+    return recorder.trace_id if recorder else None
+
+
+def current_span() -> Optional[Span]:
+    return _current_span_ctx.get()
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Record a timed span under the current span (no-op without a recorder)."""
+    recorder = _recorder_ctx.get()
+    if recorder is None:
+        yield None
+        return
+
+    parent = _current_span_ctx.get()
+    s = Span(name, recorder.trace_id, parent.span_id if parent else None, attributes)
+    token = _current_span_ctx.set(s)
+    try:
+        yield s
+    except BaseException as e:
+        s.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        s.end_ns = time.time_ns()
+        _current_span_ctx.reset(token)
+        recorder.add(s)
+
+
+def traced(name: str):
+    """Decorator form of span()."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _recorder_ctx.get() is None:
+                return fn(*args, **kwargs)
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def server_timing_header(recorder: SpanRecorder) -> str:
+    """Render a Server-Timing header value from the recorder's breakdown."""
+    timings = recorder.timings()
+    parts = [
+        f'{category};dur={entry["ms"]};desc="{entry["count"]} span(s)"'
+        for category, entry in timings["breakdown"].items()
+    ]
+    parts.append(f'total;dur={timings["total_ms"]}')
+    return ", ".join(parts)
+
+
+# -------------------------------------------------
+# SQLAlchemy instrumentation
+# -------------------------------------------------
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    recorder = _recorder_ctx.get()
+    if recorder is None:
+        return
+
+    parent = _current_span_ctx.get()
+    s = Span(
+        "db.query",
+        recorder.trace_id,
+        parent.span_id if parent else None,
+        {
+            "db.system": conn.dialect.name,
+            "db.statement": statement[:_MAX_STATEMENT_CHARS],
+        },
+    )
+    conn.info.setdefault("_spans", []).append(s)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    pending = conn.info.get("_spans")
+    if not pending:
+        return
+
+    s = pending.pop()
+    s.end_ns = time.time_ns()
+    recorder = _recorder_ctx.get()
+    if recorder is not None:
+        recorder.add(s)
+
+
+def instrument_engine(engine) -> None:
+    """Record a db.query span per cursor execute on this engine."""
+    from sqlalchemy import event
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# -------------------------------------------------
+# Export
+# -------------------------------------------------
+
+class _Exporter:
+    """Background worker so exporting never adds to request latency."""
+
+    def __init__(self):
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=1000)
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def submit(self, payload: Dict[str, Any]) -> None:
+        try:
+            self._queue.put_nowait(payload)
+        except queue.Full:
+            logger.warning("Span export queue full; dropping trace")
+
+    def _run(self) -> None:
+        while True:
+            payload = self._queue.get()
+            try:
+                if Config.TRACE_EXPORT == "file":
+                    self._write_file(payload)
+                elif Config.TRACE_EXPORT == "otlp":
+                    self._post(payload)
+            except Exception as e:
+                logger.warning(f"Span export failed: {e}")
+
+    @staticmethod
+    def _write_file(payload: Dict[str, Any]) -> None:
+        path = Config.TRACE_EXPORT_PATH
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(payload, separators=(",", ":")))
+            f.write("\n")
+
+    @staticmethod
+    def _post(payload: Dict[str, Any]) -> None:
+        import requests
+
+        requests.post(
+            Config.TRACE_OTLP_ENDPOINT,
+            json=payload,
+            headers={"Content-Type": "application/json"},
+            timeout=5,
+        ).raise_for_status()
+
+
+_exporter: Optional[_Exporter] = None
+_exporter_lock = threading.Lock()
+
+
+def _get_exporter() -> _Exporter:
+    global _exporter
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                _exporter = _Exporter()
+    return _exporter
@@ -2,7 +2,9 @@
 
 from typing import Dict, Any, List
 from app.llm.client import chat
-from app.llm.prompts import FOLLOWUP_EMAIL_SYSTEM, FOLLOWUP_EMAIL_USER
+from app.llm.context import ContextBuilder, format_list
+from app.llm.prompts import FOLLOWUP_EMAIL_SYSTEM, FOLLOWUP_EMAIL_USER, MEMORY_CONTEXT
+from app.llm.templates import render
 
 
 def generate_followup_email(
@@ -17,30 +19,38 @@ def generate_followup_email(
     Generate polished follow-up email text.
     """
 
-    decisions_str = "\n".join(f"- {d}" for d in decisions) if decisions else "None"
+    decision_lines = [f"- {d}" for d in decisions]
+    action_item_lines = [
+        f"- {item.get('text', '')} "
+        f"(Owner: {item.get('owner') or 'TBD'}, "
+        f"Due: {item.get('deadline') or 'TBD'})"
+        for item in action_items
+    ]
 
-    action_items_str = (
-        "\n".join(
-            f"- {item.get('text', '')} "
-            f"(Owner: {item.get('owner') or 'TBD'}, "
-            f"Due: {item.get('deadline') or 'TBD'})"
-            for item in action_items
-        )
-        if action_items
-        else "None"
+    # Fit the prompt budget: prior-meeting memory is cut first, then decisions /
+    # action items; the summary is kept longest (its end is trimmed, the head kept)
+    packed = (
+        ContextBuilder("followup", reserve=[FOLLOWUP_EMAIL_SYSTEM, FOLLOWUP_EMAIL_USER, MEMORY_CONTEXT])
+        .add_text("summary", summary, priority=0, min_tokens=500)
+        .add_items("decisions", decision_lines, priority=1, min_tokens=300)
+        .add_items("action_items", action_item_lines, priority=1, min_tokens=300)
+        .add_items("memory", (memory_context or "").splitlines(), priority=2)
+        .build()
     )
 
-    prompt = FOLLOWUP_EMAIL_USER.format(
-        summary=summary,
-        decisions=decisions_str,
-        action_items=action_items_str,
+    prompt = render(
+        FOLLOWUP_EMAIL_USER,
+        summary=packed.text("summary"),
+        decisions=format_list(packed.items("decisions"), len(decision_lines), empty="None", joiner="\n"),
+        action_items=format_list(packed.items("action_items"), len(action_item_lines), empty="None", joiner="\n"),
         client_name=client_name,
         meeting_date=meeting_date,
-        memory_context=memory_context or "No additional context.",
     )
 
     return chat(
         prompt=prompt,
         system_prompt=FOLLOWUP_EMAIL_SYSTEM,
+        context=render(MEMORY_CONTEXT, memory_context=packed.text("memory") or "No additional context."),
         temperature=0.7,
+        prompt_type="followup",
     )
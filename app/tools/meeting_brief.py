@@ -1,8 +1,39 @@
 """Meeting brief generation tool - LLM-powered."""
 
-from typing import List
+import hashlib
+import json
+from typing import List, Optional
+from app.llm import router
 from app.llm.client import chat
-from app.llm.prompts import MEETING_BRIEF_SYSTEM, MEETING_BRIEF_USER
+from app.llm.context import ContextBuilder, format_list
+from app.llm.ledger import estimate_tokens
+from app.llm.prompts import MEETING_BRIEF_SYSTEM, MEETING_BRIEF_USER, MEMORY_CONTEXT
+from app.llm.templates import render
+
+
+def brief_context_hash(
+    client_name: Optional[str],
+    meeting_title: str,
+    meeting_date: str,
+    attendees: List[str],
+    memory_context: str = "",
+) -> str:
+    """
+    Fingerprint of everything that shapes a brief: the generate_meeting_brief
+    inputs, the prompts and the model. A stored brief is current while this matches.
+    """
+    attendees = list(attendees or [])
+    # The model chat() routes a brief of this size to (LLM_ROUTES), not GEMINI_MODEL
+    prompt_tokens = estimate_tokens(
+        "\n".join([MEETING_BRIEF_SYSTEM, MEETING_BRIEF_USER, MEMORY_CONTEXT, meeting_title or "",
+                   ", ".join(map(str, attendees)), memory_context or ""])
+    )
+    model = router.model_for(router.route("brief", prompt_tokens))
+    payload = [
+        client_name, meeting_title, meeting_date, attendees, memory_context or "",
+        MEETING_BRIEF_SYSTEM, MEETING_BRIEF_USER, MEMORY_CONTEXT, model,
+    ]
+    return hashlib.sha256(json.dumps(payload, default=str).encode("utf-8")).hexdigest()
 
 
 def generate_meeting_brief(
@@ -16,16 +47,28 @@ def generate_meeting_brief(
     Generate a concise prep brief for an upcoming meeting.
     """
 
-    prompt = MEETING_BRIEF_USER.format(
+    attendees = attendees or []
+
+    # Fit the prompt budget: a long attendee list is cut before prior context
+    packed = (
+        ContextBuilder("brief", reserve=[MEETING_BRIEF_SYSTEM, MEETING_BRIEF_USER, MEMORY_CONTEXT, meeting_title])
+        .add_items("memory", (memory_context or "").splitlines(), priority=0)
+        .add_items("attendees", attendees, priority=1, min_tokens=200, joiner=", ")
+        .build()
+    )
+
+    prompt = render(
+        MEETING_BRIEF_USER,
         client_name=client_name,
         meeting_title=meeting_title,
         meeting_date=meeting_date,
-        attendees=", ".join(attendees) if attendees else "Unknown",
-        memory_context=memory_context,
+        attendees=format_list(packed.items("attendees"), len(attendees)),
     )
 
     return chat(
         prompt=prompt,
         system_prompt=MEETING_BRIEF_SYSTEM,
+        context=render(MEMORY_CONTEXT, memory_context=packed.text("memory")),
         temperature=0.4,
+        prompt_type="brief",
     )
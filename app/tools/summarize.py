@@ -1,55 +1,12 @@
 """Summarization tool - LLM-powered, stateless."""
-import json
 from typing import Dict, Any, List, Optional
-from app.llm.client import chat
-from app.llm.prompts import MEETING_SUMMARY_SYSTEM, MEETING_SUMMARY_USER
+from app.llm.context import ContextBuilder, format_list
+from app.llm.parsing import SUMMARY_SCHEMA, LLMOutputError, chat_json
+from app.llm.prompts import MEETING_SUMMARY_SYSTEM, MEETING_SUMMARY_USER, MEMORY_CONTEXT
+from app.llm.templates import render
+from app.runtime.diagnostics import get_diagnostics
 
-
-def _extract_json(text: str) -> Dict[str, Any]:
-    """
-    Safely extract JSON from LLM output.
-    Handles:
-    - Raw JSON
-    - ```json fenced blocks
-    - Extra prose before/after JSON
-    """
-
-    text = text.strip()
-
-    # Case 1: ```json fenced block anywhere in output
-    if "```" in text:
-        lines = text.splitlines()
-        json_lines = []
-        in_json = False
-
-        for line in lines:
-            if line.strip().startswith("```"):
-                in_json = not in_json
-                continue
-            if in_json:
-                json_lines.append(line)
-
-        if json_lines:
-            try:
-                return json.loads("\n".join(json_lines))
-            except json.JSONDecodeError:
-                pass  # fall through safely
-
-    # Case 2: Raw JSON (no fences)
-    try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        pass
-
-    # Case 3: Try to locate first JSON object inside text
-    try:
-        start = text.index("{")
-        end = text.rindex("}") + 1
-        return json.loads(text[start:end])
-    except Exception:
-        pass
-
-    raise ValueError("No valid JSON found in LLM response")
+diag = get_diagnostics("summarize")
 
 
 def summarize_meeting(transcript: Optional[str], meeting_metadata: Dict[str, Any], 
@@ -60,7 +17,7 @@ def summarize_meeting(transcript: Optional[str], meeting_metadata: Dict[str, Any
     Args:
         transcript: Meeting transcript text (can be None)
         meeting_metadata: Dict with date, attendees, client_name, etc.
-        memory_context: Relevant memory entries as formatted string
+        memory_context: Relevant memory entries, one per line, best first
     
     Returns:
         {
@@ -69,43 +26,53 @@ def summarize_meeting(transcript: Optional[str], meeting_metadata: Dict[str, Any
             "action_items": List[Dict] with text, owner, deadline
         }
     """
-    # Format attendees
     attendees = meeting_metadata.get('attendees', [])
-    attendees_str = ", ".join(attendees) if attendees else "Unknown"
+
+    # Fit the prompt budget: memory is cut first, then attendees; the transcript
+    # is kept longest (trimmed from the middle)
+    packed = (
+        ContextBuilder("summary", reserve=[MEETING_SUMMARY_SYSTEM, MEETING_SUMMARY_USER, MEMORY_CONTEXT])
+        .add_text("transcript", transcript, priority=0, truncate="middle")
+        .add_items("attendees", attendees, priority=1, min_tokens=200, joiner=", ")
+        .add_items("memory", (memory_context or "").splitlines(), priority=2, min_tokens=500)
+        .build()
+    )
+
+    # Format attendees
+    attendees_str = format_list(packed.items("attendees"), len(attendees))
     
     # Format transcript or indicate missing
-    transcript_text = transcript if transcript else "[Transcript not available - summary based on calendar metadata only]"
+    transcript_text = packed.text("transcript") if transcript else "[Transcript not available - summary based on calendar metadata only]"
     
     # Build prompt
-    prompt = MEETING_SUMMARY_USER.format(
+    prompt = render(
+        MEETING_SUMMARY_USER,
         meeting_date=meeting_metadata.get('date', 'Unknown'),
         attendees=attendees_str,
         client_name=meeting_metadata.get('client_name', 'Unknown'),
-        memory_context=memory_context or "No previous context available.",
         transcript=transcript_text
     )
+    context = render(MEMORY_CONTEXT, memory_context=packed.text("memory") or "No previous context available.")
     
-    # Call LLM
-    response_text = chat(
-        prompt=prompt,
-        system_prompt=MEETING_SUMMARY_SYSTEM,
-        temperature=0.7,
-        response_format={"response_mime_type": "application/json"}
-    )
-    
-    # Parse JSON response
+    # Call LLM (schema-constrained JSON, parsed and validated once)
     try:
-        result = _extract_json(response_text)
+        result = chat_json(
+            prompt=prompt,
+            system_prompt=MEETING_SUMMARY_SYSTEM,
+            context=context,
+            schema=SUMMARY_SCHEMA,
+            temperature=0.7,
+            prompt_type="summary",
+        )
         return {
             "summary": result.get("summary", ""),
             "decisions": result.get("decisions", []),
             "action_items": result.get("action_items", [])
         }
-    except Exception as e:
-        print(f"DIAGNOSTIC: Failed to parse summary JSON: {e}")
+    except LLMOutputError as e:
+        diag.warning("Failed to parse summary JSON: %s", e)
         return {
             "summary": "I generated a summary, but it could not be parsed reliably.",
             "decisions": [],
             "action_items": [],
         }
-
@@ -0,0 +1,240 @@
+"""Transcript normalization - fewer prompt tokens, same content.
+
+Runs between transcript loading (Zoom VTT / demo files) and summarization.
+Steps (TRANSCRIPT_NORMALIZATION, comma-separated, in this order):
+
+    timestamps      drop VTT cue numbers and timing lines, strip leading [hh:mm:ss] stamps
+    disfluencies    remove filler words (um, uh, "you know,"), stutters ("I I think",
+                    "we, we need") and backchannel-only turns ("Yeah." / "Mm-hmm,
+                    right."); a short turn answering another speaker's question
+                    ("Sure.") is an answer, not a backchannel, and is kept
+    dedupe          drop a speaker's near-duplicate lines (same numbers, word-level
+                    similarity >= TRANSCRIPT_DEDUPE_SIMILARITY); a crosstalk fragment
+                    that the same speaker restates in full is replaced by the full line
+    merge_speakers  join consecutive turns by the same speaker into one line
+
+Lines without a "Speaker: " label (prose transcripts) only go through the
+text-level steps. Numbers, names and every other content word are kept.
+"""
+import re
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.config import Config
+from app.llm.ledger import estimate_tokens
+from app.runtime.diagnostics import get_diagnostics
+from app.runtime.metrics import TRANSCRIPT_TOKENS
+
+diag = get_diagnostics("transcript")
+
+STEPS = ("timestamps", "disfluencies", "dedupe", "merge_speakers")
+
+# Previous lines of the same speaker checked for near-duplicates
+_DEDUPE_WINDOW = 5
+
+_CUE_NUMBER = re.compile(r"^\d+$")
+_TIMING_LINE = re.compile(r"^\d{1,2}:\d{2}(?::\d{2})?(?:[.,]\d+)?\s*(?:-->.*)?$")
+_LEADING_STAMP = re.compile(r"^[\[(]?\d{1,2}:\d{2}(?::\d{2})?(?:[.,]\d+)?[\])]?\s+")
+_SPEAKER = re.compile(r"^([A-Z][\w.'\-]*(?: [\w.'\-]+){0,3}):\s+(.*)$")
+
+_FILLERS = re.compile(
+    r"(?:(?<=\s)|^)(?:uh-huh|mm-hmm|u+m+|u+h+|e+r+m+|e+r|a+h+|h+m+|m+h*m+)\b[,.]?\s*",
+    re.IGNORECASE,
+)
+_FILLER_PHRASES = re.compile(r"\b(?:you know|i mean),\s*", re.IGNORECASE)
+_FALSE_START = re.compile(r"\b(\w+)-\s+(?=\1\b)", re.IGNORECASE)
+# Doubled words are collapsed only for these words ("that that", "had had", "10 10" can be meant);
+# any word repeated across a comma ("we, we") is one
+_STUTTER = re.compile(
+    r"\b(i|we|you|they|he|she|it|the|a|an|and|but|so|to|of|in|on|my|our)(?:\s+\1\b)+",
+    re.IGNORECASE,
+)
+_COMMA_STUTTER = re.compile(r"\b([a-z]+),\s+(?=\1\b)", re.IGNORECASE)
+_SPACE_BEFORE_PUNCT = re.compile(r"\s+([,.;:?!])")
+_REPEATED_COMMA = re.compile(r",(?:\s*,)+")
+_LEADING_PUNCT = re.compile(r"^[\s,;.]+")
+_WHITESPACE = re.compile(r"\s{2,}")
+_NON_WORD = re.compile(r"[^a-z0-9 ]+")
+_DIGITS = re.compile(r"\d+")
+
+_BACKCHANNELS = {
+    "yeah", "yep", "yup", "right", "okay", "ok", "sure", "mhm", "mmhmm",
+    "uhhuh", "gotcha", "got", "it", "cool", "alright",
+}
+
+Entry = Tuple[Optional[str], str]  # (speaker or None, text)
+
+
+def _configured_steps() -> List[str]:
+    raw = Config.TRANSCRIPT_NORMALIZATION.strip().lower()
+    if raw in ("", "off", "none", "false"):
+        return []
+    return [step for step in STEPS if step in {s.strip() for s in raw.split(",")}]
+
+
+def _split_speaker(line: str) -> Entry:
+    match = _SPEAKER.match(line)
+    if match:
+        return match.group(1), match.group(2).strip()
+    return None, line
+
+
+def _key(text: str) -> str:
+    return _WHITESPACE.sub(" ", _NON_WORD.sub(" ", text.lower())).strip()
+
+
+def _clean_disfluencies(text: str) -> str:
+    text = _FILLER_PHRASES.sub("", text)
+    text = _FILLERS.sub("", text)
+    text = _FALSE_START.sub("", text)
+    text = _STUTTER.sub(r"\1", text)
+    text = _COMMA_STUTTER.sub("", text)
+    text = _REPEATED_COMMA.sub(",", text)
+    text = _SPACE_BEFORE_PUNCT.sub(r"\1", text)
+    text = _LEADING_PUNCT.sub("", text)
+    text = _WHITESPACE.sub(" ", text).strip()
+    return text[:1].upper() + text[1:] if text else text
+
+
+def _is_backchannel(text: str) -> bool:
+    words = _key(text.replace("-", "")).split()
+    return len(words) <= 3 and all(word in _BACKCHANNELS for word in words)
+
+
+def _strip_timestamps(lines: Sequence[str], stats: Dict[str, int]) -> List[str]:
+    kept = []
+    for line in lines:
+        if _CUE_NUMBER.match(line) or _TIMING_LINE.match(line) or line.startswith("WEBVTT"):
+            stats["timestamps"] += 1
+            continue
+        kept.append(_LEADING_STAMP.sub("", line))
+    return kept
+
+
+def _answers_question(kept: List[Entry], speaker: Optional[str]) -> bool:
+    return bool(kept) and kept[-1][0] not in (None, speaker) and kept[-1][1].endswith("?")
+
+
+def _remove_disfluencies(entries: List[Entry], stats: Dict[str, int]) -> List[Entry]:
+    kept: List[Entry] = []
+    for speaker, text in entries:
+        droppable = speaker is not None and not _answers_question(kept, speaker)
+        if droppable and _is_backchannel(text):
+            stats["disfluencies"] += 1
+            continue
+        cleaned = _clean_disfluencies(text)
+        if not cleaned or (droppable and _is_backchannel(cleaned)):
+            stats["disfluencies"] += 1
+            continue
+        kept.append((speaker, cleaned))
+    return kept
+
+
+def _near_duplicate(a: Tuple[List[str], List[str]], b: Tuple[List[str], List[str]], threshold: float) -> bool:
+    """a, b: (words, numbers). Lines that differ in any number ("item 4" / "item 7") are different facts."""
+    (a_words, a_numbers), (b_words, b_numbers) = a, b
+    if len(a_words) < 4 or len(b_words) < 4 or a_numbers != b_numbers:
+        return False
+    if 2 * min(len(a_words), len(b_words)) / (len(a_words) + len(b_words)) < threshold:
+        return False
+    matcher = SequenceMatcher(None, a_words, b_words, autojunk=False)
+    return matcher.quick_ratio() >= threshold and matcher.ratio() >= threshold
+
+
+def _dedupe(entries: List[Entry], stats: Dict[str, int]) -> List[Entry]:
+    threshold = Config.TRANSCRIPT_DEDUPE_SIMILARITY
+    kept: List[Entry] = []
+    keys: List[str] = []
+    tokens: List[Tuple[List[str], List[str]]] = []
+    last_by_speaker: Dict[Optional[str], List[int]] = {}
+
+    for speaker, text in entries:
+        key = _key(text)
+        key_tokens = (key.split(), _DIGITS.findall(key))
+        duplicate = False
+        recent = last_by_speaker.setdefault(speaker, [])
+
+        for i in reversed(recent):
+            previous = keys[i]
+            if key == previous or (key and previous.startswith(key + " ")):
+                duplicate = True
+            elif previous and key.startswith(previous + " "):
+                # Earlier fragment restated in full: keep the full version
+                kept[i], keys[i], tokens[i] = (speaker, text), key, key_tokens
+                duplicate = True
+            else:
+                duplicate = _near_duplicate(tokens[i], key_tokens, threshold)
+            if duplicate:
+                break
+
+        if duplicate:
+            stats["dedupe"] += 1
+            continue
+        recent.append(len(kept))
+        del recent[:-_DEDUPE_WINDOW]
+        kept.append((speaker, text))
+        keys.append(key)
+        tokens.append(key_tokens)
+    return kept
+
+
+def _merge_speakers(entries: List[Entry], stats: Dict[str, int]) -> List[Entry]:
+    merged: List[Entry] = []
+    for speaker, text in entries:
+        if merged and speaker is not None and merged[-1][0] == speaker:
+            merged[-1] = (speaker, f"{merged[-1][1]} {text}")
+            stats["merge_speakers"] += 1
+        else:
+            merged.append((speaker, text))
+    return merged
+
+
+def normalize_transcript(text: str, steps: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """
+    Normalize a transcript for prompting.
+
+    Returns:
+        {
+            "text": str,
+            "tokens_before": int,
+            "tokens_after": int,
+            "removed": {step: lines removed or merged}
+        }
+    """
+    steps = _configured_steps() if steps is None else list(steps)
+    stats = {step: 0 for step in STEPS}
+    tokens_before = estimate_tokens(text)
+
+    if not steps or not text:
+        return {"text": text, "tokens_before": tokens_before, "tokens_after": tokens_before, "removed": stats}
+
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    if "timestamps" in steps:
+        lines = _strip_timestamps(lines, stats)
+
+    entries = [_split_speaker(line) for line in lines]
+    if "disfluencies" in steps:
+        entries = _remove_disfluencies(entries, stats)
+    if "dedupe" in steps:
+        entries = _dedupe(entries, stats)
+    if "merge_speakers" in steps:
+        entries = _merge_speakers(entries, stats)
+
+    normalized = "\n".join(f"{speaker}: {line}" if speaker else line for speaker, line in entries)
+    tokens_after = estimate_tokens(normalized)
+
+    TRANSCRIPT_TOKENS.labels(stage="raw").inc(tokens_before)
+    TRANSCRIPT_TOKENS.labels(stage="normalized").inc(tokens_after)
+    diag.info(
+        "Transcript normalized: %s -> %s tokens (-%.0f%%), removed %s",
+        tokens_before, tokens_after,
+        100 * (tokens_before - tokens_after) / max(tokens_before, 1),
+        {k: v for k, v in stats.items() if v},
+    )
+
+    return {
+        "text": normalized,
+        "tokens_before": tokens_before,
+        "tokens_after": tokens_after,
+        "removed": stats,
+    }
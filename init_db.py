@@ -1,6 +1,6 @@
 """Initialize database tables."""
 from app.db.session import engine, Base
-from app.memory.models import Meeting, MemoryEntry, Commitment, Interaction
+from app.memory.models import Meeting, MemoryEntry, Commitment, Interaction, ActiveMeeting, LLMUsage, PrecomputedBrief
 
 
 def init_db() -> None:
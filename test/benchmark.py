@@ -0,0 +1,573 @@
+"""Offline benchmark suite for Orchestrator.process_message.
+
+Runs every intent end to end against a seeded database with the network
+replaced at the transport boundary, so the real integration, LLM client,
+ledger and metrics code paths all execute:
+
+    - LLM:      the offline provider (LLM_PROVIDER=local, configurable latency)
+    - Calendar: a fake Google Calendar service (events().list().execute())
+    - Zoom / HubSpot: fake `requests` transports answering the API routes used
+
+Usage (from the repo root):
+
+    python test/benchmark.py                                # compare with the stored baseline
+    python test/benchmark.py --save-baseline                # record a new baseline
+    python test/benchmark.py --sizes small,large --llm-latency-ms 200
+    python test/benchmark.py --database-url postgresql://localhost/bench
+
+Reports p50 / p95 latency, SQL queries per request and peak traced memory
+per request for each (data size, scenario). Each size runs its scenarios
+--repeats times and reports the median of each figure. Exits non-zero when
+a result regresses past the baseline: p95 or peak memory beyond
+--tolerance, or any increase in queries per request. Latency / memory
+regressions are measured again (--retries) before failing, so one noisy
+pass on a busy machine does not fail the gate.
+
+⚠️ The benchmark drops and recreates every table in the target database.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "benchmark_baseline.json"
+
+# (clients, meetings per client) seeded before each size runs
+SIZES = {
+    "small": (20, 5),
+    "medium": (200, 20),
+    "large": (1000, 50),
+}
+
+# Calendar events per client visible to the fake Google Calendar
+CALENDAR_CLIENTS = 20
+CALENDAR_PAST_MEETINGS = 4
+
+BENCH_CONVERSATION_ID = "benchmark"
+
+
+def _configure_environment(database_url: Optional[str], workdir: str, llm_latency_ms: float = 0.0) -> None:
+    """Config is read at import time, so this must run before importing app."""
+    os.environ.update(
+        APP_MODE="prod",
+        LLM_PROVIDER="local",
+        LLM_LOCAL_LATENCY_MS=str(llm_latency_ms),
+        LLM_LOCAL_JITTER_MS="0",
+        LLM_LOCAL_RESPONSES="",
+        DATABASE_URL=database_url or f"sqlite:///{workdir}/benchmark.db",
+        BLOB_STORE_BACKEND="local",
+        BLOB_STORE_PATH=f"{workdir}/blobs",
+        HUBSPOT_API_KEY="benchmark",
+        ZOOM_ACCOUNT_ID="benchmark",
+        ZOOM_CLIENT_ID="benchmark",
+        ZOOM_CLIENT_SECRET="benchmark",
+        TRACE_EXPORT="",
+        LLM_DAILY_TOKEN_BUDGET="0",
+        LLM_WORKFLOW_TOKEN_BUDGETS="",
+    )
+    os.environ.setdefault("DIAGNOSTICS_LEVEL", "WARNING")
+
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+
+
+def _sleep_ms(ms: float) -> None:
+    if ms > 0:
+        time.sleep(ms / 1000)
+
+
+# -------------------------------------------------
+# Fake Google Calendar
+# -------------------------------------------------
+
+def _calendar_events(now: datetime) -> List[Dict[str, Any]]:
+    events = []
+    for c in range(CALENDAR_CLIENTS):
+        client = f"Client {c:05d}"
+        starts = [now - timedelta(days=7 * (m + 1), hours=c % 8) for m in range(CALENDAR_PAST_MEETINGS)]
+        starts.append(now + timedelta(days=1 + c % 5, hours=c % 8))
+
+        for m, start in enumerate(starts):
+            events.append({
+                "id": f"bench_event_{c}_{m}",
+                "summary": f"{client} Sync",
+                "description": f"Weekly sync with {client}",
+                "location": f"https://zoom.us/j/{81000000000 + c * 10 + m}",
+                "start": {"dateTime": start.isoformat()},
+                "end": {"dateTime": (start + timedelta(minutes=45)).isoformat()},
+                "attendees": [
+                    {"email": f"owner@client{c:05d}.example.com"},
+                    {"email": "you@example.com"},
+                ],
+                "organizer": {"email": "you@example.com"},
+            })
+    events.sort(key=lambda e: e["start"]["dateTime"])
+    return events
+
+
+def _parse_calendar_time(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class FakeCalendarService:
+    """Answers events().list(...).execute() with paging, like the discovery client."""
+
+    def __init__(self, events: List[Dict[str, Any]], latency_ms: float):
+        self._events = events
+        self.latency_ms = latency_ms
+
+    def events(self):
+        return self
+
+    def list(self, **params):
+        return SimpleNamespace(execute=lambda: self._list(params))
+
+    def _list(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        _sleep_ms(self.latency_ms)
+        time_min = _parse_calendar_time(params["timeMin"])
+        time_max = _parse_calendar_time(params["timeMax"])
+        matching = [
+            e for e in self._events
+            if time_min <= _parse_calendar_time(e["start"]["dateTime"]) <= time_max
+        ]
+
+        offset = int(params.get("pageToken") or 0)
+        page_size = int(params.get("maxResults", 250))
+        result = {"items": matching[offset:offset + page_size]}
+        if offset + page_size < len(matching):
+            result["nextPageToken"] = str(offset + page_size)
+        return result
+
+
+# -------------------------------------------------
+# Fake Zoom / HubSpot transports
+# -------------------------------------------------
+
+class FakeResponse:
+    def __init__(self, payload: Any = None, status_code: int = 200, text: str = ""):
+        self.status_code = status_code
+        self._payload = payload
+        self.text = text
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        import requests
+
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} from fake server")
+
+
+_VTT = "WEBVTT\n\n" + "\n\n".join(
+    f"{i}\n00:00:{i:02d}.000 --> 00:00:{i + 1:02d}.000\nSpeaker {i % 3}: We reviewed item {i} of the rollout."
+    for i in range(1, 59)
+)
+
+
+class FakeTransport:
+    """
+    Drop-in for the `requests` module inside app.integrations.zoom / hubspot.
+    Routes by URL; every call costs the configured latency.
+    """
+
+    def __init__(self, latency_ms: float):
+        import requests
+
+        self.RequestException = requests.RequestException
+        self.HTTPError = requests.HTTPError
+        self.latency_ms = latency_ms
+        self._next_id = 1000
+
+    def _id(self) -> str:
+        self._next_id += 1
+        return str(self._next_id)
+
+    def get(self, url: str, **kwargs) -> FakeResponse:
+        _sleep_ms(self.latency_ms)
+        if "/past_meetings/" in url:
+            start = (datetime.now(timezone.utc) - timedelta(days=7)).strftime("%Y-%m-%dT%H:%M:%SZ")
+            return FakeResponse({"meetings": [{"uuid": "bench/uuid==", "start_time": start}]})
+        if url.endswith("/recordings"):
+            return FakeResponse({
+                "recording_files": [
+                    {"file_type": "TRANSCRIPT", "download_url": "https://zoom.us/rec/download/bench.vtt"}
+                ]
+            })
+        if url.endswith(".vtt"):
+            return FakeResponse(text=_VTT)
+        if "/crm/v3/objects/tasks/" in url:
+            return FakeResponse({"id": url.rsplit("/", 1)[-1]})
+        return FakeResponse(status_code=404)
+
+    def post(self, url: str, **kwargs) -> FakeResponse:
+        _sleep_ms(self.latency_ms)
+        if "zoom.us/oauth/token" in url:
+            return FakeResponse({"access_token": "benchmark-token"})
+        if url.endswith("/companies/search"):
+            return FakeResponse({"results": []})
+        if "/crm/v3/objects/" in url:
+            return FakeResponse({"id": self._id()})
+        return FakeResponse(status_code=404)
+
+    def put(self, url: str, **kwargs) -> FakeResponse:
+        _sleep_ms(self.latency_ms)
+        return FakeResponse({})
+
+
+def install_fake_integrations(latency_ms: float) -> List[Dict[str, Any]]:
+    from app.integrations import calendar, hubspot, zoom
+
+    events = _calendar_events(datetime.now(timezone.utc))
+    service = FakeCalendarService(events, latency_ms)
+    calendar.get_calendar_service = lambda: service
+
+    transport = FakeTransport(latency_ms)
+    zoom.requests = transport
+    hubspot.requests = transport
+    return events
+
+
+# -------------------------------------------------
+# Database
+# -------------------------------------------------
+
+class QueryCounter:
+    def __init__(self, engine):
+        from sqlalchemy import event
+
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+
+def reset_database(n_clients: int, meetings_per_client: int) -> Dict[str, int]:
+    from app.db.session import Base, SessionLocal, engine
+    from app.demo.seed import bulk_load, generate_synthetic_corpus
+    from app.memory.search import memory_index
+    import app.memory.models  # noqa: F401  (register tables)
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    memory_index.reset()  # ids restart with the tables
+
+    db = SessionLocal()
+    try:
+        return bulk_load(db, generate_synthetic_corpus(n_clients, meetings_per_client))
+    finally:
+        db.close()
+
+
+# -------------------------------------------------
+# Scenarios
+# -------------------------------------------------
+
+class Scenario:
+    def __init__(
+        self,
+        name: str,
+        message: str = "",
+        intent: Optional[str] = None,
+        entities: Optional[Dict[str, Any]] = None,
+        setup: Optional[Callable[[], None]] = None,
+    ):
+        self.name = name
+        self.message = message
+        self.intent = intent
+        self.entities = entities
+        self.setup = setup
+
+
+def _restore_action_items() -> None:
+    """Approval consumes the meeting's tasks; put them back (untimed)."""
+    from app.db.session import SessionLocal
+    from app.memory.repo import MemoryRepo
+    from app.memory.schemas import MeetingUpdate
+
+    db = SessionLocal()
+    try:
+        repo = MemoryRepo(db)
+        meeting = repo.get_active_meeting(BENCH_CONVERSATION_ID)
+        repo.update_meeting(
+            meeting.id,
+            MeetingUpdate(action_items=[
+                {"text": "Send rollout plan", "owner": "Alex", "deadline": None},
+                {"text": "Book the review", "owner": None, "deadline": None},
+            ]),
+        )
+    finally:
+        db.close()
+
+
+def build_scenarios(events: List[Dict[str, Any]]) -> List[Scenario]:
+    client = "Client 00001"
+    past = [
+        e for e in events
+        if client in e["summary"]
+        and _parse_calendar_time(e["start"]["dateTime"]) < datetime.now(timezone.utc)
+    ]
+    meeting_day = _parse_calendar_time(past[0]["start"]["dateTime"]).strftime("%B %d, %Y")
+
+    # Order matters: later workflows use the meeting the summaries made active
+    return [
+        Scenario("summarize_recent", "Summarize my last meeting"),
+        Scenario("summarize_client", f"Summarize my last meeting with {client}"),
+        Scenario("summarize_client_date", f"Summarize my meeting with {client} on {meeting_day}"),
+        Scenario("generate_followup", "Generate a follow-up email"),
+        Scenario("meeting_brief", f"Brief me on my next meeting with {client}"),
+        Scenario(
+            "approve_hubspot_tasks",
+            intent="approve_hubspot_tasks",
+            entities={"approved_task_indexes": [0]},
+            setup=_restore_action_items,
+        ),
+        Scenario("other", "What's the weather like?"),
+    ]
+
+
+def _run_once(scenario: Scenario) -> Dict[str, Any]:
+    from app.agent.orchestrator import Orchestrator
+    from app.db.session import SessionLocal
+    from app.memory.repo import MemoryRepo
+
+    # One session per request, as the chat endpoint does
+    db = SessionLocal()
+    try:
+        return Orchestrator(MemoryRepo(db)).process_message(
+            user_message=scenario.message,
+            intent_override=scenario.intent,
+            entities_override=scenario.entities,
+            conversation_id=BENCH_CONVERSATION_ID,
+        )
+    finally:
+        db.close()
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def measure(scenario: Scenario, counter: QueryCounter, iterations: int, warmup: int, alloc_iterations: int) -> Dict[str, Any]:
+    for _ in range(warmup):
+        if scenario.setup:
+            scenario.setup()
+        result = _run_once(scenario)
+
+    error = (result.get("metadata") or {}).get("error") if warmup else None
+
+    latencies, queries = [], []
+    for _ in range(iterations):
+        if scenario.setup:
+            scenario.setup()
+        before = counter.count
+        started = time.perf_counter()
+        _run_once(scenario)
+        latencies.append((time.perf_counter() - started) * 1000)
+        queries.append(counter.count - before)
+
+    # Separate pass: tracemalloc slows allocation-heavy code several-fold
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(alloc_iterations):
+            if scenario.setup:
+                scenario.setup()
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            _run_once(scenario)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - baseline)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(_percentile(latencies, 95), 2),
+        "queries": int(statistics.median(queries)),
+        "peak_kib": round(statistics.median(peaks) / 1024, 1) if peaks else None,
+        "outcome": error or "ok",
+    }
+
+
+def measure_all(scenarios: List[Scenario], counter: QueryCounter, args: argparse.Namespace) -> Dict[str, Any]:
+    """Median of --repeats passes over the scenarios (in order: later ones use earlier state)."""
+    passes = [
+        {s.name: measure(s, counter, args.iterations, args.warmup, args.alloc_iterations) for s in scenarios}
+        for _ in range(max(args.repeats, 1))
+    ]
+    results = {}
+    for name in passes[0]:
+        runs = [p[name] for p in passes]
+        peaks = [r["peak_kib"] for r in runs if r["peak_kib"] is not None]
+        results[name] = {
+            "p50_ms": round(statistics.median(r["p50_ms"] for r in runs), 2),
+            "p95_ms": round(statistics.median(r["p95_ms"] for r in runs), 2),
+            "queries": int(statistics.median(r["queries"] for r in runs)),
+            "peak_kib": round(statistics.median(peaks), 1) if peaks else None,
+            "outcome": next((r["outcome"] for r in runs if r["outcome"] != "ok"), "ok"),
+        }
+    return results
+
+
+# -------------------------------------------------
+# Baseline comparison
+# -------------------------------------------------
+
+def _noisy(regression: str) -> bool:
+    # Queries and outcomes are deterministic; timings and allocation peaks are not
+    return ": p95 " in regression or ": peak " in regression
+
+
+def keep_better(results: Dict[str, Any], rerun: Dict[str, Any]) -> Dict[str, Any]:
+    """Per scenario, the lower p95 / peak of two measurements of the same code."""
+    merged = {}
+    for name, first in results.items():
+        second = rerun.get(name, first)
+        best = dict(first)
+        if second["p95_ms"] < first["p95_ms"]:
+            best.update(p50_ms=second["p50_ms"], p95_ms=second["p95_ms"])
+        if first["peak_kib"] is not None and second["peak_kib"] is not None:
+            best["peak_kib"] = min(first["peak_kib"], second["peak_kib"])
+        merged[name] = best
+    return merged
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float, slack_ms: float) -> List[str]:
+    regressions = []
+    for size, scenarios in results.items():
+        for name, current in scenarios.items():
+            base = baseline.get(size, {}).get(name)
+            if not base:
+                continue
+
+            label = f"{size}/{name}"
+            if current["queries"] > base["queries"]:
+                regressions.append(f"{label}: queries {base['queries']} -> {current['queries']}")
+
+            limit = base["p95_ms"] * (1 + tolerance) + slack_ms
+            if current["p95_ms"] > limit:
+                regressions.append(f"{label}: p95 {base['p95_ms']}ms -> {current['p95_ms']}ms (limit {limit:.2f}ms)")
+
+            if base.get("peak_kib") and current.get("peak_kib"):
+                limit = base["peak_kib"] * (1 + tolerance)
+                if current["peak_kib"] > limit:
+                    regressions.append(f"{label}: peak {base['peak_kib']}KiB -> {current['peak_kib']}KiB")
+
+            if current["outcome"] != base.get("outcome", "ok"):
+                regressions.append(f"{label}: outcome {base.get('outcome')} -> {current['outcome']}")
+    return regressions
+
+
+def _print_table(size: str, seeded: Dict[str, int], results: Dict[str, Any]) -> None:
+    print(f"\n📊 {size} ({seeded.get('meetings_inserted', 0)} meetings, {seeded.get('memory_entries_inserted', 0)} memory entries)")
+    print(f"  {'scenario':<24} {'p50 ms':>9} {'p95 ms':>9} {'queries':>8} {'peak KiB':>9}  outcome")
+    for name, r in results.items():
+        peak = f"{r['peak_kib']:.1f}" if r["peak_kib"] is not None else "-"
+        print(f"  {name:<24} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['queries']:>8} {peak:>9}  {r['outcome']}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmark for Orchestrator.process_message.")
+    parser.add_argument("--sizes", default="small,medium", help=f"Comma-separated: {', '.join(SIZES)}")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--repeats", type=int, default=3, help="Passes per size; figures are their median")
+    parser.add_argument("--retries", type=int, default=2, help="Re-measure a size with latency / memory regressions")
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--alloc-iterations", type=int, default=5, help="Iterations traced for memory (0 disables)")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0)
+    parser.add_argument("--integration-latency-ms", type=float, default=0.0)
+    parser.add_argument("--database-url", default=None, help="Defaults to a temporary SQLite file")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.30, help="Allowed p95 / memory growth (fraction)")
+    parser.add_argument("--slack-ms", type=float, default=2.0, help="Absolute p95 allowance for timer noise")
+    parser.add_argument("--json", dest="json_path", default=None, help="Also write results to this file")
+    args = parser.parse_args(argv)
+
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown:
+        parser.error(f"unknown size(s): {', '.join(unknown)}")
+
+    workdir = tempfile.mkdtemp(prefix="mi-bench-")
+    _configure_environment(args.database_url, workdir, args.llm_latency_ms)
+
+    from app.db.session import engine
+
+    events = install_fake_integrations(args.integration_latency_ms)
+    counter = QueryCounter(engine)
+
+    config = {
+        "llm_latency_ms": args.llm_latency_ms,
+        "integration_latency_ms": args.integration_latency_ms,
+        "dialect": engine.dialect.name,
+    }
+    print(f"🏁 Benchmarking on {engine.dialect.name} ({engine.url.render_as_string(hide_password=True)})")
+
+    baseline_path = Path(args.baseline)
+    baseline = None
+    if not args.save_baseline and baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text())
+        if baseline.get("config") != config:
+            print(f"⚠️ Baseline was recorded with {baseline.get('config')}; comparing queries only.")
+            args.tolerance, args.slack_ms = float("inf"), float("inf")
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for size in sizes:
+        seeded = reset_database(*SIZES[size])
+        scenarios = build_scenarios(events)
+        results[size] = measure_all(scenarios, counter, args)
+
+        for attempt in range(args.retries if baseline else 0):
+            noisy = [r for r in compare({size: results[size]}, baseline.get("results", {}), args.tolerance, args.slack_ms) if _noisy(r)]
+            if not noisy:
+                break
+            print(f"🔁 {size}: re-measuring ({len(noisy)} latency / memory regressions, retry {attempt + 1}/{args.retries})")
+            results[size] = keep_better(results[size], measure_all(scenarios, counter, args))
+
+        _print_table(size, seeded, results[size])
+
+    report = {"config": config, "results": results}
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.save_baseline:
+        existing = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+        merged = {**existing.get("results", {}), **results} if existing.get("config") == config else results
+        baseline_path.write_text(json.dumps({"config": config, "results": merged}, indent=2) + "\n")
+        print(f"\n💾 Baseline saved to {baseline_path}")
+        return 0
+
+    if baseline is None:
+        print(f"\n⚠️ No baseline at {baseline_path}; run with --save-baseline to record one.")
+        return 0
+
+    regressions = compare(results, baseline.get("results", {}), args.tolerance, args.slack_ms)
+    if regressions:
+        print("\n❌ Regressions against baseline:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+
+    print("\n✅ No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
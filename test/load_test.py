@@ -0,0 +1,402 @@
+"""Load test for POST /api/chat with multi-turn conversations.
+
+Each virtual user replays a realistic conversation against one uvicorn
+worker - summarize, follow-up, approve tasks, brief - with think time
+between turns, then starts a new conversation until the run ends:
+
+    python test/load_test.py --users 50 --duration 60
+    python test/load_test.py --url http://localhost:8000 --users 20   # existing server
+
+Without --url a single-worker server is started on --port with the local
+LLM provider and the local Calendar / Zoom / HubSpot fakes from test/benchmark.py,
+over a seeded temporary SQLite database (or --database-url).
+
+The generator is asyncio-based with a minimal keep-alive HTTP/1.1 client,
+so hundreds of users cost one process. Throughput, latency percentiles per
+step, HTTP status codes and workflow error codes (metadata.error) are
+printed and written to --report as JSON.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_REPORT_DIR = REPO_ROOT / "reports"
+
+
+def _conversation(user: int) -> List[Tuple[str, Dict[str, Any]]]:
+    client = f"Client {user % 20:05d}"  # the fake calendar has 20 clients
+    return [
+        ("summarize", {"message": f"Summarize my last meeting with {client}"}),
+        ("followup", {"message": "Generate a follow-up email"}),
+        ("approve_tasks", {"intent": "approve_hubspot_tasks", "entities": {"approved_task_indexes": [0]}}),
+        ("brief", {"message": f"Brief me on my next meeting with {client}"}),
+    ]
+
+
+# -------------------------------------------------
+# Stub server
+# -------------------------------------------------
+
+def serve(port: int, database_url: Optional[str], llm_latency_ms: float, integration_latency_ms: float) -> None:
+    """Run one uvicorn worker with the benchmark fakes installed."""
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    import benchmark
+
+    benchmark._configure_environment(database_url, tempfile.mkdtemp(prefix="mi-load-"), llm_latency_ms)
+    benchmark.reset_database(*benchmark.SIZES["medium"])
+    benchmark.install_fake_integrations(integration_latency_ms)
+
+    import uvicorn
+    from app.main import app
+
+    uvicorn.run(app, host="127.0.0.1", port=port, workers=1, log_level="warning", access_log=False)
+
+
+def _start_server(args) -> subprocess.Popen:
+    command = [
+        sys.executable, __file__, "--serve",
+        "--port", str(args.port),
+        "--llm-latency-ms", str(args.llm_latency_ms),
+        "--integration-latency-ms", str(args.integration_latency_ms),
+    ]
+    if args.database_url:
+        command += ["--database-url", args.database_url]
+    return subprocess.Popen(command, cwd=REPO_ROOT)
+
+
+async def _wait_for_health(host: str, port: int, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = HTTPConnection(host, port)
+            status, _ = await conn.request("GET", "/health")
+            await conn.close()
+            if status == 200:
+                return
+        except OSError:
+            pass
+        await asyncio.sleep(0.25)
+    raise RuntimeError(f"❌ Server on {host}:{port} did not become healthy within {timeout:.0f}s")
+
+
+# -------------------------------------------------
+# Minimal asyncio HTTP/1.1 client (keep-alive, one connection per user)
+# -------------------------------------------------
+
+class HTTPConnection:
+    def __init__(self, host: str, port: int, auth: Optional[str] = None):
+        self.host = host
+        self.port = port
+        self.auth = auth
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def _connect(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except OSError:
+                pass
+            self._writer = None
+
+    async def request(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None) -> Tuple[int, bytes]:
+        reused = self._writer is not None
+        try:
+            return await self._send(method, path, payload)
+        except ConnectionResetError:
+            if not reused:
+                raise
+            # The server dropped an idle keep-alive connection; retry once on a fresh one
+            return await self._send(method, path, payload)
+
+    async def _send(self, method: str, path: str, payload: Optional[Dict[str, Any]]) -> Tuple[int, bytes]:
+        if self._writer is None:
+            await self._connect()
+
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        headers = [
+            f"{method} {path} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+            "Connection: keep-alive",
+            f"Content-Length: {len(body)}",
+        ]
+        if payload is not None:
+            headers.append("Content-Type: application/json")
+        if self.auth:
+            headers.append(f"Authorization: Basic {self.auth}")
+
+        try:
+            self._writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + body)
+            await self._writer.drain()
+            return await self._read_response()
+        except asyncio.IncompleteReadError as e:
+            await self.close()
+            raise ConnectionResetError("server closed the connection mid-response") from e
+        except OSError:
+            await self.close()
+            raise
+
+    async def _read_response(self) -> Tuple[int, bytes]:
+        status_line = await self._reader.readline()
+        if not status_line:
+            await self.close()
+            raise ConnectionResetError("server closed the connection")
+        status = int(status_line.split()[1])
+
+        length, chunked, close = None, False, False
+        while True:
+            line = (await self._reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            name, value = name.lower(), value.strip().lower()
+            if name == "content-length":
+                length = int(value)
+            elif name == "transfer-encoding" and "chunked" in value:
+                chunked = True
+            elif name == "connection" and value == "close":
+                close = True
+
+        if chunked:
+            body = b""
+            while True:
+                size = int((await self._reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await self._reader.readline()
+                    break
+                body += await self._reader.readexactly(size)
+                await self._reader.readline()
+        elif length is not None:
+            body = await self._reader.readexactly(length)
+        else:
+            body = await self._reader.read()
+            close = True
+
+        if close:
+            await self.close()
+        return status, body
+
+
+# -------------------------------------------------
+# Load generation
+# -------------------------------------------------
+
+class Stats:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+        self.workflow_errors: Dict[str, Counter] = defaultdict(Counter)
+        self.conversations = 0
+
+    def record(self, step: str, latency_ms: float, status: str, workflow_error: Optional[str] = None) -> None:
+        self.latencies[step].append(latency_ms)
+        self.statuses[step][status] += 1
+        if workflow_error:
+            self.workflow_errors[step][workflow_error] += 1
+
+
+async def virtual_user(user: int, host: str, port: int, auth: Optional[str], stats: Stats,
+                       deadline: float, think_time: float, rng: random.Random) -> None:
+    conn = HTTPConnection(host, port, auth)
+    iteration = 0
+    try:
+        while time.monotonic() < deadline:
+            conversation_id = f"load-{user}-{iteration}"
+            for step, payload in _conversation(user):
+                if time.monotonic() >= deadline:
+                    return
+
+                started = time.perf_counter()
+                try:
+                    status, body = await conn.request(
+                        "POST", "/api/chat", {**payload, "conversation_id": conversation_id}
+                    )
+                except (OSError, ValueError) as e:
+                    stats.record(step, (time.perf_counter() - started) * 1000, type(e).__name__)
+                    continue
+
+                latency_ms = (time.perf_counter() - started) * 1000
+                workflow_error = None
+                if status == 200:
+                    try:
+                        workflow_error = (json.loads(body).get("metadata") or {}).get("error")
+                    except ValueError:
+                        workflow_error = "invalid_json"
+                stats.record(step, latency_ms, str(status), workflow_error)
+
+                if think_time > 0:
+                    # Exponential think time, like locust's between() but memoryless
+                    await asyncio.sleep(rng.expovariate(1 / think_time))
+
+            stats.conversations += 1
+            iteration += 1
+    finally:
+        await conn.close()
+
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+
+    def pct(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+    return {
+        "p50_ms": round(statistics.median(ordered), 2),
+        "p90_ms": round(pct(90), 2),
+        "p95_ms": round(pct(95), 2),
+        "p99_ms": round(pct(99), 2),
+        "max_ms": round(ordered[-1], 2),
+    }
+
+
+async def run_load(args) -> Dict[str, Any]:
+    parsed = urlparse(args.url)
+    host, port = parsed.hostname, parsed.port or 80
+    auth = base64.b64encode(f"load:{args.password}".encode()).decode() if args.password else None
+
+    await _wait_for_health(host, port)
+
+    stats = Stats()
+    rng = random.Random(args.seed)
+    started = time.monotonic()
+    deadline = started + args.duration
+
+    tasks = []
+    for user in range(args.users):
+        tasks.append(asyncio.create_task(
+            virtual_user(user, host, port, auth, stats, deadline, args.think_time, random.Random(rng.random()))
+        ))
+        if args.spawn_rate > 0:
+            await asyncio.sleep(1 / args.spawn_rate)
+
+    await asyncio.gather(*tasks)
+    elapsed = time.monotonic() - started
+
+    pool = None
+    try:
+        conn = HTTPConnection(host, port, auth)
+        status, body = await conn.request("GET", "/health/db")
+        await conn.close()
+        if status == 200:
+            pool = json.loads(body).get("pool")
+    except (OSError, ValueError):
+        pass
+
+    all_latencies = [v for values in stats.latencies.values() for v in values]
+    total_statuses = sum(stats.statuses.values(), Counter())
+    ok = total_statuses.get("200", 0)
+
+    return {
+        "config": {
+            "url": args.url,
+            "users": args.users,
+            "duration_s": args.duration,
+            "spawn_rate": args.spawn_rate,
+            "think_time_s": args.think_time,
+            "llm_latency_ms": None if args.external else args.llm_latency_ms,
+            "integration_latency_ms": None if args.external else args.integration_latency_ms,
+        },
+        "started_at": datetime.utcnow().isoformat() + "Z",
+        "elapsed_s": round(elapsed, 2),
+        "requests": len(all_latencies),
+        "conversations": stats.conversations,
+        "throughput_rps": round(len(all_latencies) / elapsed, 2) if elapsed else 0.0,
+        "success_rate": round(ok / len(all_latencies), 4) if all_latencies else 0.0,
+        "latency": _percentiles(all_latencies) if all_latencies else {},
+        "status_codes": dict(total_statuses),
+        "steps": {
+            step: {
+                "requests": len(values),
+                **_percentiles(values),
+                "status_codes": dict(stats.statuses[step]),
+                "workflow_errors": dict(stats.workflow_errors[step]),
+            }
+            for step, values in stats.latencies.items()
+        },
+        "db_pool": pool,
+    }
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    print(
+        f"\n📈 {report['requests']} requests / {report['conversations']} conversations in {report['elapsed_s']}s "
+        f"→ {report['throughput_rps']} req/s, success {report['success_rate']:.1%}"
+    )
+    print(f"  {'step':<14} {'reqs':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}  status / workflow errors")
+    for step, s in report["steps"].items():
+        errors = ", ".join(f"{k}={v}" for k, v in s["workflow_errors"].items())
+        statuses = ", ".join(f"{k}={v}" for k, v in s["status_codes"].items())
+        print(
+            f"  {step:<14} {s['requests']:>6} {s['p50_ms']:>9.1f} {s['p95_ms']:>9.1f} "
+            f"{s['p99_ms']:>9.1f} {s['max_ms']:>9.1f}  {statuses}{' | ' + errors if errors else ''}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test POST /api/chat with multi-turn conversations.")
+    parser.add_argument("--url", default=None, help="Target an existing server instead of starting the stub server")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the stub server")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument("--spawn-rate", type=float, default=10.0, help="Users started per second (0 = all at once)")
+    parser.add_argument("--think-time", type=float, default=0.5, help="Mean seconds between turns")
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0)
+    parser.add_argument("--integration-latency-ms", type=float, default=50.0)
+    parser.add_argument("--database-url", default=None, help="Stub server database (default: temporary SQLite)")
+    parser.add_argument("--password", default=os.getenv("DEMO_BASIC_AUTH_PASSWORD", ""), help="Basic auth password")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--report", default=None, help="Report path (default: reports/load_test_<timestamp>.json)")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        serve(args.port, args.database_url, args.llm_latency_ms, args.integration_latency_ms)
+        return 0
+
+    args.external = bool(args.url)
+    server = None
+    if not args.external:
+        args.url = f"http://127.0.0.1:{args.port}"
+        print(f"🚀 Starting stub server on {args.url} (LLM {args.llm_latency_ms}ms, integrations {args.integration_latency_ms}ms)...")
+        server = _start_server(args)
+
+    try:
+        print(f"🔥 {args.users} users for {args.duration:.0f}s against {args.url}/api/chat")
+        report = asyncio.run(run_load(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    _print_report(report)
+
+    report_path = Path(args.report) if args.report else (
+        DEFAULT_REPORT_DIR / f"load_test_{datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')}.json"
+    )
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"\n💾 Report written to {report_path}")
+
+    return 0 if report["requests"] and report["success_rate"] == 1.0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+"""Transcript normalization benchmark - token reduction vs. content preserved.
+
+Runs app/tools/transcript.normalize_transcript over the demo transcripts and
+a synthetic Zoom VTT export (timestamps, fillers, stutters, backchannels,
+crosstalk fragments, repeated lines) and checks that what a summary depends
+on survives:
+
+    - every number (amounts, dates, percentages) in the spoken text
+    - every speaker name
+    - content words: recall of the raw transcript's words (3+ letters, fillers excluded)
+    - for the synthetic transcript, every scripted decision / action item sentence
+
+Usage (from the repo root):
+
+    python test/transcript_benchmark.py
+    python test/transcript_benchmark.py --turns 2000 --min-reduction 0.25
+
+Exits non-zero when content is lost or the synthetic transcript shrinks
+less than --min-reduction.
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+DEMO_DATA = REPO_ROOT / "app" / "demo" / "data"
+
+SPEAKERS = ["Lisa Chen", "Mike Alvarez", "Lauren Messemer", "Priya Patel"]
+
+# Scripted facts the summary must be able to see (decisions, owners, numbers, dates)
+FACTS = [
+    "We agreed to move the pilot launch to March 14 across 3 sites.",
+    "Mike will send the revised vendor contract by Friday.",
+    "The budget for phase two is capped at 45,000 dollars.",
+    "Priya owns the dashboard prototype and will demo it on April 2.",
+    "We decided to drop the weekly sync and use async updates instead.",
+    "Lisa will confirm the par levels with the 2 pilot managers.",
+    "Over-ordering fell by 18% at the Elm Street location last month.",
+    "Lauren will draft the training tooltips before the next review.",
+]
+
+# Discussion lines are combined from these so verbatim repeats stay rare
+DISCUSSION_OPENERS = [
+    "I think", "From what I saw", "My concern is that", "It sounds like",
+    "The feedback was that", "Honestly", "On our side", "Last week we noticed",
+]
+DISCUSSION_TOPICS = [
+    "the vendor timeline", "the par level defaults", "the director dashboard",
+    "the inline alerts", "the color-coded indicator", "the ordering cadence",
+    "the produce forecasts", "the dairy thresholds", "the pilot onboarding",
+    "the weekend staffing", "the training material", "the export format",
+]
+DISCUSSION_CLAIMS = [
+    "is still the main risk", "needs a simpler explanation", "tested well in the mockups",
+    "should stay flexible per site", "is confusing for new managers", "depends on the vendor sync",
+    "could slow down ordering", "matches what the Oak Park team reported",
+]
+
+FILLERS = ["um,", "uh,", "you know,", "I mean,", "so um", "uh"]
+BACKCHANNELS = ["Yeah.", "Mm-hmm.", "Right.", "Okay.", "Uh-huh.", "Got it."]
+
+_WORD = re.compile(r"[A-Za-z][A-Za-z'\-]{2,}")
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)*%?")
+_TIMING = re.compile(r"^\d+$|-->|^WEBVTT")
+_SPEAKER = re.compile(r"^([A-Z][\w.'\-]*(?: [\w.'\-]+){0,3}):\s+")
+_FILLER_PHRASES = re.compile(r"\b(?:you know|i mean),", re.IGNORECASE)
+_IGNORED_WORDS = {
+    "um", "umm", "uh", "uhh", "erm", "hmm", "mm", "mhm", "mm-hmm", "uh-huh",
+    "yeah", "yep", "yup", "okay", "right", "sure", "gotcha", "got", "alright", "cool",
+}
+
+
+def _noisy(sentence: str, rng: random.Random) -> str:
+    words = sentence.split()
+    if rng.random() < 0.6:
+        words.insert(rng.randrange(len(words)), rng.choice(FILLERS))
+    if rng.random() < 0.3:
+        i = rng.randrange(len(words))
+        words.insert(i, words[i])  # stutter
+    if rng.random() < 0.2:
+        words.insert(0, f"{words[0]}-")  # false start
+    return " ".join(words)
+
+
+def synthetic_vtt(turns: int, seed: int = 7) -> Tuple[str, List[str]]:
+    """Zoom-style VTT with realistic noise; returns (vtt, scripted facts)."""
+    rng = random.Random(seed)
+    facts = FACTS[:]
+    fact_slots = set(rng.sample(range(turns), min(len(facts), turns)))
+
+    cues = []
+    for i in range(turns):
+        speaker = rng.choice(SPEAKERS)
+        if i in fact_slots and facts:
+            sentence = facts.pop()
+        else:
+            sentence = f"{rng.choice(DISCUSSION_OPENERS)} {rng.choice(DISCUSSION_TOPICS)} {rng.choice(DISCUSSION_CLAIMS)}."
+
+        roll = rng.random()
+        if roll < 0.2:
+            # Backchannel from someone else
+            cues.append((rng.choice(SPEAKERS), rng.choice(BACKCHANNELS)))
+        elif roll < 0.3:
+            # Crosstalk: a fragment, then the full line from the same speaker
+            fragment = " ".join(sentence.split()[: max(2, len(sentence.split()) // 3)])
+            cues.append((speaker, fragment))
+        cues.append((speaker, _noisy(sentence, rng)))
+        if rng.random() < 0.1:
+            cues.append((speaker, sentence))  # repeated line (caption echo)
+
+    blocks = ["WEBVTT"]
+    for n, (speaker, text) in enumerate(cues, start=1):
+        start = n * 4
+        blocks.append(
+            f"{n}\n00:{start // 60:02d}:{start % 60:02d}.000 --> 00:{(start + 4) // 60:02d}:{(start + 4) % 60:02d}.000\n"
+            f"{speaker}: {text}"
+        )
+    return "\n\n".join(blocks), FACTS[:]
+
+
+def _parse_vtt(vtt_text: str) -> str:
+    from app.integrations.zoom import _parse_vtt as parse
+
+    return parse(vtt_text)
+
+
+def _spoken_lines(text: str) -> List[str]:
+    return [line for line in text.splitlines() if line.strip() and not _TIMING.search(line.strip())]
+
+
+def _content_words(text: str) -> set:
+    words = set()
+    for line in _spoken_lines(text):
+        line = _FILLER_PHRASES.sub("", _SPEAKER.sub("", line))
+        words.update(w.lower().rstrip("-") for w in _WORD.findall(line))
+    return {w for w in words if len(w) >= 3} - _IGNORED_WORDS
+
+
+def _numbers(text: str) -> set:
+    return {n for line in _spoken_lines(text) for n in _NUMBER.findall(_SPEAKER.sub("", line))}
+
+
+def _speakers(text: str) -> set:
+    return {m.group(1) for line in _spoken_lines(text) for m in [_SPEAKER.match(line)] if m}
+
+
+def _fact_preserved(fact: str, normalized: str) -> bool:
+    words = {w.lower() for w in _WORD.findall(fact)} - _IGNORED_WORDS
+    numbers = set(_NUMBER.findall(fact))
+    lowered = normalized.lower()
+    return all(re.search(rf"\b{re.escape(w)}\b", lowered) for w in words) and all(n in normalized for n in numbers)
+
+
+def evaluate(name: str, raw: str, facts: Optional[List[str]] = None) -> Dict[str, object]:
+    from app.tools.transcript import normalize_transcript
+
+    started = time.perf_counter()
+    result = normalize_transcript(raw, steps=("timestamps", "disfluencies", "dedupe", "merge_speakers"))
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    normalized = result["text"]
+
+    raw_words, kept_words = _content_words(raw), _content_words(normalized)
+    missing_numbers = _numbers(raw) - _numbers(normalized)
+    missing_speakers = _speakers(raw) - _speakers(normalized)
+    missing_facts = [f for f in (facts or []) if not _fact_preserved(f, normalized)]
+
+    return {
+        "name": name,
+        "tokens_before": result["tokens_before"],
+        "tokens_after": result["tokens_after"],
+        "reduction": 1 - result["tokens_after"] / max(result["tokens_before"], 1),
+        "word_recall": len(raw_words & kept_words) / max(len(raw_words), 1),
+        "missing_words": sorted(raw_words - kept_words),
+        "missing_numbers": sorted(missing_numbers),
+        "missing_speakers": sorted(missing_speakers),
+        "missing_facts": missing_facts,
+        "elapsed_ms": elapsed_ms,
+        "removed": result["removed"],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Transcript normalization: token reduction vs. content preserved.")
+    parser.add_argument("--turns", type=int, default=400, help="Speaker turns in the synthetic transcript")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--min-reduction", type=float, default=0.20, help="Required token reduction on the synthetic transcript")
+    parser.add_argument("--min-word-recall", type=float, default=0.98, help="Required content-word recall per transcript")
+    args = parser.parse_args(argv)
+
+    vtt, facts = synthetic_vtt(args.turns, args.seed)
+    cases = [("synthetic_zoom_vtt", _parse_vtt(vtt), facts)]
+    cases += [(path.stem, path.read_text(encoding="utf-8"), None) for path in sorted(DEMO_DATA.glob("transcript_*.txt"))]
+
+    failures = []
+    print(f"  {'transcript':<32} {'tokens':>13} {'saved':>7} {'recall':>7} {'ms':>7}")
+    for name, raw, case_facts in cases:
+        r = evaluate(name, raw, case_facts)
+        print(
+            f"  {name:<32} {r['tokens_before']:>6}->{r['tokens_after']:<6} "
+            f"{r['reduction']:>6.1%} {r['word_recall']:>7.3f} {r['elapsed_ms']:>7.1f}"
+        )
+        if r["missing_numbers"]:
+            failures.append(f"{name}: numbers lost {r['missing_numbers']}")
+        if r["missing_speakers"]:
+            failures.append(f"{name}: speakers lost {r['missing_speakers']}")
+        if r["missing_facts"]:
+            failures.append(f"{name}: facts lost {r['missing_facts']}")
+        if r["word_recall"] < args.min_word_recall:
+            failures.append(f"{name}: content-word recall {r['word_recall']:.3f} (lost {r['missing_words'][:10]})")
+        if case_facts is not None and r["reduction"] < args.min_reduction:
+            failures.append(f"{name}: only {r['reduction']:.1%} fewer tokens (expected >= {args.min_reduction:.0%})")
+
+    if failures:
+        print("\n❌ Transcript normalization checks failed:")
+        for line in failures:
+            print(f"  - {line}")
+        return 1
+
+    print("\n✅ Content preserved; synthetic transcript reduced as expected.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
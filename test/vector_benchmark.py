@@ -0,0 +1,151 @@
+"""Vector store benchmark - top-k search latency over a large memory-mapped matrix.
+
+Fills a temporary app/memory/vectors.VectorStore with random unit vectors and
+times:
+
+    - full scan      one query against every row (chunked matrix product + argpartition)
+    - batched scan   --batch queries in one pass
+    - client scan    one query restricted to --client-docs ids (the hybrid memory search path)
+
+Before timing it checks the store itself: local embeddings are deterministic,
+a stored vector is its own nearest neighbour, a second store instance on the
+same directory (another worker) sees writes and removals, and the top-k
+matches an exact sort.
+
+Usage (from the repo root):
+
+    python test/vector_benchmark.py
+    python test/vector_benchmark.py --rows 200000 --dim 768 --max-full-ms 100
+
+Exits non-zero when a check fails or the full-scan p50 exceeds --max-full-ms.
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+
+def _unit(rng: np.random.Generator, n: int, dim: int) -> np.ndarray:
+    vectors = rng.standard_normal((n, dim), dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def check_store(root: str, dim: int) -> List[str]:
+    from app.llm.embeddings import local_embeddings
+    from app.memory.vectors import VectorStore
+
+    failures = []
+    texts = ["Good Health decided to drop the weekly vendor sync", "Budget capped at 45,000 dollars"]
+    if not np.array_equal(local_embeddings(texts, dim), local_embeddings(texts, dim)):
+        failures.append("local embeddings are not deterministic")
+
+    rng = np.random.default_rng(1)
+    writer, reader = VectorStore(root), VectorStore(root)
+    ids = [f"m:{i}" for i in range(5000)]
+    vectors = _unit(rng, len(ids), dim)
+    writer.upsert(ids, vectors)
+
+    hits = reader.search(vectors[42], k=3)[0]
+    if not hits or hits[0][0] != "m:42" or abs(hits[0][1] - 1.0) > 1e-4:
+        failures.append(f"stored vector is not its own nearest neighbour (got {hits[:1]})")
+
+    queries = _unit(rng, 8, dim)
+    exact = np.argsort(-(queries @ vectors.T), axis=1)[:, :10]
+    for q, got in enumerate(reader.search(queries, k=10)):
+        if [doc_id for doc_id, _ in got] != [ids[j] for j in exact[q]]:
+            failures.append("top-k differs from an exact sort")
+            break
+
+    writer.remove(["m:42"])
+    if any(doc_id == "m:42" for doc_id, _ in reader.search(vectors[42], k=5)[0]):
+        failures.append("removed vector still returned by another store instance")
+    writer.upsert(["m:42"], vectors[42])
+    if reader.search(vectors[42], k=1, ids=["m:41", "m:42"])[0][0][0] != "m:42":
+        failures.append("re-added vector not found by a filtered search")
+    return failures
+
+
+def _timed(fn: Callable[[], object], repeat: int) -> Dict[str, float]:
+    fn()  # warm the page cache
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "p50": statistics.median(samples),
+        "p95": samples[min(int(len(samples) * 0.95), len(samples) - 1)],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Vector store: top-k search latency.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--batch", type=int, default=32, help="Queries per batched scan")
+    parser.add_argument("--client-docs", type=int, default=500, help="Ids in a client-restricted scan")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--max-full-ms", type=float, default=250.0, help="Allowed full-scan p50")
+    args = parser.parse_args(argv)
+
+    from app.memory.vectors import VectorStore
+
+    with tempfile.TemporaryDirectory(prefix="mi-vectors-") as tmp:
+        failures = check_store(str(Path(tmp) / "check"), args.dim)
+
+        rng = np.random.default_rng(7)
+        store = VectorStore(str(Path(tmp) / "bench"))
+        started = time.perf_counter()
+        step = 100_000
+        for start in range(0, args.rows, step):
+            n = min(step, args.rows - start)
+            store.upsert([f"m:{i}" for i in range(start, start + n)], _unit(rng, n, args.dim))
+        load_s = time.perf_counter() - started
+
+        query = _unit(rng, 1, args.dim)
+        batch = _unit(rng, args.batch, args.dim)
+        client_ids = [f"m:{i}" for i in rng.choice(args.rows, size=min(args.client_docs, args.rows), replace=False)]
+
+        # name -> (timing, queries per call)
+        results = {
+            "full scan": (_timed(lambda: store.search(query, k=args.k), args.repeat), 1),
+            f"batched scan ({args.batch} queries)": (
+                _timed(lambda: store.search(batch, k=args.k), args.repeat), args.batch
+            ),
+            f"client scan ({len(client_ids)} ids)": (
+                _timed(lambda: store.search(query, k=args.k, ids=client_ids), args.repeat), 1
+            ),
+        }
+
+        size_mib = args.rows * args.dim * 4 / 2**20
+        print(f"  {args.rows:,} x {args.dim} float32 ({size_mib:,.0f} MiB), loaded in {load_s:.1f}s")
+        print(f"  {'search (k=' + str(args.k) + ')':<32} {'p50 ms':>9} {'p95 ms':>9} {'ms/query':>9}")
+        for name, (timing, queries) in results.items():
+            print(f"  {name:<32} {timing['p50']:>9.2f} {timing['p95']:>9.2f} {timing['p50'] / queries:>9.2f}")
+
+        full_p50 = results["full scan"][0]["p50"]
+        if full_p50 > args.max_full_ms:
+            failures.append(f"full scan p50 {full_p50:.1f}ms > {args.max_full_ms:.0f}ms")
+
+    if failures:
+        print("\n❌ Vector store checks failed:")
+        for line in failures:
+            print(f"  - {line}")
+        return 1
+
+    print("\n✅ Vector store consistent; search within budget.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())